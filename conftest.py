@@ -1,68 +1,549 @@
 import pytest
 import logging
-from selenium import webdriver
-from selenium.webdriver.chrome.service import Service
-from webdriver_manager.chrome import ChromeDriverManager
-from selenium.webdriver.support.ui import WebDriverWait
-from selenium.common.exceptions import TimeoutException
-from utils.constants import IMPLICIT_WAIT, EXPLICIT_WAIT, POLLING_INTERVAL
+import glob
+import os
+import time
+from selenium.webdriver.remote.webdriver import WebDriver
+from utils.account_pool import AccountPool, get_worker_id
+from utils.browser_pool import BrowserPool, reset_session
+from utils.browser_watchdog import BrowserWatchdog
+from utils.config_reader import ConfigReader
+from utils.failure_artifacts import FailureArtifacts, load_stats
+from utils.instrumentation import recorder, load_records, write_reports
+from utils.launch_profiles import active_profile, describe
+from utils.log_pipeline import merge_worker_logs, remove_worker_logs, start_logging, stop_logging
+from utils.locators import cache_stats
+from utils.order_data import CheckoutSession, configured_source, record_source
+from utils.retry_policy import load_policies, retry_engine
+from utils.sharding import (load_shared_durations, parse_shard, partition_digest, plan_shards,
+                            record_durations)
+from utils.wait_engine import WaitBudget, wait_engine_from_config
+
+browser_pool_key = pytest.StashKey()
+local_server_key = pytest.StashKey()
+artifacts_key = pytest.StashKey()
+run_start_key = pytest.StashKey()
+first_action_key = pytest.StashKey()
+shard_key = pytest.StashKey()
+shard_plan_key = pytest.StashKey()
+shard_digest_key = pytest.StashKey()
+
+# Setup + call + teardown seconds per test of this run: {node id: seconds}
+measured_durations = {}
+
+def pytest_addoption(parser):
+    parser.addoption("--config-override", action="append", default=[], metavar="KEY=VALUE",
+                     help="override a config.properties setting for this run (repeatable)")
+    parser.addoption("--local-server", action="store_true",
+                     help="run against the bundled local Demoblaze stand-in instead of base_url")
+    parser.addoption("--profile", metavar="NAME",
+                     help="browser launch profile from config.properties (e.g. headless-fast, debug, fidelity)")
+    parser.addoption("--shard", metavar="I/N",
+                     help="run only the I-th of N shards, balanced by the durations recorded in earlier runs")
+
+def pytest_configure(config):
+    config.stash[run_start_key] = time.perf_counter()
+
+    # Command-line overrides take precedence over DEMOBLAZE_* environment variables and the file
+    overrides = {}
+    for item in config.getoption("config_override"):
+        key, sep, value = item.partition("=")
+        if not sep:
+            raise pytest.UsageError(f"--config-override expects KEY=VALUE, got '{item}'")
+        overrides[key.strip()] = value.strip()
+    if config.getoption("profile"):
+        overrides["launch_profile"] = config.getoption("profile")
+    if overrides:
+        ConfigReader.set_overrides(overrides)
+    recorder.enabled = ConfigReader.get("instrumentation")
+
+    # Fail fast on an unknown profile, and tag the timings with it so runs can be compared
+    try:
+        profile = active_profile()
+    except ValueError as e:
+        raise pytest.UsageError(str(e))
+    recorder.metadata["launch_profile"] = describe(profile)
+    try:
+        load_policies()
+        config.stash[shard_key] = parse_shard(config.getoption("shard")) if config.getoption("shard") else None
+    except ValueError as e:
+        raise pytest.UsageError(str(e))
+
+def is_xdist_worker(config):
+    return hasattr(config, "workerinput")
+
+def is_xdist_controller(config):
+    # The process that hands tests to `-n` workers and runs none itself
+    return not is_xdist_worker(config) and bool(getattr(config.option, "numprocesses", None))
+
+def pytest_sessionstart(session):
+    # Drop step timings and logs left over from a previous run before workers start writing theirs
+    if not is_xdist_worker(session.config):
+        report_dir = ConfigReader.get_path("report_dir")
+        for path in glob.glob(os.path.join(report_dir, "step_timings.*.json")) + \
+                glob.glob(os.path.join(report_dir, "browser_health.*.json")) + \
+                glob.glob(os.path.join(report_dir, "artifact_stats.*.json")):
+            os.remove(path)
+        remove_worker_logs(ConfigReader.get_path("log_dir"))
+
+def pytest_collection_modifyitems(config, items):
+    # --shard i/N: keep the tests of shard i. The split only depends on the collected tests and the committed
+    # durations file, so every machine (and xdist worker) computes the same one; the logged digest shows it did.
+    shard = config.stash[shard_key]
+    if shard is None:
+        return
+    index, count = shard
+    node_ids = [item.nodeid for item in items]
+    durations = load_shared_durations(ConfigReader.get_path("shard_durations_file"))
+    shards, totals, method = plan_shards(node_ids, durations, count)
+    digest = partition_digest(node_ids, durations, count)
+    setup_logger().info("Shard %s/%s: %s of %s test(s), split by %s, partition digest %s", index, count,
+                        len(shards[index - 1]), len(node_ids), method, digest)
+    config.stash[shard_digest_key] = (method, digest)
+    selected = set(shards[index - 1])
+    deselected = [item for item in items if item.nodeid not in selected]
+    if deselected:
+        config.hook.pytest_deselected(items=deselected)
+        items[:] = [item for item in items if item.nodeid in selected]
+    config.stash[shard_plan_key] = totals
+
+def pytest_runtest_logreport(report):
+    # Recorded by the process that sees every report: the xdist controller, or the only process of a plain run
+    if get_worker_id() == "master":
+        measured_durations[report.nodeid] = measured_durations.get(report.nodeid, 0.0) + report.duration
+
+def pytest_generate_tests(metafunc):
+    # Checkout matrix: one test per record of order_dataset. Only the record references are kept at collection;
+    # each test reads its full record back from the source when it runs.
+    if "order_record" in metafunc.fixturenames:
+        refs = configured_source().refs()
+        metafunc.parametrize("order_record", refs, ids=[ref.id for ref in refs])
+
+def pytest_collection_finish(session):
+    # Boot browsers only for a run that will lease one, deciding on the final (sharded, deselected) items; the
+    # local server has to be up first so they warm up on it
+    config = session.config
+    if not ConfigReader.get("prelaunch_browsers") or config.option.collectonly or is_xdist_controller(config):
+        return
+    if not any("browser_pool" in getattr(item, "fixturenames", ()) for item in session.items):
+        return
+    logger = setup_logger()
+    start_local_server(config, logger)
+    pool = create_browser_pool(config, logger)
+    pool.prelaunch(min(ConfigReader.get("prelaunch_browsers"), pool.size), ConfigReader.get_property("base_url"))
+
+def pytest_sessionfinish(session):
+    # Each process (controller or xdist worker) writes its own raw step timings and browser health
+    report_dir = ConfigReader.get_path("report_dir")
+    if recorder.records:
+        recorder.write(os.path.join(report_dir, f"step_timings.{get_worker_id()}.json"))
+    pool = session.config.stash.get(browser_pool_key, None)
+    if pool is not None and pool.watchdog is not None:
+        pool.watchdog.write(os.path.join(report_dir, f"browser_health.{get_worker_id()}.json"))
+
+    server = session.config.stash.get(local_server_key, None)
+    if server is not None:
+        server.stop()
+
+    # Let the background threads finish writing failure artifacts
+    artifacts = session.config.stash.get(artifacts_key, None)
+    if artifacts is not None:
+        artifacts.close()
+        artifacts.write_stats(os.path.join(report_dir, f"artifact_stats.{get_worker_id()}.json"))
+
+    # Test durations of this run feed the balancing of the next one
+    if measured_durations and not is_xdist_worker(session.config):
+        record_durations(ConfigReader.get_path("shard_durations_dir"), session.config.stash[shard_key],
+                         measured_durations)
+
+    # Flush this process's log file; the controller then merges every worker's file into one
+    stop_logging(__name__)
+    if not is_xdist_worker(session.config):
+        merge_worker_logs(ConfigReader.get_path("log_dir"))
+
+def setup_logger():
+    # Configures the framework logger once per process; later calls return it unchanged.
+    # Records go through a queue to a listener thread writing JSON lines to this worker's file and the console.
+    return start_logging(__name__, get_worker_id(), ConfigReader.get_path("log_dir"),
+                         level=getattr(logging, ConfigReader.get("log_level")))
+
+def start_local_server(config, logger):
+    # Starts the Demoblaze stand-in once per process when requested and points base_url and api_url at it
+    if local_server_key in config.stash:
+        return config.stash[local_server_key]
+    server = None
+    if config.getoption("local_server") or ConfigReader.get("use_local_server"):
+        from local_site.server import server_from_config
+
+        server = server_from_config().start()
+        ConfigReader.update_overrides({"base_url": server.url, "api_url": server.url})
+        logger.info("Local Demoblaze stand-in running at %s (latency: %s)", server.url, server.latency.mode)
+    config.stash[local_server_key] = server
+    return server
+
+def create_browser_pool(config, logger):
+    # The process-wide browser pool, created on first use (at session start when browsers are pre-launched)
+    if browser_pool_key in config.stash:
+        return config.stash[browser_pool_key]
+    watchdog = None
+    if ConfigReader.get("watchdog_enabled"):
+        watchdog = BrowserWatchdog(logger, rss_limit_mb=ConfigReader.get("watchdog_rss_limit_mb"),
+                                   probe_timeout=ConfigReader.get("watchdog_probe_timeout"),
+                                   pid_file=ConfigReader.get_path("watchdog_pid_file"))
+        watchdog.sweep_orphans()
+    pool = BrowserPool(
+        logger,
+        size=ConfigReader.get("pool_size"),
+        recycle_after=ConfigReader.get("pool_recycle_after"),
+        watchdog=watchdog,
+    )
+    config.stash[browser_pool_key] = pool
+    return pool
 
 # Logging Fixture
 @pytest.fixture(scope="session", autouse=True)
 def logger():
     # Set up and return a logger instance as a fixture
-    logger = logging.getLogger(__name__)
-    logger.setLevel(logging.INFO)  # Global log level
+    return setup_logger()
 
-    # File Handler: Logs all details at DEBUG level
-    file_handler = logging.FileHandler("test_logs.log")
-    file_handler.setLevel(logging.DEBUG)
+# Local Server Fixture: Starts the Demoblaze stand-in on a free port and points base_url and api_url at it
+@pytest.fixture(scope="session", autouse=True)
+def local_server(request, logger):
+    # Already running if it was started for the pre-launched browsers; stopped at session finish
+    return start_local_server(request.config, logger)
 
-    # Console Handler: Logs at INFO level
-    console_handler = logging.StreamHandler()
-    console_handler.setLevel(logging.INFO)
+def failure_artifacts(config, logger):
+    # The process-wide failure artifact writer, created on the first failure
+    if artifacts_key not in config.stash:
+        config.stash[artifacts_key] = FailureArtifacts(
+            ConfigReader.get_path("artifact_dir"),
+            max_bytes=ConfigReader.get("artifact_max_mb") * 1024 * 1024,
+            workers=ConfigReader.get("artifact_workers"),
+            logger=logger,
+        )
+    return config.stash[artifacts_key]
 
-    # Format
-    formatter = logging.Formatter("%(asctime)s - %(levelname)s - %(message)s")
-    file_handler.setFormatter(formatter)
-    console_handler.setFormatter(formatter)
+def browser_of(item):
+    # The WebDriver a test used: a driver fixture, or an object holding one (e.g. checkout_session)
+    for value in getattr(item, "funcargs", {}).values():
+        for candidate in (value, getattr(value, "driver", None)):
+            if isinstance(candidate, WebDriver):
+                return candidate
+    return None
 
-    # Add handlers
-    logger.addHandler(file_handler)
-    logger.addHandler(console_handler)
+# Records each phase's report on the test item so fixtures can see whether the test failed, and captures the
+# browser's state when setup or the test fails, before the driver fixture resets the session
+@pytest.hookimpl(hookwrapper=True, tryfirst=True)
+def pytest_runtest_makereport(item, call):
+    outcome = yield
+    rep = outcome.get_result()
+    setattr(item, "rep_" + rep.when, rep)
+    if rep.failed and rep.when in ("setup", "call") and ConfigReader.get("artifacts_enabled"):
+        driver = browser_of(item)
+        if driver is not None:
+            path, _ = failure_artifacts(item.config, setup_logger()).capture(driver, item.nodeid)
+            rep.sections.append(("failure artifacts", path))
 
-    return logger  
+# Browser Pool Fixture: Keeps WebDriver sessions alive for the whole run
+@pytest.fixture(scope="session")
+def browser_pool(request, logger):
+    pool = create_browser_pool(request.config, logger)
+    yield pool
+    pool.close()
 
-# WebDriver Fixture: Initializes WebDriver and Closes It After Tests
+# WebDriver Fixture: Leases a browser from the pool and hands it back clean after the test
 @pytest.fixture(scope="function")
-def driver(logger):
-    # Setup WebDriver before each test and close it after
-    logger.info("Launching browser...")
+def driver(request, browser_pool, logger):
+    # Lease a WebDriver before each test and reset it afterwards
+    logger.info("Leasing browser...")
+    driver = browser_pool.acquire()
+    if first_action_key not in request.config.stash:
+        # How long the run took to get a browser into the hands of its first test
+        elapsed = time.perf_counter() - request.config.stash[run_start_key]
+        request.config.stash[first_action_key] = elapsed
+        recorder.metadata["time_to_first_action"] = round(elapsed, 3)
     try:
-        service = Service(ChromeDriverManager().install())
-        driver = webdriver.Chrome(service=service)
-        driver.implicitly_wait(IMPLICIT_WAIT)
-        driver.maximize_window()
         yield driver
-    except Exception as e:
-        logger.error(f"WebDriver failed to initialize: {e}")
-        raise
     finally:
-        logger.info("Closing browser...")
-        if 'driver' in locals():
-            driver.quit()
+        rep = getattr(request.node, "rep_call", None)
+        recycle = rep is not None and rep.failed and ConfigReader.get("pool_recycle_on_failure")
+        logger.info("Returning browser to pool...")
+        browser_pool.release(driver, recycle=recycle, test_id=request.node.nodeid)
     
-# Waits Fixture: Provides Explicit Waits
+# Step Timing Fixture: Attributes every recorded step to the running test
+@pytest.fixture(autouse=True)
+def step_timing_context(request):
+    recorder.test_id = request.node.nodeid
+    yield
+    recorder.test_id = None
+
+# Retry Fixture: Gives every test a fresh retry budget and records how many retries its steps needed
+@pytest.fixture(autouse=True)
+def retry_tracking(request):
+    retry_engine.begin(ConfigReader.get("test_retry_budget"))
+    yield
+    if retry_engine.stats:
+        request.node.user_properties.append(("retries", retry_engine.stats))
+
+# Tags every test result with the xdist worker that ran it (visible in --junitxml reports)
+@pytest.fixture(autouse=True)
+def worker_tag(record_property):
+    record_property("worker_id", get_worker_id())
+
+# Account Fixture: Each xdist worker gets its own test account, created on demand when the pool runs out
+@pytest.fixture(scope="session")
+def test_account(browser_pool, logger):
+    from pages.signup_page import SignupPage
+
+    def create(account):
+        driver = browser_pool.acquire()
+        try:
+            wait = wait_engine_from_config(driver, logger=logger)
+            signup_page = SignupPage(driver, wait, wait, logger)
+            signup_page.open_url()
+            signup_page.signup_new_user(account.username, account.password)
+        finally:
+            browser_pool.release(driver)
+
+    accounts = AccountPool.from_config(logger)
+    account = accounts.allocate(get_worker_id(), create=create)
+    yield account
+    accounts.release(account)
+
+# Session Snapshots Fixture: Logged-in cookies/localStorage cached on disk, shared by every worker and run
+@pytest.fixture(scope="session")
+def session_snapshots(logger):
+    from utils.session_snapshot import SessionSnapshots
+    return SessionSnapshots.from_config(logger)
+
+# Logged-in WebDriver Fixture: Restores the test account's session snapshot (or logs in once and saves one),
+# leaving the browser on the home page
+@pytest.fixture
+def logged_in_driver(driver, wait_engine, logger, test_account, session_snapshots):
+    from pages.login_page import LoginPage
+
+    LoginPage(driver, wait_engine, wait_engine, logger).login_from_snapshot(session_snapshots, test_account)
+    return driver
+
+# Step Runner Fixture: Runs a test's flow as resumable steps and records the time saved by resuming
+@pytest.fixture
+def step_runner(request, logger):
+    from utils.step_runner import StepRunner
+
+    runner = StepRunner(logger, checkpoint=request.node.nodeid, retries=ConfigReader.get("step_retries"))
+    yield runner
+    if runner.skipped:
+        request.node.user_properties.append(("steps_skipped", len(runner.skipped)))
+        request.node.user_properties.append(("resume_time_saved", round(runner.time_saved, 3)))
+
+# Catalog Fixture: Product index built once per session (and cached on disk) for direct product navigation
+@pytest.fixture(scope="session")
+def catalog(local_server, logger):
+    from utils.catalog import shared_catalog
+    return shared_catalog(logger)
+
+# Checkout Session Fixture: One browser for all records of a checkout matrix module, remembering its cart
+@pytest.fixture(scope="module")
+def checkout_session(browser_pool, logger):
+    session = CheckoutSession(browser_pool.acquire())
+    yield session
+    logger.info("Returning checkout browser to pool...")
+    browser_pool.release(session.driver, recycle=session.failed and ConfigReader.get("pool_recycle_on_failure"))
+
+# Order Checkout Fixture: Loads the test's order record and puts its cart in the shared browser, reusing the cart
+# the previous record left when it holds the same products. Yields (record, OrderPage) with the cart page open.
+@pytest.fixture
+def order_checkout(request, checkout_session, order_record, wait_budget, logger):
+    from pages.cart_page import CartPage
+    from pages.order_page import OrderPage
+
+    start = time.perf_counter()
+    record = record_source(order_record.source).record(order_record)
+    driver = checkout_session.driver
+    wait = wait_engine_from_config(driver, budget=wait_budget, logger=logger)
+    cart_page = CartPage(driver, wait, wait, logger)
+
+    cart = sorted(record.cart)
+    reused = checkout_session.cart == cart
+    if not reused:
+        checkout_session.cart = None  # unknown until seeding has finished
+        cart_page.clear_cart()
+        if cart:
+            cart_page.seed_cart(cart)
+        checkout_session.cart = cart
+    logger.info("Order record '%s': cart %s", record.id, "reused" if reused else "seeded")
+    request.node.user_properties.append(("order_record", record.id))
+    request.node.user_properties.append(("cart_reused", reused))
+    try:
+        cart_page.open_cart(expect_items=bool(cart))
+        yield record, OrderPage(driver, wait, wait, logger)
+    finally:
+        rep = getattr(request.node, "rep_call", None)
+        if rep is None or rep.failed:
+            # Whatever the failed record left behind must not leak into the next one
+            checkout_session.cart = None
+            checkout_session.failed = True
+            reset_session(driver)
+        elif record.expect == "confirmed":
+            checkout_session.cart = []  # the site empties the cart on purchase
+        request.node.user_properties.append(("checkout_seconds", round(time.perf_counter() - start, 3)))
+
+# Reports how long browser sessions took to start and where the run spent its time
+def pytest_terminal_summary(terminalreporter, config):
+    pool = config.stash.get(browser_pool_key, None)
+    if pool is not None and pool.startup_times:
+        times = pool.startup_times
+        terminalreporter.write_sep("-", "browser startup")
+        terminalreporter.write_line(
+            f"{len(times)} session(s) launched: first {times[0]:.2f}s, "
+            f"avg {sum(times) / len(times):.2f}s, total {sum(times):.2f}s"
+        )
+    if first_action_key in config.stash:
+        prelaunched = pool.prelaunched if pool is not None else 0
+        terminalreporter.write_line(
+            f"time to first test action: {config.stash[first_action_key]:.2f}s ({prelaunched} browser(s) pre-launched)"
+        )
+
+    if pool is not None and pool.watchdog is not None:
+        watchdog = pool.watchdog
+        kinds = {}
+        for event in watchdog.events:
+            kinds[event.kind] = kinds.get(event.kind, 0) + 1
+        peak = max((s.rss_mb for s in watchdog.samples), default=None)
+        terminalreporter.write_sep("-", "browser health")
+        terminalreporter.write_line(
+            f"{len(watchdog.events)} recycle(s)" + "".join(f", {n} {kind}" for kind, n in sorted(kinds.items()))
+        )
+        terminalreporter.write_line(
+            (f"peak RSS {peak:.0f} MB over {len(watchdog.samples)} sample(s)" if peak is not None
+             else "memory sampling unavailable (install psutil)") + f", {watchdog.orphans_killed} orphan(s) killed"
+        )
+
+    if cache_stats.hits or cache_stats.misses:
+        lookups = cache_stats.hits + cache_stats.misses
+        terminalreporter.write_sep("-", "element cache")
+        terminalreporter.write_line(f"{cache_stats.hits} hit(s), {cache_stats.misses} miss(es) "
+                                    f"({cache_stats.hits / lookups:.0%} hit rate), {cache_stats.stale} stale")
+
+    # Steps skipped by StepRunner on retries and steps retried by the retry engine (xdist workers included)
+    skipped = saved = 0
+    retries = {}
+    for reports in terminalreporter.stats.values():
+        for report in reports:
+            properties = dict(getattr(report, "user_properties", []))
+            if getattr(report, "when", None) != "teardown":
+                continue
+            if "steps_skipped" in properties:
+                skipped += properties["steps_skipped"]
+                saved += properties["resume_time_saved"]
+            for step, counts in properties.get("retries", {}).items():
+                totals = retries.setdefault(step, {"retries": 0, "recovered": 0, "gave_up": 0})
+                for field, count in counts.items():
+                    totals[field] += count
+    if retries:
+        terminalreporter.write_sep("-", "retries")
+        terminalreporter.write_line(f"{'step':<45} {'retries':>7} {'recovered':>9} {'gave up':>7}")
+        for step, counts in sorted(retries.items(), key=lambda item: item[1]["retries"], reverse=True):
+            terminalreporter.write_line(
+                f"{step:<45} {counts['retries']:>7} {counts['recovered']:>9} {counts['gave_up']:>7}"
+            )
+    if skipped:
+        terminalreporter.write_sep("-", "step resume")
+        terminalreporter.write_line(f"{skipped} step(s) skipped on retry, {saved:.2f}s saved")
+
+    # Per-record outcome and time of the checkout matrix (cart setup included)
+    outcomes = {}
+    matrix = []
+    for reports in terminalreporter.stats.values():
+        for report in reports:
+            if getattr(report, "when", None) in ("setup", "call") and report.outcome != "passed":
+                outcomes.setdefault(report.nodeid, report.outcome)
+            properties = dict(getattr(report, "user_properties", []))
+            if getattr(report, "when", None) == "teardown" and "checkout_seconds" in properties:
+                matrix.append((report.nodeid, properties))
+    if matrix:
+        passed = sum(1 for node_id, _ in matrix if node_id not in outcomes)
+        failed = sum(1 for node_id, _ in matrix if outcomes.get(node_id) == "failed")
+        reused = sum(1 for _, properties in matrix if properties["cart_reused"])
+        seconds = [properties["checkout_seconds"] for _, properties in matrix]
+        terminalreporter.write_sep("-", "checkout matrix")
+        terminalreporter.write_line(f"{'record':<30} {'result':>7} {'cart':>7} {'time':>8}")
+        for node_id, properties in matrix:
+            terminalreporter.write_line(
+                f"{properties['order_record']:<30} {outcomes.get(node_id, 'passed'):>7} "
+                f"{'reused' if properties['cart_reused'] else 'seeded':>7} {properties['checkout_seconds']:>7.2f}s"
+            )
+        terminalreporter.write_line(
+            f"{len(matrix)} record(s): {passed} passed, {failed} failed; {reused} cart(s) reused; "
+            f"avg {sum(seconds) / len(seconds):.2f}s, max {max(seconds):.2f}s per record"
+        )
+
+    # What capturing failure artifacts cost the tests, and what the background threads wrote
+    artifacts = load_stats(ConfigReader.get_path("report_dir")) if not is_xdist_worker(config) else None
+    if artifacts and artifacts["captures"]:
+        captures = artifacts["captures"]
+        terminalreporter.write_sep("-", "failure artifacts")
+        terminalreporter.write_line(
+            f"{captures} capture(s): {artifacts['capture_seconds']:.2f}s on the tests' path "
+            f"(avg {artifacts['capture_seconds'] / captures * 1000:.0f} ms), "
+            f"{artifacts['write_seconds']:.2f}s writing in the background"
+        )
+        terminalreporter.write_line(
+            f"{artifacts['bytes_written'] / 1024:.0f} KB written, {artifacts['dom_deduplicated']} page source(s) "
+            f"deduplicated, {artifacts['evicted']} test(s) evicted, {artifacts['errors']} error(s) "
+            f"-> {ConfigReader.get_path('artifact_dir')}"
+        )
+
+    # Measured time of this shard against the split's estimate (the estimate is only known where tests were collected)
+    shard = config.stash.get(shard_key, None)
+    if shard is not None and not is_xdist_worker(config):
+        terminalreporter.write_sep("-", f"shard {shard[0]}/{shard[1]}")
+        line = f"{len(measured_durations)} test(s) took {sum(measured_durations.values()):.1f}s"
+        totals = config.stash.get(shard_plan_key, None)
+        if totals:
+            line += (f", expected {totals[shard[0] - 1]:.1f}s "
+                     f"(all shards: {', '.join(f'{total:.1f}s' for total in totals)})")
+        terminalreporter.write_line(line)
+        if shard_digest_key in config.stash:
+            method, digest = config.stash[shard_digest_key]
+            terminalreporter.write_line(f"split by {method}, partition digest {digest} (the same on every shard "
+                                        f"means they split alike)")
+
+    if is_xdist_worker(config):
+        return
+    report_dir = ConfigReader.get_path("report_dir")
+    records, metadata = load_records(report_dir)
+    if not records:
+        return
+    summary = write_reports(report_dir, records, metadata)
+    profile = metadata.get("launch_profile", {}).get("name", "?")
+    terminalreporter.write_sep("-", f"slowest steps (profile: {profile})")
+    terminalreporter.write_line(f"{'step':<45} {'count':>5} {'p50':>8} {'p95':>8} {'max':>8} {'wait':>6}")
+    for row in summary[:ConfigReader.get("timing_report_top")]:
+        terminalreporter.write_line(
+            f"{row['step']:<45} {row['count']:>5} {row['p50']:>7.3f}s {row['p95']:>7.3f}s "
+            f"{row['max']:>7.3f}s {row['wait_share']:>6.0%}"
+        )
+    terminalreporter.write_line(f"Full report: {os.path.join(report_dir, 'step_timings.json')} (and .csv)")
+
+# Wait Budget Fixture: Total waiting time allowed for one test, shared by all of its waits
+@pytest.fixture
+def wait_budget():
+    return WaitBudget(ConfigReader.get("test_wait_budget"))
+
+# Waits Fixture: One WaitEngine per test, drawing from the test's wait budget
+@pytest.fixture
+def wait_engine(driver, wait_budget, logger):
+    return wait_engine_from_config(driver, budget=wait_budget, logger=logger)
+
 @pytest.fixture
-def explicit_wait(driver):
-    # Returns an instance of WebDriverWait for explicit waits
-    return WebDriverWait(driver, EXPLICIT_WAIT)
+def explicit_wait(wait_engine):
+    # Kept for page-object constructors; explicit and fluent waits are the same engine
+    return wait_engine
 
 @pytest.fixture
-def fluent_wait(driver):
-    # Fixture to provide Fluent Wait with timeout and polling interval
-    return WebDriverWait(driver, EXPLICIT_WAIT, poll_frequency=POLLING_INTERVAL, 
-                         ignored_exceptions=[TimeoutException])
+def fluent_wait(wait_engine):
+    return wait_engine
 
 @pytest.fixture
 def test_order_data():
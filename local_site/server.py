@@ -0,0 +1,285 @@
+import argparse
+import base64
+import json
+import os
+import random
+import threading
+import time
+import uuid
+from http.server import ThreadingHTTPServer, SimpleHTTPRequestHandler
+
+STATIC_DIR = os.path.join(os.path.dirname(__file__), "static")
+PAGE_SIZE = 9
+
+# Same ids, titles, categories and prices as the live storefront
+PRODUCTS = [
+    {"id": 1, "cat": "phone", "title": "Samsung galaxy s6", "price": 360},
+    {"id": 2, "cat": "phone", "title": "Nokia lumia 1520", "price": 820},
+    {"id": 3, "cat": "phone", "title": "Nexus 6", "price": 650},
+    {"id": 4, "cat": "phone", "title": "Samsung galaxy s7", "price": 800},
+    {"id": 5, "cat": "phone", "title": "Iphone 6 32gb", "price": 790},
+    {"id": 6, "cat": "phone", "title": "Sony xperia z5", "price": 320},
+    {"id": 7, "cat": "phone", "title": "HTC One M9", "price": 700},
+    {"id": 8, "cat": "notebook", "title": "Sony vaio i5", "price": 790},
+    {"id": 9, "cat": "notebook", "title": "Sony vaio i7", "price": 790},
+    {"id": 10, "cat": "monitor", "title": "Apple monitor 24", "price": 400},
+    {"id": 11, "cat": "notebook", "title": "MacBook air", "price": 700},
+    {"id": 12, "cat": "notebook", "title": "Dell i7 8gb", "price": 700},
+    {"id": 13, "cat": "notebook", "title": "2017 Dell 15.6 Inch", "price": 700},
+    {"id": 14, "cat": "monitor", "title": "ASUS Full HD", "price": 230},
+    {"id": 15, "cat": "notebook", "title": "MacBook Pro", "price": 1100},
+]
+for _product in PRODUCTS:
+    _product["desc"] = f"Local stand-in for {_product['title']}."
+    _product["img"] = "imgs/placeholder.svg"
+
+
+class Latency:
+    # Per-request delay: "zero", "fixed" (latency_ms) or "jitter" (latency_ms +/- jitter_ms, seeded)
+
+    MODES = ("zero", "fixed", "jitter")
+
+    def __init__(self, mode="zero", latency_ms=0, jitter_ms=0, seed=None):
+        if mode not in self.MODES:
+            raise ValueError(f"Unknown latency mode '{mode}', expected one of {self.MODES}")
+        self.mode = mode
+        self.latency_ms = latency_ms
+        self.jitter_ms = jitter_ms
+        self._random = random.Random(seed)
+        self._lock = threading.Lock()
+
+    def delay(self):
+        if self.mode == "zero":
+            return 0.0
+        if self.mode == "fixed":
+            return self.latency_ms / 1000
+        with self._lock:
+            offset = self._random.uniform(-self.jitter_ms, self.jitter_ms)
+        return max(0.0, self.latency_ms + offset) / 1000
+
+
+class StoreState:
+    # In-memory users, sessions and carts
+
+    def __init__(self, accounts=()):
+        self.lock = threading.Lock()
+        self.users = {username: password for username, password in accounts}
+        self.tokens = {}
+        self.cart = []  # {"id", "owner", "prod_id"}
+
+    def owner(self, cookie, flag):
+        # Logged-in carts are keyed by username (flag=True sends the auth token), anonymous ones by the user cookie
+        if flag:
+            return self.tokens.get(cookie)
+        return cookie
+
+
+class DemoblazeHandler(SimpleHTTPRequestHandler):
+    # Serves the static pages and the JSON endpoints the storefront scripts call
+
+    server_version = "DemoblazeStandIn/1.0"
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, directory=STATIC_DIR, **kwargs)
+
+    def log_message(self, format, *args):
+        pass
+
+    def end_headers(self):
+        self.send_header("Access-Control-Allow-Origin", "*")
+        self.send_header("Access-Control-Allow-Headers", "Content-Type")
+        self.send_header("Cache-Control", "no-store")
+        super().end_headers()
+
+    def do_OPTIONS(self):
+        self.send_response(204)
+        self.end_headers()
+
+    def do_GET(self):
+        self._sleep()
+        if self.path == "/" or self.path.startswith("/?"):
+            self.path = "/index.html"
+        super().do_GET()
+
+    def do_POST(self):
+        self._sleep()
+        length = int(self.headers.get("Content-Length") or 0)
+        try:
+            body = json.loads(self.rfile.read(length) or b"{}")
+        except ValueError:
+            return self._reply({"errorMessage": "Malformed JSON"}, status=400)
+
+        route = getattr(self, "api_" + self.path.strip("/").split("?")[0], None)
+        if route is None:
+            return self._reply({"errorMessage": "Not found"}, status=404)
+        with self.server.state.lock:
+            self._reply(route(self.server.state, body))
+
+    # Endpoints
+
+    def api_entries(self, state, body):
+        return self._page(PRODUCTS)
+
+    def api_pagination(self, state, body):
+        after = int(body.get("id", 0))
+        return self._page([p for p in PRODUCTS if p["id"] > after])
+
+    def api_bycat(self, state, body):
+        return {"Items": [p for p in PRODUCTS if p["cat"] == body.get("cat")]}
+
+    def api_view(self, state, body):
+        product_id = int(body.get("id", 0))
+        for product in PRODUCTS:
+            if product["id"] == product_id:
+                return product
+        return {"errorMessage": "Product not found"}
+
+    def api_signup(self, state, body):
+        username = body.get("username", "")
+        if not username or username in state.users:
+            return {"errorMessage": "This user already exist."}
+        state.users[username] = body.get("password", "")
+        return ""
+
+    def api_login(self, state, body):
+        username = body.get("username", "")
+        if username not in state.users:
+            return {"errorMessage": "User does not exist."}
+        if state.users[username] != body.get("password", ""):
+            return {"errorMessage": "Wrong password."}
+        token = base64.b64encode(f"{username}{uuid.uuid4().hex[:6]}".encode()).decode()
+        state.tokens[token] = username
+        return f"Auth_token: {token}"
+
+    def api_check(self, state, body):
+        username = state.tokens.get(body.get("token"))
+        if username is None:
+            return {"errorMessage": "Token has expired."}
+        return {"Item": {"token": body.get("token"), "username": username}}
+
+    def api_addtocart(self, state, body):
+        owner = state.owner(body.get("cookie"), body.get("flag"))
+        if owner is None:
+            return {"errorMessage": "Token has expired."}
+        state.cart.append({"id": body.get("id") or str(uuid.uuid4()), "owner": owner, "prod_id": int(body["prod_id"])})
+        return ""
+
+    def api_viewcart(self, state, body):
+        owner = state.owner(body.get("cookie"), body.get("flag"))
+        items = [{"cookie": item["owner"], "id": item["id"], "prod_id": item["prod_id"]}
+                 for item in state.cart if owner is not None and item["owner"] == owner]
+        return {"Items": items}
+
+    def api_deleteitem(self, state, body):
+        state.cart = [item for item in state.cart if item["id"] != body.get("id")]
+        return ""
+
+    def api_deletecart(self, state, body):
+        state.cart = [item for item in state.cart if item["owner"] != body.get("cookie")]
+        return ""
+
+    def _page(self, products):
+        items = products[:PAGE_SIZE]
+        reply = {"Items": items}
+        if len(products) > PAGE_SIZE:
+            reply["LastEvaluatedKey"] = {"id": str(items[-1]["id"])}
+        return reply
+
+    def _reply(self, payload, status=200):
+        data = json.dumps(payload).encode()
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    def _sleep(self):
+        delay = self.server.latency.delay()
+        if delay:
+            time.sleep(delay)
+
+
+class DemoblazeServer:
+    """Local stand-in for demoblaze.com serving the same pages, modals and REST endpoints."""
+
+    def __init__(self, host="127.0.0.1", port=0, latency=None, accounts=()):
+        self.host = host
+        self.port = port  # 0 picks a free port
+        self.latency = latency or Latency()
+        self.state = StoreState(accounts)
+        self._httpd = None
+        self._thread = None
+
+    @property
+    def url(self):
+        return f"http://{self.host}:{self.port}"
+
+    def start(self):
+        self._httpd = ThreadingHTTPServer((self.host, self.port), DemoblazeHandler)
+        self._httpd.daemon_threads = True
+        self._httpd.state = self.state
+        self._httpd.latency = self.latency
+        self.port = self._httpd.server_address[1]
+        self._thread = threading.Thread(target=self._httpd.serve_forever, name="demoblaze-stand-in", daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        if self._httpd is not None:
+            self._httpd.shutdown()
+            self._httpd.server_close()
+            self._thread.join()
+            self._httpd = None
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, exc_type, exc, tb):
+        self.stop()
+
+
+def encode_password(password):
+    # The storefront scripts send passwords base64-encoded
+    return base64.b64encode(password.encode()).decode()
+
+
+def server_from_config():
+    # Builds a server using the local_server_* settings, with the pre-provisioned test accounts registered, and
+    # the accounts earlier runs signed up on a stand-in (the account pool hands those out again)
+    from utils.account_pool import LOCAL_TARGET, AccountPool
+    from utils.config_reader import ConfigReader
+
+    accounts = [
+        (ConfigReader.get("test_username") + str(i), encode_password(ConfigReader.get("test_password") + str(i)))
+        for i in ConfigReader.get("account_pool_ids")
+    ]
+    accounts += [(account.username, encode_password(account.password))
+                 for account in AccountPool.from_config(target=LOCAL_TARGET).created_accounts()]
+    latency = Latency(
+        mode=ConfigReader.get("local_server_latency_mode"),
+        latency_ms=ConfigReader.get("local_server_latency_ms"),
+        jitter_ms=ConfigReader.get("local_server_jitter_ms"),
+        seed=ConfigReader.get("local_server_seed"),
+    )
+    return DemoblazeServer(port=ConfigReader.get("local_server_port"), latency=latency, accounts=accounts)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Serve the local Demoblaze stand-in.")
+    parser.add_argument("--port", type=int, help="port to listen on (default: local_server_port from config)")
+    args = parser.parse_args(argv)
+
+    server = server_from_config()
+    if args.port is not None:
+        server.port = args.port
+    server.start()
+    print(f"Demoblaze stand-in listening on {server.url} (Ctrl+C to stop)")
+    try:
+        while True:
+            time.sleep(3600)
+    except KeyboardInterrupt:
+        server.stop()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,170 @@
+// Shared behaviour of the local Demoblaze stand-in: navbar, login/signup modals and the storefront API calls.
+var API_URL = "";
+
+function api(path, body) {
+    return fetch(API_URL + "/" + path, {
+        method: "POST",
+        headers: {"Content-Type": "application/json"},
+        body: JSON.stringify(body || {})
+    }).then(function (response) { return response.json(); });
+}
+
+function getCookie(name) {
+    var match = document.cookie.match(new RegExp("(?:^|; )" + name + "=([^;]*)"));
+    return match ? match[1] : null;
+}
+
+function setCookie(name, value) {
+    // Stored unencoded, as the live site does, so tokens read back from the browser can be sent to the API as-is
+    document.cookie = name + "=" + value + "; path=/";
+}
+
+function deleteCookie(name) {
+    document.cookie = name + "=; path=/; expires=Thu, 01 Jan 1970 00:00:00 GMT";
+}
+
+function uuid() {
+    return "xxxxxxxx-xxxx-4xxx-yxxx-xxxxxxxxxxxx".replace(/[xy]/g, function (c) {
+        var r = Math.random() * 16 | 0;
+        return (c === "x" ? r : (r & 0x3 | 0x8)).toString(16);
+    });
+}
+
+// Anonymous visitors get a cart keyed by a "user" cookie, logged-in ones by their auth token
+if (!getCookie("user")) {
+    setCookie("user", uuid());
+}
+
+function cartOwner() {
+    var token = getCookie("tokenp_");
+    return token ? {cookie: token, flag: true} : {cookie: getCookie("user"), flag: false};
+}
+
+var HEADER =
+    '<nav class="navbar" id="narvbarx">' +
+    '  <a class="navbar-brand" id="nava" href="index.html">PRODUCT STORE</a>' +
+    '  <ul class="navbar-nav">' +
+    '    <li class="nav-item active"><a class="nav-link" href="index.html">Home <span class="sr-only">(current)</span></a></li>' +
+    '    <li class="nav-item"><a class="nav-link" href="cart.html" id="cartur">Cart</a></li>' +
+    '    <li class="nav-item"><a class="nav-link" href="#" id="login2" data-toggle="modal" data-target="#logInModal">Log in</a></li>' +
+    '    <li class="nav-item"><a class="nav-link" href="#" id="logout2" onclick="logOut()" style="display:none">Log out</a></li>' +
+    '    <li class="nav-item"><a class="nav-link" href="#" id="nameofuser" style="display:none"></a></li>' +
+    '    <li class="nav-item"><a class="nav-link" href="#" id="signin2" data-toggle="modal" data-target="#signInModal">Sign up</a></li>' +
+    '  </ul>' +
+    '</nav>' +
+    '<div class="modal" id="signInModal" role="dialog">' +
+    '  <div class="modal-dialog"><div class="modal-content">' +
+    '    <div class="modal-header"><h5 class="modal-title" id="signInModalLabel">Sign up</h5></div>' +
+    '    <div class="modal-body"><form>' +
+    '      <div class="form-group"><label for="sign-username">Username:</label><input type="text" class="form-control" id="sign-username"></div>' +
+    '      <div class="form-group"><label for="sign-password">Password:</label><input type="password" class="form-control" id="sign-password"></div>' +
+    '    </form></div>' +
+    '    <div class="modal-footer">' +
+    '      <button type="button" class="btn btn-secondary" data-dismiss="modal">Close</button>' +
+    '      <button type="button" class="btn btn-primary" onclick="register()">Sign up</button>' +
+    '    </div>' +
+    '  </div></div>' +
+    '</div>' +
+    '<div class="modal" id="logInModal" role="dialog">' +
+    '  <div class="modal-dialog"><div class="modal-content">' +
+    '    <div class="modal-header"><h5 class="modal-title" id="logInModalLabel">Log in</h5></div>' +
+    '    <div class="modal-body"><form>' +
+    '      <div class="form-group"><label for="loginusername">Username:</label><input type="text" class="form-control" id="loginusername"></div>' +
+    '      <div class="form-group"><label for="loginpassword">Password:</label><input type="password" class="form-control" id="loginpassword"></div>' +
+    '    </form></div>' +
+    '    <div class="modal-footer">' +
+    '      <button type="button" class="btn btn-secondary" data-dismiss="modal">Close</button>' +
+    '      <button type="button" class="btn btn-primary" onclick="logIn()">Log in</button>' +
+    '    </div>' +
+    '  </div></div>' +
+    '</div>';
+
+document.body.insertAdjacentHTML("afterbegin", HEADER);
+
+// Bootstrap-style data-toggle / data-dismiss handling for modals
+function showModal(selector) {
+    document.querySelector(selector).classList.add("show");
+}
+
+function hideModal(modal) {
+    modal.classList.remove("show");
+}
+
+document.addEventListener("click", function (event) {
+    var toggle = event.target.closest("[data-toggle='modal']");
+    if (toggle) {
+        event.preventDefault();
+        showModal(toggle.getAttribute("data-target"));
+        return;
+    }
+    var dismiss = event.target.closest("[data-dismiss='modal']");
+    if (dismiss) {
+        hideModal(dismiss.closest(".modal"));
+    }
+});
+
+function register() {
+    var username = document.getElementById("sign-username").value;
+    var password = document.getElementById("sign-password").value;
+    api("signup", {username: username, password: btoa(password)}).then(function (response) {
+        if (response && response.errorMessage) {
+            alert(response.errorMessage);
+            return;
+        }
+        alert("Sign up successful.");
+        hideModal(document.getElementById("signInModal"));
+    });
+}
+
+function logIn() {
+    var username = document.getElementById("loginusername").value;
+    var password = document.getElementById("loginpassword").value;
+    api("login", {username: username, password: btoa(password)}).then(function (response) {
+        if (typeof response === "string" && response.indexOf("Auth_token: ") === 0) {
+            setCookie("tokenp_", response.substring("Auth_token: ".length));
+            location.reload();
+            return;
+        }
+        alert(response.errorMessage);
+    });
+}
+
+function logOut() {
+    deleteCookie("tokenp_");
+    location.href = "index.html";
+}
+
+var currentUser = null;
+
+function checkSession() {
+    var token = getCookie("tokenp_");
+    if (!token) {
+        return Promise.resolve(null);
+    }
+    return api("check", {token: token}).then(function (response) {
+        if (!response.Item) {
+            deleteCookie("tokenp_");
+            return null;
+        }
+        currentUser = response.Item.username;
+        var welcome = document.getElementById("nameofuser");
+        welcome.textContent = "Welcome " + currentUser;
+        welcome.style.display = "block";
+        document.getElementById("logout2").style.display = "block";
+        document.getElementById("login2").style.display = "none";
+        document.getElementById("signin2").style.display = "none";
+        return currentUser;
+    });
+}
+
+var sessionChecked = checkSession();
+
+function productCard(product) {
+    return '<div class="col-lg-4 col-md-6 mb-4"><div class="card h-100">' +
+        '<a href="prod.html?idp_=' + product.id + '"><img class="card-img-top img-fluid" src="' + product.img + '" alt=""></a>' +
+        '<div class="card-block">' +
+        '<h4 class="card-title"><a href="prod.html?idp_=' + product.id + '" class="hrefch">' + product.title + '</a></h4>' +
+        '<h5>$' + product.price + '</h5>' +
+        '<p class="card-text" id="article">' + product.desc + '</p>' +
+        '</div></div></div>';
+}
@@ -1,7 +1,27 @@
 # pages/base_page.py
+import json
+import re
+from urllib.parse import urlsplit
 from selenium.webdriver.support import expected_conditions as EC
-from selenium.common.exceptions import TimeoutException, NoSuchElementException
+from selenium.common.exceptions import NoSuchElementException, StaleElementReferenceException, WebDriverException
 from utils.config_reader import ConfigReader
+from utils.dom_scripts import (READ_TEXTS, FILL_FORM, NETWORK_STATUS, READ_LOCAL_STORAGE, WRITE_LOCAL_STORAGE,
+                               RESTORE_LOCAL_STORAGE)
+from utils.instrumentation import instrument_page_class
+from utils.locators import ElementCache, check_locator
+from utils.network_monitor import inject_network_monitor
+from utils.retry_policy import retryable
+
+# How to wait for an element: (condition on a locator, the same condition on an already resolved element)
+ELEMENT_CONDITIONS = {
+    "visible": (EC.visibility_of_element_located, EC.visibility_of),
+    "clickable": (EC.element_to_be_clickable, EC.element_to_be_clickable),
+}
+
+def forget_stale_element(page, error, by_locator, *args, **kwargs):
+    # Before retrying a primitive: a stale element must be looked up again rather than served from the cache
+    if isinstance(error, StaleElementReferenceException):
+        page.elements.invalidate(check_locator(by_locator))
 
 class BasePage:
     """Base class for all pages, providing common WebDriver utilities."""
@@ -11,56 +31,211 @@ class BasePage:
         self.fluent_wait = fluent_wait
         self.explicit_wait = explicit_wait
         self.logger = logger 
+        self.elements = ElementCache()  # elements resolved by this page object, see find_element()
+
+    def __init_subclass__(cls, **kwargs):
+        # Every public page-object method is timed as a step (see utils/instrumentation.py)
+        super().__init_subclass__(**kwargs)
+        instrument_page_class(cls)
     
     def open_url(self):
         # Open the base URL
         base_url = ConfigReader.get_property("base_url")
-        self.logger.info(f"Opening URL: {base_url}")
+        self.logger.info("Opening URL: %s", base_url)
         self.driver.get(base_url)
+        self.elements.clear()
         self.wait_for_page_load()
     
+    def find_element(self, by_locator, condition="visible"):
+        # Resolve an element through the page's cache, waiting until it is visible (or clickable)
+        locator = check_locator(by_locator)
+        located, resolved = ELEMENT_CONDITIONS[condition]
+        element = self.elements.get(locator)
+        if element is not None:
+            try:
+                if resolved(element)(self.driver):
+                    return element
+            except StaleElementReferenceException:
+                self.elements.invalidate(locator)
+        element = self.explicit_wait.until(located(locator), str(by_locator))
+        self.elements.put(locator, element)
+        return element
+
+    @retryable("element", on_retry=forget_stale_element)
     def click(self, by_locator):
         # Click an element
-        element = self.explicit_wait.until(EC.element_to_be_clickable(by_locator))
-        self.logger.info(f"Clicking on element: {by_locator}")
+        element = self.find_element(by_locator, condition="clickable")
+        self.logger.info("Clicking on element: %s", by_locator)
         element.click()
     
+    @retryable("element", on_retry=forget_stale_element)
     def enter_text(self, by_locator, text):
         # Enter text into an input field
-        element = self.explicit_wait.until(EC.visibility_of_element_located(by_locator))
+        element = self.find_element(by_locator)
         element.clear()
         element.send_keys(text)
-        self.logger.info(f"Entered text '{text}' in field: {by_locator}")
+        self.logger.info("Entered text '%s' in field: %s", text, by_locator)
     
+    @retryable("element", on_retry=forget_stale_element)
     def get_text(self, by_locator):
         # Retrieve text from an element
-        element = self.explicit_wait.until(EC.visibility_of_element_located(by_locator))
-        text = element.text
-        self.logger.info(f"Retrieved text '{text}' from: {by_locator}")
+        text = self.find_element(by_locator).text
+        self.logger.info("Retrieved text '%s' from: %s", text, by_locator)
         return text
     
+    @retryable("element")
+    def read_texts(self, by_locator):
+        # Retrieve the text of every matching element in one script call
+        texts = self.driver.execute_script(READ_TEXTS, *check_locator(by_locator))
+        self.logger.info("Retrieved %d text(s) from: %s", len(texts), by_locator)
+        return texts
+
+    @retryable("element")
+    def fill_form(self, fields, real_keystrokes=None):
+        # Fill several input fields ({locator: value}) in one script call, firing input/change events
+        if real_keystrokes is None:
+            real_keystrokes = ConfigReader.get("form_fill_mode") == "keys"
+        if real_keystrokes:
+            for by_locator, text in fields.items():
+                self.enter_text(by_locator, text)
+            return
+
+        if not fields:
+            return
+        self.find_element(next(iter(fields)))
+        missing = self.driver.execute_script(
+            FILL_FORM, [[*check_locator(locator), str(text)] for locator, text in fields.items()])
+        if missing:
+            raise NoSuchElementException(f"Form fields not found: {', '.join(missing)}")
+        self.logger.info("Filled %d field(s): %s", len(fields), list(fields))
+
     def is_element_present(self, by_locator):
-        # Check if an element is present
-        try:
-            self.fluent_wait.until(EC.presence_of_element_located(by_locator))
-            self.logger.info(f"Element found: {by_locator}")
+        # Check if an element is present; gives up as soon as the page has settled without it
+        if self.fluent_wait.until_or_settled(EC.presence_of_element_located(check_locator(by_locator)),
+                                             str(by_locator)):
+            self.logger.info("Element found: %s", by_locator)
             return True
-        except(TimeoutException, NoSuchElementException):
-            self.logger.warning(f"Element NOT found: {by_locator}")
-            return False
+        self.logger.warning("Element NOT found: %s", by_locator)
+        return False
         
     def is_element_visible(self, by_locator):
-        # Check if an element is visible
-        try:
-            self.fluent_wait.until(EC.visibility_of_element_located(by_locator))
-            self.logger.info(f"Element visible: {by_locator}")
+        # Check if an element is visible; gives up as soon as the page has settled without it
+        if self.fluent_wait.until_or_settled(EC.visibility_of_element_located(check_locator(by_locator)),
+                                             str(by_locator)):
+            self.logger.info("Element visible: %s", by_locator)
             return True
-        except(TimeoutException, NoSuchElementException):
-            self.logger.warning(f"Element NOT visible: {by_locator}")
-            return False
+        self.logger.warning("Element NOT visible: %s", by_locator)
+        return False
     
     def wait_for_page_load(self):
-        # Check if page is completely loaded and fully interactive
-        self.explicit_wait.until(lambda driver: driver.execute_script("return document.readyState") == "complete")
+        # Check if page is completely loaded, including the XHR/fetch requests that fill in its content.
+        # No quiet window: the page is loaded as soon as nothing is in flight (see wait_for_network_idle)
+        self.wait_for_network_idle(idle_ms=0)
         self.logger.info("Page fully loaded")
 
+    def wait_for_network_idle(self, idle_ms=None, timeout=None):
+        # Waits until the document has loaded and no fetch/XHR request has been in flight for idle_ms
+        idle_ms = ConfigReader.get("network_idle_ms") if idle_ms is None else idle_ms
+
+        def idle(driver):
+            status = self._network_status()
+            if status is None:
+                return driver.execute_script("return document.readyState") == "complete"
+            return status["ready"] and status["inflight"] == 0 and status["idle_ms"] >= idle_ms
+
+        self.explicit_wait.until(idle, "network idle", timeout=timeout)
+
+    def wait_for_request(self, url_pattern, timeout=None, fallback=None):
+        # Waits until a fetch/XHR request whose URL matches url_pattern (a regex) has completed in this document.
+        # Without a monitor in the page (no CDP) the request may finish before one is injected, so the wait is
+        # then on `fallback`, the locator of an element the response renders; with no fallback it raises.
+        pattern = re.compile(url_pattern)
+        unmonitored = []
+
+        def completed(driver):
+            status = None if unmonitored else self._network_status()
+            if status is None:
+                if fallback is None:
+                    raise WebDriverException(f"No network monitor in this page to see request {url_pattern} "
+                                             "and no fallback element to wait for")
+                unmonitored.append(url_pattern)  # a monitor injected from now on would not have seen it either
+                return EC.presence_of_element_located(check_locator(fallback))(driver)
+            return any(pattern.search(url) for url in status["done"])
+
+        self.explicit_wait.until(completed, f"request {url_pattern}", timeout=timeout)
+        self.logger.info("Request completed: %s", url_pattern)
+
+    def _network_status(self):
+        status = self.driver.execute_script(NETWORK_STATUS)
+        if status is None and self.driver.execute_script("return document.readyState") == "complete":
+            # No CDP to pre-install the monitor: count from now on
+            inject_network_monitor(self.driver)
+        return status
+
+    def set_site_cookie(self, name, value):
+        # Sets a cookie for the base URL; Chrome can do this before the first navigation
+        base_url = ConfigReader.get_property("base_url")
+        try:
+            self.driver.execute_cdp_cmd("Network.setCookie", {"name": name, "value": value, "url": base_url, "path": "/"})
+        except (AttributeError, WebDriverException):
+            self._ensure_on_site(base_url)
+            self.driver.add_cookie({"name": name, "value": value, "path": "/"})
+        self.logger.info("Cookie '%s' set for %s", name, base_url)
+
+    def get_site_cookie(self, name):
+        # Reads a cookie of the base URL, or returns None if it is not set
+        base_url = ConfigReader.get_property("base_url")
+        try:
+            cookies = self.driver.execute_cdp_cmd("Network.getCookies", {"urls": [base_url]})["cookies"]
+            return next((c["value"] for c in cookies if c["name"] == name), None)
+        except (AttributeError, WebDriverException):
+            self._ensure_on_site(base_url)
+            cookie = self.driver.get_cookie(name)
+            return cookie["value"] if cookie else None
+
+    def capture_storage_state(self):
+        # Cookies and localStorage of the base URL, as stored in a session snapshot
+        base_url = ConfigReader.get_property("base_url")
+        try:
+            cookies = self.driver.execute_cdp_cmd("Network.getCookies", {"urls": [base_url]})["cookies"]
+        except (AttributeError, WebDriverException):
+            self._ensure_on_site(base_url)
+            cookies = self.driver.get_cookies()
+        self._ensure_on_site(base_url)
+        return cookies, self.driver.execute_script(READ_LOCAL_STORAGE)
+
+    def restore_storage_state(self, snapshot):
+        # Puts a snapshot's cookies and localStorage in place; with Chrome this happens before the first navigation.
+        # Returns the id of the new-document script to remove once the site has loaded, or None.
+        base_url = ConfigReader.get_property("base_url")
+        local_storage = snapshot.get("local_storage", {})
+        script_id = None
+        try:
+            for cookie in snapshot["cookies"]:
+                self.driver.execute_cdp_cmd("Network.setCookie", dict(cookie, url=base_url))
+            if local_storage:
+                parts = urlsplit(base_url)
+                source = RESTORE_LOCAL_STORAGE % {"origin": json.dumps(f"{parts.scheme}://{parts.netloc}"),
+                                                  "items": json.dumps(local_storage)}
+                script_id = self.driver.execute_cdp_cmd("Page.addScriptToEvaluateOnNewDocument",
+                                                        {"source": source})["identifier"]
+        except (AttributeError, WebDriverException):
+            self._ensure_on_site(base_url)
+            for cookie in snapshot["cookies"]:
+                self.driver.add_cookie(cookie)
+            self.driver.execute_script(WRITE_LOCAL_STORAGE, local_storage)
+        self.logger.info("Storage state restored for %s (%d cookies)", base_url, len(snapshot["cookies"]))
+        return script_id
+
+    def remove_storage_restore(self, script_id):
+        # Stops a restore script from re-applying on later documents of this (pooled) session
+        if script_id is not None:
+            self.driver.execute_cdp_cmd("Page.removeScriptToEvaluateOnNewDocument", {"identifier": script_id})
+
+    def _ensure_on_site(self, base_url):
+        # Cookies can only be read or written through WebDriver from a page on the site itself
+        if not self.driver.current_url.startswith(base_url):
+            self.driver.get(base_url)
+
+
+instrument_page_class(BasePage)
@@ -6,7 +6,12 @@ from selenium.common.exceptions import (
     WebDriverException,
     StaleElementReferenceException,
 )
+import uuid
 from pages.base_page import BasePage
+from utils.api_client import api_client, ApiError
+from utils.catalog import shared_catalog
+from utils.config_reader import ConfigReader
+from utils.retry_policy import retry_engine, retryable
 
 class CartPage(BasePage):
     def __init__(self, driver, fluent_wait, explicit_wait, logger):
@@ -16,7 +21,64 @@ class CartPage(BasePage):
         self.cart_button = (By.ID, "cartur")
         self.cart_items = (By.CSS_SELECTOR, "tbody tr td:nth-child(2)")
 
-    def verify_cart(self, max_retries=3, delay=2):
+    def seed_cart(self, products):
+        # Adds products (ids or exact names) to the browser's cart through the backend instead of the UI
+        try:
+            api = api_client(self.logger)
+            cookie, logged_in = self._cart_owner()
+            item_ids = []
+            for product in products:
+                product_id = product if isinstance(product, int) else shared_catalog(self.logger).by_name(product).product_id
+                item_ids.append(api.add_to_cart(product_id, cookie, logged_in))
+            self.logger.info("✅ Seeded cart with %s product(s): %s", len(item_ids), products)
+            return item_ids
+        except (ApiError, KeyError) as e:
+            self.logger.error("❌ Failed to seed cart: %s", e)
+            raise
+
+    def clear_cart(self):
+        # Empties the browser's cart through the backend
+        api = api_client(self.logger)
+        cookie, logged_in = self._cart_owner()
+        api.delete_cart(api.check(cookie) if logged_in else cookie)
+        self.logger.info("Cart cleared via API")
+
+    def cart_product_names(self):
+        # Names of the products in the browser's cart, read through the backend without leaving the current page
+        token = self.get_site_cookie("tokenp_")
+        owner = token or self.get_site_cookie("user")
+        if not owner:
+            return []
+        catalog = shared_catalog(self.logger)
+        names = []
+        for item in api_client(self.logger).view_cart(owner, bool(token)):
+            try:
+                names.append(catalog.by_id(item["prod_id"]).name)
+            except KeyError:
+                names.append(str(item["prod_id"]))
+        return names
+
+    def contains_product(self, category, product_name=None, first=False, last=False):
+        # True when the product ProductPage.add_product would pick is already in the cart
+        try:
+            entry = shared_catalog(self.logger).find(category, product_name, first, last)
+            return entry is not None and entry.name in self.cart_product_names()
+        except ApiError as e:
+            self.logger.warning("⚠️ Could not check the cart through the API: %s", e)
+            return False
+
+    def _cart_owner(self):
+        # Logged-in carts are keyed by the auth token, anonymous ones by the "user" cookie the site creates
+        token = self.get_site_cookie("tokenp_")
+        if token:
+            return token, True
+        user = self.get_site_cookie("user")
+        if not user:
+            user = str(uuid.uuid4())
+            self.set_site_cookie("user", user)
+        return user, False
+
+    def verify_cart(self, max_retries=3, delay=None):
         # Verifies that the expected products are present in the cart
         try: 
             self.logger.info("Verifying cart contents...")
@@ -26,7 +88,7 @@ class CartPage(BasePage):
             cart_products = self.get_cart_products_with_retry(max_retries, delay)
             
             # Debugging: log the retrieved cart products
-            self.logger.info(f"🛒 Cart contains: {cart_products}")
+            self.logger.info("🛒 Cart contains: %s", cart_products)
     
             assert any("Samsung" in p or "Nokia" in p for p in cart_products), "❌ Phone missing"
             assert any("MacBook" in p or "Sony" in p for p in cart_products), "❌ Laptop missing"
@@ -37,20 +99,22 @@ class CartPage(BasePage):
             self.logger.error("❌ Timeout while verifying cart contents!")
             raise
         except AssertionError as e:
-            self.logger.warning(f"⚠️ Assertion failed: {e}")
+            self.logger.warning("⚠️ Assertion failed: %s", e)
             raise
         except WebDriverException as e:
-            self.logger.error(f"❌ WebDriver error encountered: {e}")
+            self.logger.error("❌ WebDriver error encountered: %s", e)
             raise
         
+    @retryable()
     def navigate_to_cart(self):
         # Clicks on the cart button to navigate to the cart page
         try:
             self.logger.info("Navigating to cart...")
             self.click(self.cart_button)
             
-            # Refresh cart to ensure all items are loaded
-            self.driver.refresh()
+            # The rows are rendered from the viewcart response and one product lookup per row
+            self.wait_for_request(r"/viewcart", fallback=self.cart_items)
+            self.wait_for_network_idle()
             
             # Wait for cart items to be present first
             self.explicit_wait.until(EC.presence_of_element_located(self.cart_items),
@@ -64,24 +128,30 @@ class CartPage(BasePage):
             self.logger.error("❌ Cart button not found!")
             raise
                  
+    def open_cart(self, expect_items=True):
+        # Loads the cart page directly (a fresh page: no modal or popup left over from an earlier checkout)
+        cart_url = ConfigReader.get_property("base_url").rstrip("/") + "/cart.html"
+        self.logger.info("Opening cart: %s", cart_url)
+        self.driver.get(cart_url)
+        self.elements.clear()
+        if expect_items:
+            self.wait_for_request(r"/viewcart", fallback=self.cart_items)
+        # An empty cart renders nothing to wait for; network idle covers its viewcart request
+        self.wait_for_network_idle()
+        if expect_items:
+            self.explicit_wait.until(EC.presence_of_element_located(self.cart_items), "Cart page did not load in time")
+
     def get_cart_products(self):
         # Retrieves the list of product names from the cart
         try:
             self.logger.info("Retrieving cart products...")
             
-            # Ensure at least 2 cart items are present before proceeding
-            self.fluent_wait.until(lambda driver: len(driver.find_elements(*self.cart_items)) > 1, 
-                "Timeout waiting for multiple cart items")
-            cart_items = self.fluent_wait.until(EC.visibility_of_all_elements_located(self.cart_items))
+            # All cart requests have finished once the network is idle; no need to spin on the row count
+            self.wait_for_network_idle()
+            self.fluent_wait.until(EC.visibility_of_all_elements_located(self.cart_items))
             
-             # Re-locate elements if stale
-            products = []
-            for item in cart_items:
-                try:
-                    products.append(item.text)
-                except StaleElementReferenceException:
-                    self.logger.warning("⚠️ Stale element encountered, re-locating cart items...")
-                    return self.get_cart_products()  # Re-attempt retrieval
+            # Read every row in one script call; there are no element handles left to go stale
+            products = self.read_texts(self.cart_items)
 
             if not products:
                 self.logger.warning("⚠️ Cart appears to be empty!")
@@ -93,24 +163,14 @@ class CartPage(BasePage):
         except NoSuchElementException:
             self.logger.error("❌ Cart items not found!")
             raise
-        except StaleElementReferenceException:
-            self.logger.warning("⚠️ Cart items were stale. Retrying...")
-            return self.get_cart_products()  # Retry fetching products
 
 
-    def get_cart_products_with_retry(self, max_retries=3, delay=2):
-        # Retries getting cart products using a loop instead of recursion
-        for attempt in range(max_retries):
-            try:
-                return self.get_cart_products()
-            except StaleElementReferenceException:
-                self.logger.warning(f"⚠️ Stale elements detected. Retrying... ({attempt + 1}/{max_retries})")
-            except TimeoutException:
-                self.logger.warning(f"⚠️ Cart took too long to load. Retrying... ({attempt + 1}/{max_retries})")
-
-            # Wait dynamically for new elements to appear 
-            self.fluent_wait.until(EC.presence_of_all_elements_located(self.cart_items), 
-                            message="Waiting for cart items to appear")
-
-        self.logger.error("❌ Cart is empty after multiple retries!")
-        raise AssertionError("Cart is empty after retries!")
\ No newline at end of file
+    def get_cart_products_with_retry(self, max_retries=3, delay=None):
+        # Retries getting stale cart products, with max_retries attempts backing off from the policy's delay (or
+        # `delay` seconds). A timeout is not retried: the wait has already used up its share of the test's budget.
+        try:
+            return retry_engine.call("CartPage.get_cart_products", self.get_cart_products, attempts=max_retries,
+                                     delay=delay, logger=self.logger, exclude=(TimeoutException,))
+        except (StaleElementReferenceException, TimeoutException) as e:
+            self.logger.error("❌ Cart is empty after multiple retries!")
+            raise AssertionError("Cart is empty after retries!") from e
\ No newline at end of file
@@ -1,8 +1,10 @@
 from selenium.webdriver.common.by import By
 from selenium.common.exceptions import TimeoutException, NoSuchElementException, StaleElementReferenceException
-from utils.config_reader import ConfigReader
 from pages.base_page import BasePage
-from utils.constants import TEST_USER_ID
+from utils.account_pool import default_account
+from utils.api_client import api_client, ApiError
+from utils.config_reader import ConfigReader
+from utils.retry_policy import retryable
  
 class LoginPage(BasePage):   
     def __init__(self, driver, fluent_wait, explicit_wait, logger):
@@ -16,17 +18,65 @@ class LoginPage(BasePage):
         self.confirm_login = (By.XPATH, "//button[text()='Log in']")
         self.welcome_text = (By.ID, "nameofuser")
         
-    def login_test_user(self):
+    def login_test_user(self, account=None):
+        # Logs in the given account, or the default TEST_USER_ID account
+        account = account or default_account()
         try:
             self.logger.info("Logging in a test user...")
             self.open_login_modal()
-            self.enter_credentials()
+            self.enter_credentials(account)
             self.submit_login()
-            self.verify_welcome_text()
+            self.verify_welcome_text(account)
         except (TimeoutException, NoSuchElementException) as e:
-            self.logger.error(f"❌ Login failed: {e}")
+            self.logger.error("❌ Login failed: %s", e)
+            raise
+
+    def login_via_api(self, account=None):
+        # Logs in through the backend and hands the auth token to the browser, skipping the login modal
+        username, password = account or default_account()
+        try:
+            self.logger.info("Logging in %s via API...", username)
+            token = api_client(self.logger).login(username, password)
+            self.set_site_cookie("tokenp_", token)
+            self.logger.info("✅ Auth token injected into the browser.")
+            return token
+        except ApiError as e:
+            self.logger.error("❌ API login failed: %s", e)
             raise
 
+    def login_from_snapshot(self, snapshots, account=None):
+        # Restores a saved session when there is a valid one, otherwise logs in through the UI and saves a new one.
+        # Leaves the browser on the home page, logged in. Returns True when the snapshot was reused.
+        account = account or default_account()
+        base_url = ConfigReader.get_property("base_url")
+        snapshot = snapshots.load(account, base_url)
+        if snapshot is not None:
+            script_id = self.restore_storage_state(snapshot)
+            self.open_url()
+            self.remove_storage_restore(script_id)
+            if self.is_logged_in(account):
+                self.logger.info("✅ Session restored from snapshot for %s", account.username)
+                return True
+            self.logger.info("Session snapshot for %s is no longer valid, logging in again...", account.username)
+            snapshots.invalidate(account, base_url)
+        else:
+            self.open_url()
+
+        self.login_test_user(account)
+        cookies, local_storage = self.capture_storage_state()
+        snapshots.save(account, base_url, cookies, local_storage)
+        return False
+
+    def is_logged_in(self, account=None):
+        # Cheap check: the navbar greets the account once the site has accepted its session
+        username = (account or default_account()).username
+        # The greeting appears once the site's session check request has answered
+        self.wait_for_network_idle()
+        if not self.is_element_visible(self.welcome_text):
+            return False
+        return any(f"Welcome {username}" in text for text in self.read_texts(self.welcome_text))
+
+    @retryable()
     def open_login_modal(self):
         try:
             self.click(self.login_button)
@@ -35,11 +85,10 @@ class LoginPage(BasePage):
             self.logger.error("❌ Login modal did not appear in time!")
             raise
         
-    def enter_credentials(self):  
+    def enter_credentials(self, account=None):  
         try:     
-            username = ConfigReader.get_property("test_username") + str(TEST_USER_ID) 
-            password = ConfigReader.get_property("test_password") + str(TEST_USER_ID) 
-            self.logger.info(f"Entering credentials: {username} / [HIDDEN]") 
+            username, password = account or default_account()
+            self.logger.info("Entering credentials: %s / [HIDDEN]", username) 
         
             # Fills in the login form
             self.enter_text(self.username_field, username)
@@ -54,27 +103,28 @@ class LoginPage(BasePage):
             self.click(self.confirm_login)
             self.logger.info("✅ Login button clicked.")
         except (NoSuchElementException, TimeoutException, StaleElementReferenceException) as e:
-            self.logger.error(f"❌ Failed to click login button: {e}")
+            self.logger.error("❌ Failed to click login button: %s", e)
             raise
     
+    @retryable()
     def get_welcome_text(self):
         try:
             welcome_text = self.get_text(self.welcome_text)
-            self.logger.info(f"✅ Welcome text retrieved: {welcome_text}")
+            self.logger.info("✅ Welcome text retrieved: %s", welcome_text)
             return welcome_text
         except (NoSuchElementException, TimeoutException, StaleElementReferenceException) as e:
-            self.logger.error(f"❌ Failed to get welcome text: {e}")
+            self.logger.error("❌ Failed to get welcome text: %s", e)
             raise
     
-    def verify_welcome_text(self):
-        username = ConfigReader.get_property("test_username") + str(TEST_USER_ID) 
+    def verify_welcome_text(self, account=None):
+        username = (account or default_account()).username
         expected_text = f"Welcome {username}"
         try:
             welcome_text = self.get_welcome_text()
 
             # Assert that the welcome text contains "Welcome" and the test_username
             assert expected_text in welcome_text, f"Expected '{expected_text}' in text, but got: {welcome_text}"
-            self.logger.info(f"✅ Login successful! Welcome text verified: {welcome_text}")
+            self.logger.info("✅ Login successful! Welcome text verified: %s", welcome_text)
         except AssertionError as e:
-            self.logger.error(f"❌ Login verification failed: {e}")
+            self.logger.error("❌ Login verification failed: %s", e)
             raise
\ No newline at end of file
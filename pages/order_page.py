@@ -1,7 +1,13 @@
 from selenium.webdriver.common.by import By
 from selenium.webdriver.support import expected_conditions as EC
 from selenium.common.exceptions import TimeoutException, NoSuchElementException, WebDriverException
+from selenium.webdriver.common.alert import Alert
+from collections import namedtuple
 from pages.base_page import BasePage
+from utils.retry_policy import retryable
+
+# How the site answered a checkout: "confirmed" (with the purchase popup text) or "rejected" (with the alert text)
+CheckoutResult = namedtuple("CheckoutResult", ["status", "message"])
 
 class OrderPage(BasePage):
     def __init__(self, driver, fluent_wait, explicit_wait, logger):
@@ -41,12 +47,38 @@ class OrderPage(BasePage):
             self.logger.error("❌ Timeout while placing the order!")
             raise
         except NoSuchElementException as e:
-            self.logger.error(f"❌ Missing element error: {e}")
+            self.logger.error("❌ Missing element error: %s", e)
             raise
         except WebDriverException as e:
-            self.logger.error(f"❌ WebDriver encountered an issue: {e}")
+            self.logger.error("❌ WebDriver encountered an issue: %s", e)
+            raise
+
+    def checkout(self, order_data):
+        # Submits an order and reports whether the site confirmed it or rejected the form, without asserting either
+        try:
+            self.logger.info("Checking out...")
+            self.open_order_modal()
+            self.fill_order_details(order_data)
+            self.submit_order()
+
+            answer = self.explicit_wait.until(
+                EC.any_of(EC.alert_is_present(), EC.visibility_of_element_located(self.confirmation_text)),
+                "Neither a confirmation nor an alert appeared after Purchase")
+            if isinstance(answer, Alert):
+                message = answer.text
+                answer.accept()
+                self.logger.info("Order rejected: %s", message)
+                return CheckoutResult("rejected", message)
+
+            message = self.get_text(self.confirmation_text)
+            self.confirm_popup()
+            self.logger.info("✅ Order confirmed.")
+            return CheckoutResult("confirmed", message)
+        except TimeoutException:
+            self.logger.error("❌ Timeout during checkout!")
             raise
 
+    @retryable()
     def open_order_modal(self):
         # Opens the order modal
         try:
@@ -62,14 +94,16 @@ class OrderPage(BasePage):
         # Fills in the order details using provided test data
         try:
             self.logger.info("Filling in order details...")
+            form = {}
             for field, value in order_data.items():
                 if field in self.fields:
-                    self.enter_text(self.fields[field], value)
+                    form[self.fields[field]] = value
                 else:
-                    self.logger.warning(f"⚠️ Unexpected field '{field}' in test data.")
+                    self.logger.warning("⚠️ Unexpected field '%s' in test data.", field)
+            self.fill_form(form)
             self.logger.info("✅ Order details entered successfully.")
         except NoSuchElementException as e:
-            self.logger.error(f"❌ Unable to fill order details: {e}")
+            self.logger.error("❌ Unable to fill order details: %s", e)
             raise
 
     def submit_order(self):
@@ -2,6 +2,10 @@ from selenium.webdriver.common.by import By
 from selenium.webdriver.support import expected_conditions as EC
 from selenium.common.exceptions import TimeoutException, NoSuchElementException, ElementClickInterceptedException
 from pages.base_page import BasePage
+from utils.api_client import ApiError
+from utils.catalog import shared_catalog
+from utils.config_reader import ConfigReader
+from utils.retry_policy import retryable
 
 class ProductPage(BasePage):
     def __init__(self, driver, fluent_wait, explicit_wait, logger):
@@ -18,44 +22,82 @@ class ProductPage(BasePage):
         if not category:
             raise ValueError("❌ Category cannot be None!")
 
+        # Go straight to the product page when the catalog index knows it
+        entry = self.find_in_catalog(category, product_name, first, last)
+        if entry is not None:
+            self.open_product(entry)
+            self.add_to_cart_and_accept()
+            return
+
+        self.browse_to_product(category, product_name, first, last)
+        
+        # Add to cart
+        self.add_to_cart_and_accept()
+        self.navigate_to_home()
+
+    def find_in_catalog(self, category, product_name=None, first=False, last=False):
+        # Resolves the product through the session's catalog index; None falls back to browsing the category
+        if not ConfigReader.get("catalog_navigation"):
+            return None
+        try:
+            entry = shared_catalog(self.logger).find(category, product_name, first, last)
+        except ApiError as e:
+            self.logger.warning("⚠️ Catalog unavailable, browsing category instead: %s", e)
+            return None
+        if entry is None:
+            self.logger.warning("⚠️ Product not in catalog index for category: %s", category)
+        return entry
+
+    @retryable()
+    def open_product(self, entry):
+        # Loads a product page directly by its id
+        base_url = ConfigReader.get_property("base_url").rstrip("/")
+        self.logger.info("Opening product '%s' (id %s) from catalog index", entry.name, entry.product_id)
+        try:
+            self.driver.get(f"{base_url}/prod.html?idp_={entry.product_id}")
+            self.elements.clear()
+            self.fluent_wait.until(EC.presence_of_element_located(self.add_to_cart_button))
+        except TimeoutException:
+            self.logger.error("❌ Product page did not load for: %s", entry.name)
+            raise
+
+    @retryable()
+    def browse_to_product(self, category, product_name=None, first=False, last=False):
+        # Clicks through the category list to the product page
         try:
             # Click on category
             self.click((By.XPATH, self.category_link.format(category=category)))
-            self.logger.info(f"✅ Clicked on category: {category}")
+            self.logger.info("✅ Clicked on category: %s", category)
 
             # Wait for products to appear
             self.fluent_wait.until(EC.presence_of_element_located(self.products))
             self.logger.info("✅ Products loaded successfully!")
         except TimeoutException:
-            self.logger.error(f"❌ Products not found for category: {category}")
+            self.logger.error("❌ Products not found for category: %s", category)
             raise
     
         # Find product
         product_element = None
         try:
             if product_name:
-                self.logger.info(f"Searching for product: {product_name}")
+                self.logger.info("Searching for product: %s", product_name)
                 product_element = self.fluent_wait.until(EC.visibility_of_element_located((By.LINK_TEXT, product_name)))
             else:
                 product_list = self.driver.find_elements(*self.products)
                 if not product_list:
-                    self.logger.warning(f"⚠️ No products found in category: {category}")
+                    self.logger.warning("⚠️ No products found in category: %s", category)
                     raise NoSuchElementException(f"No products available in category: {category}")
                 
                 product_element = product_list[0] if first else product_list[-1] if last else None
 
             if product_element:
-                self.logger.info(f"Clicking on product: {product_element.text}")
+                self.logger.info("Clicking on product: %s", product_element.text)
                 product_element.click()
             else:
                 self.logger.warning("⚠️ No product selected")
         except (NoSuchElementException) as e:
-            self.logger.error(f"❌ Failed to add product - {str(e)}")
+            self.logger.error("❌ Failed to add product - %s", e)
             raise
-        
-        # Add to cart
-        self.add_to_cart_and_accept()
-        self.navigate_to_home()
        
     def add_to_cart_and_accept(self):
         # Adds the selected product to the cart and accepts the alert
@@ -72,6 +114,7 @@ class ProductPage(BasePage):
             self.logger.error("❌ Unable to click 'Add to Cart' button - Blocked by another element!")
             raise
         
+    @retryable()
     def navigate_to_home(self):
         # Navigates back to the homepage
         try:
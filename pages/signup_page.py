@@ -3,6 +3,7 @@ from selenium.webdriver.support import expected_conditions as EC
 from selenium.common.exceptions import TimeoutException, NoSuchElementException, UnexpectedAlertPresentException
 from utils.config_reader import ConfigReader
 from pages.base_page import BasePage
+from utils.retry_policy import retryable
 import uuid
 
 class SignupPage(BasePage):
@@ -16,17 +17,20 @@ class SignupPage(BasePage):
         self.password_field = (By.ID, "sign-password")
         self.confirm_signup = (By.XPATH, "//button[text()='Sign up']")       
         
-    def signup_new_user(self):
+    def signup_new_user(self, username=None, password=None):
+        # Signs up the given user, or a new random one; returns the credentials used
         try:
             self.logger.info("Signing up a new user...")
             self.open_signup_modal()
-            self.enter_credentials()
+            credentials = self.enter_credentials(username, password)
             self.submit_signup()
             self.handle_alert()
+            return credentials
         except (TimeoutException, NoSuchElementException) as e:
-            self.logger.error(f"❌ Signup failed: {e}")
+            self.logger.error("❌ Signup failed: %s", e)
             raise
 
+    @retryable()
     def open_signup_modal(self):
         try:
             self.click(self.signup_button)
@@ -35,15 +39,16 @@ class SignupPage(BasePage):
             self.logger.error("❌ Signup modal did not appear in time!")
             raise
         
-    def enter_credentials(self):
+    def enter_credentials(self, username=None, password=None):
         try:
-            new_username = ConfigReader.get_property("test_username") + str(uuid.uuid4().hex)  
-            new_password = ConfigReader.get_property("test_password") + str(uuid.uuid4().hex) 
-            self.logger.info(f"Entering credentials: {new_username} / [HIDDEN]") 
+            new_username = username or ConfigReader.get_property("test_username") + str(uuid.uuid4().hex)  
+            new_password = password or ConfigReader.get_property("test_password") + str(uuid.uuid4().hex) 
+            self.logger.info("Entering credentials: %s / [HIDDEN]", new_username) 
         
             # Fills in the signup form
             self.enter_text(self.username_field, new_username)
             self.enter_text(self.password_field, new_password)
+            return new_username, new_password
         except TimeoutException:
             self.logger.error("❌ Signup fields are not interactable!")
             raise
@@ -66,7 +71,7 @@ class SignupPage(BasePage):
             alert.accept()
             
             if "Sign up successful" not in alert_text:
-                self.logger.warning(f"⚠️ Unexpected alert message: {alert_text}")
+                self.logger.warning("⚠️ Unexpected alert message: %s", alert_text)
                 raise AssertionError(f"Unexpected alert message: {alert_text}")
             
             self.logger.info("✅ Signup test passed successfully!")          
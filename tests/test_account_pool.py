@@ -0,0 +1,53 @@
+import pytest
+from utils.account_pool import AccountPool, account_target
+from utils.config_reader import ConfigReader
+
+def test_workers_get_distinct_accounts(tmp_path):
+    pool = AccountPool(str(tmp_path / "accounts.json"), [235, 236])
+    first = pool.allocate("gw0")
+    second = pool.allocate("gw1")
+    assert first != second
+    assert pool.allocate("gw0") == first
+
+def test_account_is_created_when_pool_is_exhausted(tmp_path):
+    pool = AccountPool(str(tmp_path / "accounts.json"), [235])
+    pool.allocate("gw0")
+    created = []
+    account = pool.allocate("gw1", create=created.append)
+    assert created == [account]
+
+    # A created account is reused by the next run once released
+    pool.release(account)
+    assert pool.allocate("gw2") == account
+
+def test_exhausted_pool_without_creator_fails(tmp_path):
+    pool = AccountPool(str(tmp_path / "accounts.json"), [235])
+    pool.allocate("gw0")
+    with pytest.raises(RuntimeError):
+        pool.allocate("gw1")
+
+def test_created_accounts_are_kept_per_target(tmp_path):
+    state = str(tmp_path / "accounts.json")
+    live = AccountPool(state, [235], target="https://api.demoblaze.com")
+    live.allocate("gw0")
+    created = live.allocate("gw1", create=lambda account: None)
+
+    local = AccountPool(state, [235], target=account_target("http://127.0.0.1:50123"))
+    assert local.allocate("gw0").username.endswith("235")  # leases are per target too
+    with pytest.raises(RuntimeError):
+        local.allocate("gw1")  # the live site's account does not exist on a stand-in
+    assert live.created_accounts() == [created] and local.created_accounts() == []
+
+def test_stand_in_registers_accounts_created_on_earlier_stand_ins(tmp_path):
+    from local_site.server import encode_password, server_from_config
+
+    saved = dict(ConfigReader.config().overrides)
+    ConfigReader.update_overrides({"account_pool_state": str(tmp_path / "accounts.json")})
+    try:
+        pool = AccountPool.from_config(target=account_target("http://localhost:41000"))
+        pool.allocate("gw0")
+        account = pool.allocate("gw1", create=lambda account: None)
+        server = server_from_config()
+    finally:
+        ConfigReader.set_overrides(saved)
+    assert server.state.users[account.username] == encode_password(account.password)
@@ -0,0 +1,36 @@
+import pytest
+from local_site.server import server_from_config
+from utils.account_pool import default_account
+from utils.api_client import ApiError, DemoblazeApi
+
+@pytest.fixture
+def api():
+    server = server_from_config().start()
+    yield DemoblazeApi(server.url, timeout=5)
+    server.stop()
+
+def test_login_returns_a_token_for_the_account(api):
+    account = default_account()
+    token = api.login(account.username, account.password)
+    assert api.check(token) == account.username
+
+    with pytest.raises(ApiError, match="Wrong password"):
+        api.login(account.username, "not-the-password")
+
+def test_cart_round_trip_for_a_logged_in_user(api):
+    account = default_account()
+    token = api.login(account.username, account.password)
+    first = api.add_to_cart(1, token, logged_in=True)
+    api.add_to_cart(10, token, logged_in=True)
+
+    items = api.view_cart(token, logged_in=True)
+    assert [item["prod_id"] for item in items] == [1, 10]
+    assert items[0]["id"] == first
+
+    api.delete_cart(account.username)
+    assert api.view_cart(token, logged_in=True) == []
+
+def test_anonymous_carts_are_kept_per_cookie(api):
+    api.add_to_cart(3, "visitor-a", logged_in=False)
+    assert [item["prod_id"] for item in api.view_cart("visitor-a", logged_in=False)] == [3]
+    assert api.view_cart("visitor-b", logged_in=False) == []
@@ -0,0 +1,65 @@
+import logging
+import pytest
+from selenium.common.exceptions import NoSuchElementException, WebDriverException
+from selenium.webdriver.common.by import By
+from pages.base_page import BasePage
+from utils.dom_scripts import NETWORK_STATUS
+from utils.wait_engine import WaitEngine
+
+class FakeDriver:
+    # Answers the FILL_FORM script with the fields it could not find
+    def __init__(self, missing):
+        self.missing = missing
+        self.scripts = []
+
+    def execute_script(self, script, *args):
+        self.scripts.append(args)
+        return self.missing
+
+class FakeWait:
+    def until(self, condition, message=""):
+        return object()
+
+def page(driver):
+    wait = FakeWait()
+    return BasePage(driver, wait, wait, logging.getLogger("test_base_page"))
+
+def test_fill_form_reports_every_missing_field():
+    driver = FakeDriver(missing=["id=country", "id=city"])
+    fields = {(By.ID, "name"): "Bench User", (By.ID, "country"): "USA", (By.ID, "city"): "Austin"}
+    with pytest.raises(NoSuchElementException, match="Form fields not found: id=country, id=city"):
+        page(driver).fill_form(fields, real_keystrokes=False)
+    assert len(driver.scripts) == 1  # all fields in one script call
+
+def test_fill_form_fills_all_fields_in_one_script_call():
+    driver = FakeDriver(missing=[])
+    page(driver).fill_form({(By.ID, "name"): "Bench User", (By.ID, "card"): 4111}, real_keystrokes=False)
+    assert driver.scripts[0][0] == [["id", "name", "Bench User"], ["id", "card", "4111"]]
+
+class UnmonitoredDriver:
+    # A loaded page without the network monitor (no CDP); the cart rows appear after a few polls
+    def __init__(self):
+        self.polls = 0
+        self.finds = 0
+
+    def execute_script(self, script, *args):
+        if script == NETWORK_STATUS:
+            self.polls += 1
+            return None
+        return "complete" if "readyState" in script else None
+
+    def find_element(self, by, value):
+        self.finds += 1
+        if self.finds < 3:
+            raise NoSuchElementException(value)
+        return object()
+
+def test_wait_for_request_without_a_monitor_waits_for_the_fallback_element():
+    driver = UnmonitoredDriver()
+    wait = WaitEngine(driver, 2, min_poll=0.01, max_poll=0.01)
+    page = BasePage(driver, wait, wait, logging.getLogger("test_base_page"))
+    page.wait_for_request(r"/viewcart", fallback=(By.CSS_SELECTOR, "tbody tr"))
+    assert driver.polls == 1  # once the monitor was found missing, only the element counts
+
+    with pytest.raises(WebDriverException, match="No network monitor"):
+        page.wait_for_request(r"/viewcart")
@@ -0,0 +1,94 @@
+import random
+import time
+from utils.benchmark import compare, load_baseline, mann_whitney, record_baseline, run_benchmarks
+from utils.instrumentation import recorder
+
+
+class FakeDriver:
+    # Just enough of a WebDriver to count commands
+    def __init__(self):
+        self.sent = []
+
+    def execute(self, driver_command, params=None):
+        self.sent.append(driver_command)
+        return {"value": None}
+
+
+def test_flows_are_measured_without_their_setup_or_warm_up():
+    driver = FakeDriver()
+    calls = []
+
+    def setup():
+        driver.execute("get")  # not the flow's command
+
+    def run():
+        calls.append(1)
+        driver.execute("findElement")
+        driver.execute("clickElement")
+        time.sleep(0.02)
+        recorder.add_wait(0.01)
+
+    results = run_benchmarks(driver, {"click": (setup, run)}, iterations=3, warmup=2)
+    samples = results["click"]["samples"]
+    assert len(calls) == 5 and results["click"]["failures"] == 0
+    assert samples["commands"] == [2, 2, 2] and samples["wait"] == [0.01, 0.01, 0.01]
+    assert len(samples["wall"]) == 3 and min(samples["wall"]) >= 0.02
+
+
+def test_a_failing_setup_fails_its_iteration_only():
+    driver = FakeDriver()
+    setups = []
+
+    def setup():
+        setups.append(1)
+        if len(setups) == 2:
+            raise RuntimeError("home page did not load")
+
+    results = run_benchmarks(driver, {"click": (setup, lambda: driver.execute("clickElement"))}, iterations=3,
+                             warmup=0)
+    assert results["click"]["failures"] == 1
+    assert results["click"]["samples"]["commands"] == [1, 1]
+    assert not recorder.records
+
+
+def test_mann_whitney_separates_shifted_samples_from_noise():
+    rng = random.Random(7)
+    base = [1.0 + rng.gauss(0, 0.05) for _ in range(15)]
+    assert mann_whitney(base, [value + 0.3 for value in base]) < 0.001
+    assert mann_whitney(base, [1.0 + rng.gauss(0, 0.05) for _ in range(15)]) > 0.05
+    assert mann_whitney([5] * 10, [5] * 10) == 1.0
+
+
+def test_only_significant_changes_beyond_the_threshold_are_regressions():
+    rng = random.Random(3)
+    base = {"login": {"wall": [1.0 + rng.gauss(0, 0.02) for _ in range(15)], "commands": [40] * 15,
+                      "wait": [0.0] * 15}}
+    noisy = [0.7, 1.5, 0.8, 1.6]  # median 15% slower, but half of the runs were faster than any baseline run
+    cases = {
+        "slower": {"wall": [value * 1.3 for value in base["login"]["wall"]], "commands": [40] * 15, "wait": [0.0] * 15},
+        "faster": {"wall": [value * 0.7 for value in base["login"]["wall"]], "commands": [38] * 15, "wait": [0.0] * 15},
+        "noisy": {"wall": noisy, "commands": [40] * 4, "wait": [0.0] * 4},
+        "more commands": {"wall": base["login"]["wall"], "commands": [48] * 15, "wait": [0.5] * 15},
+    }
+    verdicts = {}
+    for name, samples in cases.items():
+        rows = compare(base, {"login": {"samples": samples, "failures": 0}}, threshold=0.1, alpha=0.05)
+        verdicts[name] = {row["metric"]: row["verdict"] for row in rows}
+
+    assert verdicts["slower"] == {"wall": "regression", "commands": "ok", "wait": "ok"}
+    assert verdicts["faster"] == {"wall": "improvement", "commands": "ok", "wait": "ok"}
+    assert verdicts["noisy"]["wall"] == "inconclusive"
+    assert verdicts["more commands"] == {"wall": "ok", "commands": "regression", "wait": "regression"}
+    rows = compare({}, {"signup": {"samples": cases["slower"], "failures": 1}}, threshold=0.1, alpha=0.05)
+    assert {row["verdict"] for row in rows} == {"failed"}
+
+
+def test_first_run_records_the_baseline_and_a_failing_run_does_not(tmp_path):
+    path = str(tmp_path / "baseline.json")
+    run = {"environment": {}, "flows": {"login": {"wall": [1.0]}}}
+    assert record_baseline(path, run, {"login": {"failures": 1}}) == 1
+    assert load_baseline(path) is None
+    assert record_baseline(path, run, {"login": {"failures": 0}}) == 0
+    update = {"environment": {}, "flows": {"checkout": {"wall": [2.0]}}}
+    assert record_baseline(path, update, {"checkout": {"failures": 0}}, load_baseline(path)) == 0
+    assert set(load_baseline(path)["flows"]) == {"login", "checkout"}  # flows the update skipped are kept
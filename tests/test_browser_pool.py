@@ -0,0 +1,62 @@
+import logging
+import threading
+from utils.browser_pool import BrowserPool
+
+logger = logging.getLogger(__name__)
+
+
+class WarmableDriver:
+    def __init__(self):
+        self.visited = []
+
+    def get(self, url):
+        self.visited.append(url)
+
+    def quit(self):
+        pass
+
+
+def test_prelaunched_session_is_warmed_and_handed_to_first_lease(monkeypatch):
+    monkeypatch.setattr("utils.browser_pool.reset_session", lambda driver: None)
+    started = threading.Event()
+    launched = []
+
+    def factory(log):
+        started.wait(5)  # a slow browser start
+        launched.append(WarmableDriver())
+        return launched[-1]
+
+    pool = BrowserPool(logger, size=1, factory=factory)
+    pool.prelaunch(1, "http://127.0.0.1:8000")
+    started.set()
+
+    # acquire() waits for the session being started in the background instead of launching a second one
+    driver = pool.acquire(timeout=5)
+    assert launched == [driver]
+    assert driver.visited == ["http://127.0.0.1:8000"]
+    assert pool.prelaunched == 1
+    pool.release(driver)
+    pool.close()
+
+def test_close_does_not_wait_for_a_browser_still_starting(monkeypatch):
+    monkeypatch.setattr("utils.browser_pool.reset_session", lambda driver: None)
+    started = threading.Event()
+    quit_calls = []
+
+    class SlowDriver(WarmableDriver):
+        def quit(self):
+            quit_calls.append(self)
+
+    def factory(log):
+        started.wait(5)
+        return SlowDriver()
+
+    pool = BrowserPool(logger, size=1, factory=factory)
+    thread = pool.prelaunch(1)
+    pool.close()  # returns while the launch is still in flight
+    assert thread.is_alive()
+    started.set()
+    thread.join(5)
+    # The session that arrived after close() is quit instead of being parked in the closed pool
+    assert len(quit_calls) == 1
+    assert not pool._idle
@@ -0,0 +1,120 @@
+import json
+import logging
+import os
+import signal
+import subprocess
+import time
+import pytest
+from utils.browser_pool import BrowserPool
+from utils.browser_watchdog import BrowserWatchdog, _proc_stat, process_pids
+
+logger = logging.getLogger(__name__)
+
+
+class FakeDriver:
+    # Just enough of a WebDriver for the pool: answers the probe (or hangs) and records quit()
+    def __init__(self, hang=False):
+        self.hang = hang
+        self.quit_called = False
+
+    def execute_script(self, script, *args):
+        if self.hang:
+            time.sleep(1)
+        return 1
+
+    def quit(self):
+        self.quit_called = True
+
+
+def test_hung_browser_is_recycled_without_quit(monkeypatch):
+    monkeypatch.setattr("utils.browser_pool.reset_session", lambda driver: None)
+    drivers = [FakeDriver(hang=True), FakeDriver()]
+    watchdog = BrowserWatchdog(logger, probe_timeout=0.1)
+    pool = BrowserPool(logger, factory=lambda log: drivers.pop(0), watchdog=watchdog)
+
+    hung = pool.acquire()
+    pool.release(hung, test_id="test_a")
+    assert [event.kind for event in watchdog.events] == ["liveness"]
+    assert not hung.quit_called
+
+    # The next lease gets a fresh session, which stays in the pool while healthy
+    healthy = pool.acquire()
+    assert healthy is not hung
+    pool.release(healthy, test_id="test_b")
+    assert pool.acquire() is healthy
+
+
+def test_recycle_after_leases_is_recorded(monkeypatch):
+    monkeypatch.setattr("utils.browser_pool.reset_session", lambda driver: None)
+    watchdog = BrowserWatchdog(logger, probe_timeout=0.1)
+    pool = BrowserPool(logger, recycle_after=2, factory=lambda log: FakeDriver(), watchdog=watchdog)
+
+    first = pool.acquire()
+    pool.release(first)
+    assert pool.acquire() is first
+    pool.release(first)
+    assert first.quit_called
+    assert watchdog.report()["events"][0]["kind"] == "leases"
+
+
+class LaunchedDriver:
+    # A "chromedriver" (sh) with a "Chrome" child (sleep), as a local session's service process
+    def __init__(self):
+        self.process = subprocess.Popen(["sh", "-c", "sleep 30 & wait"])
+        self.service = self
+
+    def children(self):
+        deadline = time.monotonic() + 5
+        while time.monotonic() < deadline:
+            pids = process_pids(self.process.pid)
+            if len(pids) > 1:
+                return pids[1:]
+            time.sleep(0.01)
+        raise AssertionError("the child process did not start")
+
+
+def gone(pid):
+    stat = _proc_stat(pid)
+    return stat is None or stat[0] == "Z"
+
+
+@pytest.mark.skipif(not os.path.isdir("/proc"), reason="finds child processes through /proc")
+def test_sweep_only_kills_processes_recorded_by_runs_that_exited(tmp_path):
+    pid_file = str(tmp_path / "browser_pids.json")
+    launched, unrelated = LaunchedDriver(), LaunchedDriver()
+    try:
+        browsers = launched.children()
+        BrowserWatchdog(logger, pid_file=pid_file).register(launched)
+
+        # Still recorded under a live owner (this process): left alone
+        BrowserWatchdog(logger, pid_file=pid_file).sweep_orphans()
+        assert not gone(launched.process.pid)
+
+        # Pretend the run that launched it has exited
+        finished = subprocess.Popen(["true"])
+        finished.wait()
+        with open(pid_file) as f:
+            entries = json.load(f)
+        entries[str(finished.pid)] = entries.pop(str(os.getpid()))
+        with open(pid_file, "w") as f:
+            json.dump(entries, f)
+
+        watchdog = BrowserWatchdog(logger, pid_file=pid_file)
+        watchdog.sweep_orphans()
+        assert launched.process.wait(timeout=5) != 0
+        deadline = time.monotonic() + 5
+        while not all(gone(pid) for pid in browsers) and time.monotonic() < deadline:
+            time.sleep(0.01)
+        assert all(gone(pid) for pid in browsers)  # the browser child too, not just the driver
+        assert watchdog.orphans_killed == 1 + len(browsers)
+        assert not gone(unrelated.process.pid)  # never recorded, never touched
+        with open(pid_file) as f:
+            assert json.load(f) == {}
+    finally:
+        for driver in (launched, unrelated):
+            for pid in process_pids(driver.process.pid):
+                try:
+                    os.kill(pid, signal.SIGKILL)
+                except OSError:
+                    pass
+            driver.process.wait()
@@ -0,0 +1,44 @@
+import pytest
+from utils.catalog import Catalog
+
+class FakeApi:
+    # The two endpoints Catalog.build calls, counting how often the catalog was built
+    def __init__(self, api_url="http://localhost:8000"):
+        self.api_url = api_url
+        self.builds = 0
+        self.products = [
+            {"id": "1", "cat": "phone", "title": "Samsung galaxy s6"},
+            {"id": "8", "cat": "notebook", "title": "Sony vaio i5"},
+            {"id": "2", "cat": "phone", "title": "Nokia lumia 1520"},
+            {"id": "10", "cat": "monitor", "title": "Apple monitor 24"},
+        ]
+
+    def entries(self):
+        self.builds += 1
+        return self.products
+
+    def by_category(self, code):
+        return [product for product in self.products if product["cat"] == code]
+
+def test_find_resolves_the_products_add_product_would_pick():
+    catalog = Catalog.build(FakeApi())
+    assert catalog.find("Phones", first=True).name == "Samsung galaxy s6"
+    assert catalog.find("Phones", last=True).name == "Nokia lumia 1520"
+    assert catalog.find("Monitors", product_name="Apple monitor 24").product_id == 10
+    assert catalog.find("Laptops", product_name="Apple monitor 24") is None  # wrong category
+    assert catalog.by_id("8").name == "Sony vaio i5"
+    with pytest.raises(KeyError, match="not in the catalog"):
+        catalog.by_name("Nexus 6")
+
+def test_index_is_cached_on_disk_per_api_and_ttl(tmp_path):
+    path = str(tmp_path / "catalog.json")
+    api = FakeApi()
+    first = Catalog.load(path, ttl=60, api=api)
+    assert Catalog.load(path, ttl=60, api=api).entries == first.entries
+    assert api.builds == 1
+
+    Catalog.load(path, ttl=0, api=api)  # expired
+    assert api.builds == 2
+    other = FakeApi("https://api.demoblaze.com")
+    Catalog.load(path, ttl=60, api=other)  # built from a different API
+    assert other.builds == 1
@@ -0,0 +1,55 @@
+import os
+import pytest
+from utils.config_reader import Config
+
+def write_config(tmp_path, body):
+    path = tmp_path / "config.properties"
+    path.write_text("[DEFAULT]\nbase_url = http://localhost\ntest_username = U\ntest_password = P\nmonitor_name = M\n" + body)
+    return str(path)
+
+def test_values_are_typed_and_defaulted(tmp_path):
+    config = Config(write_config(tmp_path, "explicit_wait = 2.5\n"), environ={})
+    assert config.explicit_wait == 2.5
+    assert config.pool_size == 1
+    assert config.get_raw("base_url") == "http://localhost"
+
+def test_overrides_win_over_environment_and_file(tmp_path):
+    path = write_config(tmp_path, "explicit_wait = 2\n")
+    config = Config(path, environ={"DEMOBLAZE_EXPLICIT_WAIT": "3"})
+    assert config.explicit_wait == 3
+    config.set_overrides({"explicit_wait": "4"})
+    assert config.explicit_wait == 4
+
+def test_invalid_value_is_rejected(tmp_path):
+    with pytest.raises(ValueError, match="pool_size"):
+        Config(write_config(tmp_path, "pool_size = 0\n"), environ={})
+
+def test_reload_only_when_file_changes(tmp_path):
+    path = write_config(tmp_path, "explicit_wait = 2\n")
+    config = Config(path, overrides={"pool_size": "2"}, environ={"DEMOBLAZE_EXPLICIT_WAIT": "3"})
+    assert not config.reload_if_changed()
+    with open(path, "a") as f:
+        f.write("polling_interval = 0.1\n")
+    os.utime(path, (0, 12345))
+    assert config.reload_if_changed()
+    assert config.polling_interval == 0.1
+    assert config.explicit_wait == 3 and config.pool_size == 2
+    assert not config.reload_if_changed()
+
+def test_missing_required_setting_is_reported_at_load(tmp_path):
+    path = tmp_path / "config.properties"
+    path.write_text("[DEFAULT]\nbase_url = http://localhost\ntest_username =\nmonitor_name = M\n")
+    with pytest.raises(ValueError, match="test_username, test_password"):
+        Config(str(path), environ={})
+    assert Config(str(path), environ={"DEMOBLAZE_TEST_USERNAME": "U", "DEMOBLAZE_TEST_PASSWORD": "P"}).test_username == "U"
+
+def test_launch_profiles_are_read_by_prefix(tmp_path):
+    from utils.launch_profiles import parse_profile
+
+    config = Config(write_config(tmp_path, "profile.lean = headless; window=800x600; page_load=eager; images=off\n"),
+                    environ={})
+    profile = parse_profile("lean", config.with_prefix("profile.")["lean"])
+    assert profile.headless and not profile.images and profile.animations
+    assert profile.window == (800, 600) and profile.page_load == "eager"
+    with pytest.raises(ValueError, match="page_load"):
+        parse_profile("bad", "page_load=lazy")
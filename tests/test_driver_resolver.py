@@ -0,0 +1,46 @@
+import os
+import pytest
+from utils.driver_resolver import DriverResolver
+
+
+def fake_binary(directory, content=b"#!/bin/sh\necho chromedriver\n"):
+    path = os.path.join(directory, "chromedriver-download")
+    with open(path, "wb") as f:
+        f.write(content)
+    return path
+
+
+def test_binaries_are_cached_by_content_and_indexed_by_chrome_major(tmp_path):
+    resolver = DriverResolver(str(tmp_path / "cache"))
+    cached = resolver.store(fake_binary(str(tmp_path)), "131")
+
+    assert resolver.lookup("131") == cached
+    assert resolver.lookup("130") is None
+    assert resolver.store(fake_binary(str(tmp_path)), "132") == cached  # same bytes, same blob
+    os.remove(cached)
+    assert resolver.lookup("131") is None  # an index entry without its blob is a miss
+
+
+def test_binaries_cached_without_a_chrome_version_are_found_again(tmp_path, monkeypatch):
+    monkeypatch.setattr("utils.driver_resolver.detect_chrome_version", lambda: None)
+    resolver = DriverResolver(str(tmp_path / "cache"))
+    cached = resolver.store(fake_binary(str(tmp_path)), "unknown")
+
+    assert resolver.resolve() == cached
+
+
+def test_the_configured_path_is_cached_for_the_next_run(tmp_path, monkeypatch):
+    monkeypatch.setattr("utils.driver_resolver.detect_chrome_version", lambda: "131.0.6778.85")
+    configured = fake_binary(str(tmp_path))
+    first = DriverResolver(str(tmp_path / "cache"), fallback_path=configured).resolve()
+    os.remove(configured)
+
+    assert DriverResolver(str(tmp_path / "cache")).resolve() == first
+
+
+def test_a_miss_never_downloads_unless_allowed(tmp_path, monkeypatch):
+    monkeypatch.setattr("utils.driver_resolver.detect_chrome_version", lambda: "131.0.6778.85")
+    resolver = DriverResolver(str(tmp_path / "cache"))
+    monkeypatch.setattr(resolver, "download", lambda major: pytest.fail("downloaded without opt-in"))
+    with pytest.raises(FileNotFoundError, match="No cached chromedriver for Chrome 131"):
+        resolver.resolve()
@@ -0,0 +1,66 @@
+import base64
+import gzip
+import json
+import os
+import time
+from selenium.common.exceptions import WebDriverException
+from utils.failure_artifacts import DOM_DIR, FailureArtifacts, load_stats
+
+PNG = b"\x89PNG\r\n\x1a\n" + b"\x00" * 64
+
+
+class FakeDriver:
+    # Just enough of a WebDriver to capture: a page, a screenshot and a console log (or no log endpoint)
+    def __init__(self, page_source, console=True):
+        self.page_source = page_source
+        self.current_url = "http://localhost/cart.html"
+        self.console = console
+
+    def get_screenshot_as_base64(self):
+        return base64.b64encode(PNG).decode()
+
+    def get_log(self, log_type):
+        if not self.console:
+            raise WebDriverException("unknown command: log")
+        return [{"level": "SEVERE", "message": "viewcart failed"}]
+
+
+def test_artifacts_are_written_in_the_background_and_identical_pages_stored_once(tmp_path):
+    artifacts = FailureArtifacts(str(tmp_path), max_bytes=10 ** 6)
+    page = "<html><body>" + "<tr><td>Samsung galaxy s6</td></tr>" * 200 + "</body></html>"
+    first, _ = artifacts.capture(FakeDriver(page), "tests/test_a.py::test_one")
+    second, _ = artifacts.capture(FakeDriver(page, console=False), "tests/test_a.py::test_two")
+    stats = artifacts.close()
+
+    with open(os.path.join(first, "screenshot.png"), "rb") as f:
+        assert f.read() == PNG
+    with gzip.open(os.path.join(first, "console.json.gz")) as f:
+        assert json.load(f)[0]["message"] == "viewcart failed"
+    with open(os.path.join(second, "manifest.json")) as f:
+        manifest = json.load(f)
+    assert manifest["missing"] == {"console": "WebDriverException"}
+    with gzip.open(os.path.join(second, manifest["page_source"])) as f:
+        assert f.read().decode() == page
+
+    assert len(os.listdir(tmp_path / DOM_DIR)) == 1
+    assert stats["captures"] == 2 and stats["dom_deduplicated"] == 1 and stats["errors"] == 0
+    assert stats["bytes_written"] < len(page)  # the page source compresses well
+
+
+def test_oldest_artifacts_are_evicted_past_the_size_limit(tmp_path):
+    artifacts = FailureArtifacts(str(tmp_path), max_bytes=2500, workers=1)
+    paths = []
+    for n in range(4):
+        # Random-looking pages do not compress, so each test takes about 1 KB
+        page = base64.b64encode(os.urandom(400)).decode()
+        paths.append(artifacts.capture(FakeDriver(page), f"test_{n}")[0])
+        time.sleep(0.01)
+    stats = artifacts.close()
+
+    assert [os.path.exists(path) for path in paths] == [False, False, True, True]
+    assert stats["evicted"] == 2
+    assert len(os.listdir(tmp_path / DOM_DIR)) == 2  # the evicted tests' page sources went with them
+
+    artifacts.write_stats(str(tmp_path / "artifact_stats.gw0.json"))
+    artifacts.write_stats(str(tmp_path / "artifact_stats.gw1.json"))
+    assert load_stats(str(tmp_path))["captures"] == 8
@@ -0,0 +1,34 @@
+import time
+from utils.instrumentation import StepRecorder, percentile
+
+def test_percentile_is_nearest_rank():
+    values = [5, 1, 4, 2, 3]
+    assert percentile(values, 50) == 3
+    assert percentile(values, 95) == 5
+    assert percentile(values, 0) == 1
+    assert percentile([7], 99) == 7
+
+def test_waits_are_split_from_acting_time_for_every_open_step():
+    recorder = StepRecorder()
+    recorder.test_id = "tests/test_a.py::test_one"
+    recorder.begin("CartPage", "verify_cart")
+    recorder.begin("BasePage", "find_element", ("id", "tbodyid"))
+    assert recorder.current_step().step == "find_element"
+    time.sleep(0.02)
+    recorder.add_wait(0.01)
+    recorder.end()
+    recorder.end("failed")
+
+    inner, outer = recorder.records
+    assert (inner.step, inner.locator, inner.outcome) == ("find_element", "('id', 'tbodyid')", "passed")
+    assert outer.outcome == "failed" and outer.wait == inner.wait == 0.01  # counted in both
+    assert abs(inner.act - (inner.duration - 0.01)) < 1e-9
+    assert recorder.current_step() is None
+
+def test_wait_is_capped_at_the_step_duration():
+    recorder = StepRecorder()
+    recorder.begin("BasePage", "click")
+    recorder.add_wait(60)
+    recorder.end()
+    record = recorder.records[0]
+    assert record.wait == record.duration and record.act == 0
@@ -0,0 +1,25 @@
+from local_site.server import DemoblazeServer
+from utils.config_reader import ConfigReader
+from utils.load_runner import Sample, run_load, summarize
+
+
+def test_summary_has_throughput_and_percentiles_per_step():
+    samples = [Sample("http", 0, "login", "login", 0.0, d / 100, True, None) for d in range(1, 101)]
+    samples.append(Sample("http", 0, "login", "login", 0.0, 9.0, False, "ApiError: Wrong password."))
+    (row,) = summarize(samples, duration=10)
+    assert row["count"] == 101 and row["errors"] == 1
+    assert row["throughput"] == 10.0
+    assert (row["p50"], row["p95"], row["p99"]) == (0.5, 0.95, 0.99)
+
+
+def test_http_users_run_the_order_flow_against_the_stand_in():
+    with DemoblazeServer() as server:
+        saved = dict(ConfigReader.config().overrides)  # e.g. the session's own stand-in
+        ConfigReader.update_overrides({"base_url": server.url, "api_url": server.url})
+        try:
+            report = run_load("order", browser_users=0, http_users=2, ramp_up=0.2, duration=0.5, think_time=0)
+        finally:
+            ConfigReader.set_overrides(saved)
+    steps = {row["step"]: row for row in report["steps"]}
+    assert set(steps) == {"open home", "add phone", "add laptop", "add monitor", "verify cart", "place order"}
+    assert all(row["errors"] == 0 and row["count"] > 0 for row in steps.values())
@@ -0,0 +1,31 @@
+import json
+import urllib.request
+from local_site.server import DemoblazeServer, Latency, encode_password
+
+def post(server, path, body):
+    request = urllib.request.Request(f"{server.url}/{path}", json.dumps(body).encode(),
+                                     {"Content-Type": "application/json"})
+    with urllib.request.urlopen(request) as response:
+        return json.loads(response.read())
+
+def test_login_and_cart_round_trip():
+    with DemoblazeServer(accounts=[("TestUser235", encode_password("TestPass235"))]) as server:
+        reply = post(server, "login", {"username": "TestUser235", "password": encode_password("TestPass235")})
+        token = reply.split("Auth_token: ")[1]
+
+        post(server, "addtocart", {"id": "item-1", "cookie": token, "prod_id": 10, "flag": True})
+        assert post(server, "viewcart", {"cookie": token, "flag": True})["Items"][0]["prod_id"] == 10
+
+        post(server, "deletecart", {"cookie": "TestUser235"})
+        assert post(server, "viewcart", {"cookie": token, "flag": True})["Items"] == []
+
+def test_categories_match_live_catalog_order():
+    with DemoblazeServer() as server:
+        laptops = post(server, "bycat", {"cat": "notebook"})["Items"]
+        assert laptops[-1]["title"] == "MacBook Pro"
+
+def test_jitter_is_reproducible_for_a_seed():
+    first = Latency("jitter", latency_ms=20, jitter_ms=10, seed=7)
+    second = Latency("jitter", latency_ms=20, jitter_ms=10, seed=7)
+    assert [first.delay() for _ in range(5)] == [second.delay() for _ in range(5)]
+    assert Latency("zero").delay() == 0
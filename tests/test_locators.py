@@ -0,0 +1,36 @@
+import pytest
+from selenium.webdriver.common.by import By
+from utils.locators import CacheStats, ElementCache, InvalidLocator, check_locator
+
+
+@pytest.mark.parametrize("locator", [
+    (By.XPATH, "//button[text()='Log in']"),
+    (By.XPATH, "//a[text()='Add to cart']"),
+    (By.CLASS_NAME, "sweet-alert"),
+    (By.ID, "login2"),
+])
+def test_valid_locators_are_used_as_written(locator):
+    assert check_locator(locator) == locator
+
+
+@pytest.mark.parametrize("locator", [
+    ("css", ".card"),
+    (By.ID, " "),
+    (By.CLASS_NAME, "btn btn-success"),
+    (By.XPATH, "//button[text()='Log in'"),
+])
+def test_invalid_locators_are_rejected(locator):
+    with pytest.raises(InvalidLocator):
+        check_locator(locator)
+
+
+def test_element_cache_counts_hits_misses_and_stale_entries(monkeypatch):
+    monkeypatch.setattr("utils.locators.cache_stats", CacheStats())  # keep the run's own counters out of it
+    cache = ElementCache()
+    locator = (By.ID, "cartur")
+    assert cache.get(locator) is None
+    cache.put(locator, "element")
+    assert cache.get(locator) == "element"
+    cache.invalidate(locator)
+    assert cache.get(locator) is None
+    assert (cache.hits, cache.misses, cache.stale) == (1, 2, 1)
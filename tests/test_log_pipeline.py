@@ -0,0 +1,54 @@
+import json
+import logging
+from utils.instrumentation import recorder
+from utils.log_pipeline import merge_worker_logs, start_logging, stop_logging, worker_log_path
+
+
+def read_lines(path):
+    with open(path, encoding="utf-8") as f:
+        return [json.loads(line) for line in f]
+
+
+def test_records_are_written_as_json_lines_with_test_and_step(tmp_path):
+    logger = start_logging("test_log_pipeline.context", "gw1", str(tmp_path))
+    assert start_logging("test_log_pipeline.context", "gw1", str(tmp_path)) is logger
+    assert len(logger.handlers) == 1
+    recorder.test_id = "tests/test_x.py::test_y"
+    recorder.begin("CartPage", "navigate_to_cart")
+    try:
+        logger.info("Clicking on element: %s", ("id", "cartur"))
+        logger.debug("not logged: %s", "below the logger level")
+    finally:
+        recorder.end()
+        recorder.records.pop()  # not a real step of this run
+        recorder.test_id = None
+    stop_logging("test_log_pipeline.context")
+
+    [entry] = read_lines(worker_log_path(str(tmp_path), "gw1"))
+    assert entry["message"] == "Clicking on element: ('id', 'cartur')"
+    assert (entry["worker"], entry["test"], entry["step"]) == ("gw1", "tests/test_x.py::test_y",
+                                                               "CartPage.navigate_to_cart")
+    assert entry["step_elapsed"] >= 0
+    logging.getLogger("test_log_pipeline.context").handlers.clear()
+
+
+def test_worker_files_are_merged_in_time_order(tmp_path):
+    for worker, times in (("gw0", [1.0, 3.0]), ("gw1", [2.0, 4.0])):
+        with open(worker_log_path(str(tmp_path), worker), "w", encoding="utf-8") as f:
+            for ts in times:
+                f.write(json.dumps({"ts": ts, "worker": worker}) + "\n")
+
+    merged = merge_worker_logs(str(tmp_path))
+    assert [(e["ts"], e["worker"]) for e in read_lines(merged)] == [(1.0, "gw0"), (2.0, "gw1"), (3.0, "gw0"),
+                                                                   (4.0, "gw1")]
+
+
+def test_mutable_arguments_are_formatted_when_logged(tmp_path):
+    logger = start_logging("test_log_pipeline.snapshot", "gw2", str(tmp_path))
+    cart = ["Samsung galaxy s6"]
+    logger.info("Cart contains: %s", cart)
+    cart.append("MacBook Pro")  # before the listener thread has written the record
+    stop_logging("test_log_pipeline.snapshot")
+
+    [entry] = read_lines(worker_log_path(str(tmp_path), "gw2"))
+    assert entry["message"] == "Cart contains: ['Samsung galaxy s6']"
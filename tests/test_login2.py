@@ -7,4 +7,19 @@ def test_login(driver, fluent_wait, explicit_wait, logger):
     login_page.open_url()
         
     # Signing up a new user
-    login_page.login_test_user() 
\ No newline at end of file
+    login_page.login_test_user() 
+
+def test_login_with_worker_account(driver, fluent_wait, explicit_wait, logger, test_account):
+    login_page = LoginPage(driver, fluent_wait, explicit_wait, logger)
+
+    # Navigating to homepage
+    login_page.open_url()
+
+    # Logging in the account allocated to this xdist worker
+    login_page.login_test_user(test_account)
+
+def test_logged_in_session_is_restored(logged_in_driver, fluent_wait, explicit_wait, logger, test_account):
+    login_page = LoginPage(logged_in_driver, fluent_wait, explicit_wait, logger)
+
+    # The fixture leaves the browser on the home page, logged in from the snapshot (or a fresh login)
+    login_page.verify_welcome_text(test_account)
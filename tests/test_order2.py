@@ -3,28 +3,39 @@ from pages.cart_page import CartPage
 from pages.order_page import OrderPage
 from utils.config_reader import ConfigReader
 
-def test_order(driver, fluent_wait, explicit_wait, logger, test_order_data):
+def test_order(driver, fluent_wait, explicit_wait, logger, test_order_data, step_runner):
     product_page = ProductPage(driver, fluent_wait, explicit_wait, logger)
     cart_page = CartPage(driver, fluent_wait, explicit_wait, logger)
     order_page = OrderPage(driver, fluent_wait, explicit_wait, logger)
+    product_name = ConfigReader.get_property("monitor_name")
     
-    # Navigating to homepage
-    product_page.open_url()
-    
-    # Add products with exception handling
-    try:
+    # Each product step can tell from the cart whether it already happened, so a retry resumes after it
+    (step_runner
+        # Navigating to homepage
+        .step("open home", product_page.open_url)
         # Add first Phone product
-        product_page.add_product(category="Phones", first=True)
-        
+        .step("add first phone", lambda: product_page.add_product(category="Phones", first=True),
+              verify=lambda: cart_page.contains_product("Phones", first=True))
         # Add last Laptop product
-        product_page.add_product(category="Laptops", last=True)
-        
+        .step("add last laptop", lambda: product_page.add_product(category="Laptops", last=True),
+              verify=lambda: cart_page.contains_product("Laptops", last=True))
         # Add specific Monitor product
-        product_name = ConfigReader.get_property("monitor_name")
-        product_page.add_product(category="Monitors", product_name=product_name)
-    except Exception as e:
-        logger.error(f"❌ Error adding products: {e}")
-        
+        .step("add monitor", lambda: product_page.add_product(category="Monitors", product_name=product_name),
+              verify=lambda: cart_page.contains_product("Monitors", product_name=product_name))
+        # Verifying cart
+        .step("verify cart", cart_page.verify_cart)
+        # Placing order
+        .step("place order", lambda: order_page.place_order(test_order_data)))
+    step_runner.run()
+
+def test_order_with_seeded_cart(driver, fluent_wait, explicit_wait, logger, test_order_data):
+    cart_page = CartPage(driver, fluent_wait, explicit_wait, logger)
+    order_page = OrderPage(driver, fluent_wait, explicit_wait, logger)
+    
+    # Filling the cart through the API; product browsing is covered by test_order
+    cart_page.seed_cart(["Samsung galaxy s6", "MacBook Pro", ConfigReader.get_property("monitor_name")])
+    cart_page.open_url()
+    
     # Verifying cart
     cart_page.verify_cart()
 
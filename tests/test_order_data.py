@@ -0,0 +1,61 @@
+import json
+import pytest
+from utils.order_data import RecordSource, parse_record
+
+CSV = """id,name,country,city,card,month,year,cart,expect
+paid,John Doe,USA,New York,4111,12,2025,Samsung galaxy s6|MacBook Pro,confirmed
+other-cart,Ana,,,5555,,,Nokia lumia 1520,confirmed
+no-name,,USA,New York,4111,12,2025,MacBook Pro|Samsung galaxy s6,rejected
+"""
+
+
+def numbered_orders():
+    for n in range(1000):
+        yield {"id": f"order-{n}", "name": f"Buyer {n}", "card": str(n), "cart": ["Sony vaio i5"]}
+
+
+def test_csv_records_are_grouped_by_cart_and_read_back_by_offset(tmp_path):
+    path = tmp_path / "orders.csv"
+    path.write_text(CSV, encoding="utf-8")
+    source = RecordSource(str(path))
+
+    refs = source.refs()
+    # Same cart (in any order) next to each other, the rejected record (which keeps the cart) first
+    assert [ref.id for ref in refs] == ["no-name", "paid", "other-cart"]
+    record = source.record(refs[1])
+    assert record.order == {"name": "John Doe", "country": "USA", "city": "New York", "card": "4111",
+                            "month": "12", "year": "2025"}
+    assert record.cart == ("Samsung galaxy s6", "MacBook Pro")
+
+
+def test_jsonl_records_take_lists_and_default_missing_fields(tmp_path):
+    path = tmp_path / "orders.jsonl"
+    path.write_text("\n".join(json.dumps(row) for row in [
+        {"id": "a", "name": "Ann", "card": 4111, "cart": ["Nokia lumia 1520"]},
+        {"name": "Bob", "card": "5555", "expect": "rejected"},
+    ]) + "\n", encoding="utf-8")
+    source = RecordSource(str(path))
+
+    records = [source.record(ref) for ref in source.refs()]
+    assert [(r.id, r.cart, r.expect) for r in records] == [("record1", (), "rejected"),
+                                                            ("a", ("Nokia lumia 1520",), "confirmed")]
+    assert records[1].order["card"] == "4111" and records[1].order["city"] == ""
+
+
+def test_generator_records_resume_from_the_last_one_loaded():
+    source = RecordSource(f"{__name__}:numbered_orders")
+    assert len(source.refs()) == 1000
+
+    assert source.load(5)["id"] == "order-5"
+    iterator = source._cursor[1]
+    assert source.load(6)["id"] == "order-6"
+    assert source._cursor[1] is iterator  # resumed, not replayed
+    assert source.load(2)["id"] == "order-2"
+    assert source._cursor[1] is not iterator  # going back restarts the generator
+
+
+def test_invalid_records_and_sources_are_rejected():
+    with pytest.raises(ValueError, match="expect"):
+        parse_record({"expect": "maybe"}, 3)
+    with pytest.raises(ValueError, match="neither"):
+        RecordSource("orders.xlsx")
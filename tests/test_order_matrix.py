@@ -0,0 +1,12 @@
+# One test per record of order_dataset (see pytest_generate_tests in conftest.py). Records sharing a cart run
+# back to back in one browser, so only the first of them pays for the cart setup.
+
+def test_checkout_record(order_checkout):
+    record, order_page = order_checkout
+
+    result = order_page.checkout(record.order)
+
+    assert result.status == record.expect, f"Record '{record.id}' was {result.status}: {result.message}"
+    if result.status == "confirmed":
+        assert "Thank you for your purchase!" in result.message
+        assert record.order["card"] in result.message
@@ -0,0 +1,82 @@
+import logging
+import pytest
+from selenium.common.exceptions import StaleElementReferenceException, TimeoutException
+from utils.retry_policy import RetryEngine, parse_policy
+
+logger = logging.getLogger("test_retry_policy")
+
+
+def new_engine(budget=None):
+    policies = {
+        "staleelementreferenceexception": parse_policy("stale", "attempts=3; delay=0.1; max_delay=0.3; jitter=0"),
+        "timeoutexception": parse_policy("timeout", "attempts=2; delay=1; jitter=0; level=flow"),
+    }
+    sleeps = []
+    engine = RetryEngine(policies, budget=budget, sleep=sleeps.append)
+    return engine, sleeps
+
+
+def failing(errors, result="done"):
+    # A step that raises the given exceptions one call at a time, then returns result
+    errors = list(errors)
+
+    def step():
+        if errors:
+            raise errors.pop(0)
+        return result
+    return step
+
+
+def test_policy_lines_are_parsed_and_validated():
+    policy = parse_policy("TimeoutException", "attempts=2; delay=0.5; max_delay=2; level=flow")
+    assert (policy.attempts, policy.delay, policy.max_delay, policy.level) == (2, 0.5, 2.0, "flow")
+    with pytest.raises(ValueError, match="Unknown option"):
+        parse_policy("TimeoutException", "tries=2")
+    with pytest.raises(ValueError, match="level"):
+        parse_policy("TimeoutException", "level=page")
+
+
+def test_step_recovers_with_capped_exponential_backoff():
+    engine, sleeps = new_engine()
+    step = failing([StaleElementReferenceException(), StaleElementReferenceException()])
+    assert engine.call("Page.read", step, level="element", logger=logger) == "done"
+    assert sleeps == [0.1, 0.2]
+    assert engine.stats == {"Page.read": {"retries": 2, "recovered": 1, "gave_up": 0}}
+
+
+def test_policies_only_apply_at_their_level():
+    engine, sleeps = new_engine()
+    with pytest.raises(TimeoutException):
+        engine.call("Page.click", failing([TimeoutException()]), level="element")
+    assert engine.call("Page.open", failing([TimeoutException()]), level="flow") == "done"
+    assert sleeps == [1]
+
+
+def test_nested_steps_do_not_multiply_attempts():
+    engine, _ = new_engine()
+    calls = []
+
+    def inner():
+        calls.append("inner")
+        raise StaleElementReferenceException()
+
+    with pytest.raises(StaleElementReferenceException):
+        engine.call("Page.flow", lambda: engine.call("Page.click", inner, level="element"), level="flow")
+    assert len(calls) == 3
+    assert engine.stats == {"Page.click": {"retries": 2, "recovered": 0, "gave_up": 1}}
+
+
+def test_retry_budget_stops_retrying():
+    engine, sleeps = new_engine(budget=0.15)
+    with pytest.raises(StaleElementReferenceException):
+        engine.call("Page.read", failing([StaleElementReferenceException()] * 3))
+    assert sleeps == [0.1]
+
+
+def test_excluded_exceptions_are_not_retried_by_a_call():
+    engine, sleeps = new_engine()
+    with pytest.raises(TimeoutException):
+        engine.call("Cart.read", failing([TimeoutException()]), exclude=(TimeoutException,))
+    step = failing([StaleElementReferenceException()])
+    assert engine.call("Cart.read", step, exclude=(TimeoutException,)) == "done"
+    assert sleeps == [0.1]  # the policy's delay
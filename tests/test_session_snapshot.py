@@ -0,0 +1,29 @@
+from utils.account_pool import Account
+from utils.session_snapshot import SessionSnapshots
+
+ACCOUNT = Account("user235", "pass235")
+BASE_URL = "https://www.demoblaze.com/"
+
+
+def test_snapshot_round_trip(tmp_path):
+    snapshots = SessionSnapshots(str(tmp_path), ttl=60)
+    snapshots.save(ACCOUNT, BASE_URL, [{"name": "tokenp_", "value": "abc", "domain": "x", "expires": -1}], {"k": "v"})
+
+    snapshot = snapshots.load(ACCOUNT, BASE_URL)
+    assert snapshot["cookies"] == [{"name": "tokenp_", "value": "abc"}]
+    assert snapshot["local_storage"] == {"k": "v"}
+
+    # Keyed by account and base URL
+    assert snapshots.load(Account("user236", "pass236"), BASE_URL) is None
+    assert snapshots.load(ACCOUNT, "http://127.0.0.1:8000") is None
+
+
+def test_expired_or_invalidated_snapshot_is_not_returned(tmp_path):
+    snapshots = SessionSnapshots(str(tmp_path), ttl=0)
+    snapshots.save(ACCOUNT, BASE_URL, [], {})
+    assert snapshots.load(ACCOUNT, BASE_URL) is None
+
+    snapshots = SessionSnapshots(str(tmp_path), ttl=60)
+    snapshots.save(ACCOUNT, BASE_URL, [], {})
+    snapshots.invalidate(ACCOUNT, BASE_URL)
+    assert snapshots.load(ACCOUNT, BASE_URL) is None
@@ -0,0 +1,60 @@
+import pytest
+from utils.sharding import (assign_shards, load_durations, load_shared_durations, parse_shard, partition_digest,
+                            plan_shards, record_durations, update_shared_durations)
+
+
+def test_shard_option_is_parsed_and_validated():
+    assert parse_shard("2/3") == (2, 3)
+    for value in ("0/3", "4/3", "2", "a/b"):
+        with pytest.raises(ValueError):
+            parse_shard(value)
+
+
+def test_shards_are_balanced_by_duration_not_by_count():
+    durations = {"slow": 60.0, "a": 10.0, "b": 10.0, "c": 10.0, "d": 10.0, "e": 10.0, "f": 10.0}
+    shards, totals = assign_shards(sorted(durations), durations, 2)
+    assert sorted(shards, key=len) == [["slow"], ["a", "b", "c", "d", "e", "f"]]
+    assert totals == [60.0, 60.0]
+
+
+def test_every_test_lands_in_exactly_one_shard_and_the_split_is_stable():
+    node_ids = [f"tests/test_x.py::test_{n}" for n in range(10)]
+    durations = {node_ids[0]: 5.0, node_ids[1]: 1.0}  # the rest default to the mean of the known ones
+    shards, _ = assign_shards(node_ids, durations, 3)
+    assert sorted(sum(shards, [])) == sorted(node_ids)
+    assert assign_shards(list(reversed(node_ids)), durations, 3)[0] == shards
+
+
+def test_recorded_durations_are_blended_and_merged_across_shards(tmp_path):
+    directory = str(tmp_path)
+    record_durations(directory, (1, 2), {"a": 4.0})
+    record_durations(directory, (1, 2), {"a": 2.0})
+    record_durations(directory, (2, 2), {"b": 7.0})
+    assert load_durations(directory) == {"a": 3.0, "b": 7.0}
+
+
+def test_without_shared_history_tests_are_split_by_a_stable_hash():
+    node_ids = [f"tests/test_x.py::test_{n}" for n in range(20)]
+    shards, _, method = plan_shards(node_ids, {}, 3)
+    assert method == "hash"
+    assert sorted(sum(shards, [])) == sorted(node_ids)
+    # A test's shard does not depend on what else was collected
+    fewer, _, _ = plan_shards(node_ids[:10], {}, 3)
+    assert all(set(part) <= set(whole) for part, whole in zip(fewer, shards))
+
+
+def test_split_uses_the_committed_durations_and_its_digest_covers_them(tmp_path):
+    local = str(tmp_path / "durations")
+    shared = str(tmp_path / "durations.json")
+    record_durations(local, None, {"a": 4.004, "b": 1.0})
+    assert load_shared_durations(shared) == {}
+    update_shared_durations(shared, local)
+    durations = load_shared_durations(shared)
+    assert durations == {"a": 4.0, "b": 1.0}
+
+    shards, totals, method = plan_shards(["a", "b", "c"], durations, 2)
+    assert method == "durations" and shards == [["a"], ["c", "b"]]  # c counts as the mean, 2.5s
+    digest = partition_digest(["c", "b", "a"], durations, 2)
+    assert digest == partition_digest(["a", "b", "c"], dict(durations), 2)
+    assert digest != partition_digest(["a", "b", "c"], {"a": 4.0, "b": 1.5}, 2)
+    assert digest != partition_digest(["a", "b", "c"], durations, 3)
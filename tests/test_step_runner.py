@@ -0,0 +1,43 @@
+import logging
+import pytest
+from utils.step_runner import StepRunner
+
+logger = logging.getLogger(__name__)
+
+
+def test_retry_resumes_at_first_step_that_no_longer_holds():
+    calls = []
+    cart = set()
+    flaky = {"failures": 1}
+
+    def add(item):
+        calls.append(item)
+        cart.add(item)
+
+    def checkout():
+        calls.append("checkout")
+        if flaky["failures"]:
+            flaky["failures"] -= 1
+            raise AssertionError("sweet-alert did not appear")
+
+    runner = StepRunner(logger, retries=1)
+    runner.step("open", lambda: calls.append("open"))
+    runner.step("add phone", lambda: add("phone"), verify=lambda: "phone" in cart)
+    runner.step("add laptop", lambda: add("laptop"), verify=lambda: "laptop" in cart)
+    runner.step("checkout", checkout)
+    runner.run()
+
+    # Steps without a check run again; satisfied ones are skipped
+    assert calls == ["open", "phone", "laptop", "checkout", "open", "checkout"]
+    assert [name for name, _ in runner.skipped] == ["add phone", "add laptop"]
+    assert runner.attempts == 2
+
+
+def test_step_that_no_longer_holds_runs_again_and_retries_are_capped():
+    cart = set()
+    runner = StepRunner(logger, retries=1)
+    runner.step("add phone", lambda: cart.add("phone"), verify=lambda: "phone" in cart)
+    runner.step("lose cart and fail", lambda: (cart.clear(), 1 / 0))
+    with pytest.raises(ZeroDivisionError):
+        runner.run()
+    assert runner.skipped == [] and runner.attempts == 2
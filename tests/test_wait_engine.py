@@ -0,0 +1,57 @@
+import time
+import pytest
+from selenium.common.exceptions import NoSuchElementException, TimeoutException
+from utils.wait_engine import WaitBudget, WaitEngine
+
+class FakeDriver:
+    # Reports how long the DOM has been quiet (None = the page has no DOM observer yet)
+    def __init__(self, quiet_ms=0):
+        self.quiet_ms = quiet_ms
+
+    def execute_script(self, script, *args):
+        return self.quiet_ms
+
+def engine(driver, timeout=5, budget=None, settle_ms=300):
+    return WaitEngine(driver, timeout, min_poll=0.01, max_poll=0.02, budget=budget, settle_ms=settle_ms)
+
+def never(driver):
+    return False
+
+def test_until_returns_the_condition_value_and_ignores_missing_elements():
+    calls = []
+
+    def appears_on_third_poll(driver):
+        calls.append(1)
+        if len(calls) < 3:
+            raise NoSuchElementException("not yet")
+        return "element"
+
+    assert engine(FakeDriver()).until(appears_on_third_poll) == "element"
+
+def test_timeout_argument_overrides_the_engine_timeout():
+    start = time.perf_counter()
+    with pytest.raises(TimeoutException):
+        engine(FakeDriver(), timeout=30).until(never, "cart row", timeout=0.05)
+    assert time.perf_counter() - start < 1
+
+def test_an_exhausted_budget_ends_every_later_wait_and_says_so():
+    budget = WaitBudget(0.1)
+    wait = engine(FakeDriver(), timeout=30, budget=budget)
+    with pytest.raises(TimeoutException):
+        wait.until(never, "first")
+    assert budget.remaining() == 0
+
+    start = time.perf_counter()
+    with pytest.raises(TimeoutException, match="wait budget of 0.1s for this test is exhausted"):
+        wait.until(never, "second")
+    assert time.perf_counter() - start < 0.05
+
+def test_until_or_settled_gives_up_once_the_dom_is_quiet():
+    start = time.perf_counter()
+    assert engine(FakeDriver(quiet_ms=500), timeout=30).until_or_settled(never) is False
+    assert time.perf_counter() - start < 1
+
+    # A page that is still changing (or has no observer yet) waits out the timeout instead
+    start = time.perf_counter()
+    assert engine(FakeDriver(quiet_ms=None), timeout=0.1).until_or_settled(never) is False
+    assert time.perf_counter() - start >= 0.1
@@ -0,0 +1,173 @@
+import json
+import os
+import uuid
+from collections import namedtuple
+from urllib.parse import urlsplit
+from utils.config_reader import ConfigReader
+from utils.constants import TEST_USER_ID
+from utils.file_lock import FileLock
+
+Account = namedtuple("Account", ["username", "password"])
+
+LOCAL_HOSTS = ("127.0.0.1", "localhost", "::1")
+LOCAL_TARGET = "local"
+
+
+def get_worker_id():
+    # pytest-xdist names its workers gw0, gw1, ...; a plain run is the "master"
+    return os.environ.get("PYTEST_XDIST_WORKER", "master")
+
+
+def default_account():
+    # The shared account the login tests used before per-worker allocation
+    return Account(
+        ConfigReader.get("test_username") + str(TEST_USER_ID),
+        ConfigReader.get("test_password") + str(TEST_USER_ID),
+    )
+
+
+def new_account_credentials():
+    # Unique credentials generated the same way SignupPage does
+    return Account(
+        ConfigReader.get("test_username") + uuid.uuid4().hex,
+        ConfigReader.get("test_password") + uuid.uuid4().hex,
+    )
+
+
+def account_target(api_url):
+    # Accounts live in the backend they were signed up on. Every local stand-in counts as one target: they run on
+    # random ports and start with the accounts created against earlier ones (see server_from_config).
+    if urlsplit(api_url).hostname in LOCAL_HOSTS:
+        return LOCAL_TARGET
+    return api_url.rstrip("/")
+
+
+def _pid_alive(pid):
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except OSError:
+        return True  # exists but belongs to someone else
+    return True
+
+
+class AccountPool:
+    """Gives every pytest worker an account of its own so they never share a server-side cart.
+
+    The state file keeps created accounts and leases per target backend, so an account signed up on the live site
+    is never handed to a run against the local stand-in, or the other way round.
+    """
+
+    def __init__(self, state_path, account_ids, logger=None, target=None):
+        self.state_path = state_path
+        self.lock = FileLock(state_path + ".lock")
+        self.account_ids = account_ids
+        self.logger = logger
+        self._target = target
+
+    @property
+    def target(self):
+        # Resolved late: the local_server fixture points api_url at the stand-in after the pool is built
+        return self._target or account_target(ConfigReader.get("api_url"))
+
+    def allocate(self, worker_id, create=None):
+        # Leases a free account to the worker; when none is free, signs up a new one through `create`
+        with self.lock:
+            state = self._read_state()
+            for username, lease in state["leases"].items():
+                if lease["worker"] == worker_id and lease["pid"] == os.getpid():
+                    return self._account(state, username)
+
+            for account in self._known_accounts(state):
+                if account.username not in state["leases"]:
+                    self._lease(state, account.username, worker_id)
+                    self._write_state(state)
+                    self._log("Worker %s allocated account %s", worker_id, account.username)
+                    return account
+
+            if create is None:
+                raise RuntimeError(f"No free test account for worker {worker_id} and on-demand creation is disabled")
+
+            # Reserve the new name before releasing the lock; signing up is slow
+            account = new_account_credentials()
+            self._lease(state, account.username, worker_id)
+            self._write_state(state)
+
+        self._log("Worker %s creating account %s...", worker_id, account.username)
+        try:
+            create(account)
+        except Exception:
+            self.release(account)
+            raise
+
+        with self.lock:
+            state = self._read_state()
+            state["created"].append(account._asdict())
+            self._write_state(state)
+        return account
+
+    def release(self, account):
+        with self.lock:
+            state = self._read_state()
+            if state["leases"].pop(account.username, None) is not None:
+                self._write_state(state)
+
+    def created_accounts(self):
+        # Accounts signed up against this pool's target by earlier runs
+        with self.lock:
+            return [Account(**created) for created in self._read_state()["created"]]
+
+    def _known_accounts(self, state):
+        accounts = [
+            Account(ConfigReader.get("test_username") + str(i), ConfigReader.get("test_password") + str(i))
+            for i in self.account_ids
+        ]
+        accounts += [Account(**created) for created in state["created"]]
+        return accounts
+
+    def _account(self, state, username):
+        for account in self._known_accounts(state):
+            if account.username == username:
+                return account
+        raise KeyError(f"Unknown account {username}")
+
+    def _lease(self, state, username, worker_id):
+        state["leases"][username] = {"worker": worker_id, "pid": os.getpid()}
+
+    def _read_state(self):
+        # This target's section of the state file; _write_state puts it back next to the other targets'
+        try:
+            with open(self.state_path) as f:
+                targets = json.load(f).get("targets", {})
+        except (OSError, ValueError, AttributeError):
+            targets = {}
+        state = targets.get(self.target, {})
+        state.setdefault("created", [])
+        state.setdefault("leases", {})
+
+        # Leases held by processes that have exited are free again
+        state["leases"] = {
+            username: lease for username, lease in state["leases"].items() if _pid_alive(lease["pid"])
+        }
+        return state
+
+    def _write_state(self, state):
+        try:
+            with open(self.state_path) as f:
+                targets = json.load(f).get("targets", {})
+        except (OSError, ValueError, AttributeError):
+            targets = {}
+        targets[self.target] = state
+        tmp_path = self.state_path + f".{os.getpid()}.tmp"
+        with open(tmp_path, "w") as f:
+            json.dump({"targets": targets}, f, indent=2)
+        os.replace(tmp_path, self.state_path)
+
+    def _log(self, msg, *args):
+        if self.logger:
+            self.logger.info(msg, *args)
+
+    @classmethod
+    def from_config(cls, logger=None, target=None):
+        return cls(ConfigReader.get_path("account_pool_state"), ConfigReader.get("account_pool_ids"), logger, target)
@@ -0,0 +1,102 @@
+import base64
+import threading
+import uuid
+import requests
+from requests.adapters import HTTPAdapter
+from utils.config_reader import ConfigReader
+
+
+class ApiError(RuntimeError):
+    # Raised when the storefront backend answers with an errorMessage or a bad status
+    pass
+
+
+class DemoblazeApi:
+    """Client for the storefront backend, used to seed state (accounts, logins, carts) without the UI."""
+
+    def __init__(self, api_url, pool_size=8, timeout=10, logger=None):
+        self.api_url = api_url.rstrip("/")
+        self.timeout = timeout
+        self.logger = logger
+
+        # One keep-alive connection pool shared by every call
+        self.session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=1, pool_maxsize=pool_size)
+        self.session.mount("http://", adapter)
+        self.session.mount("https://", adapter)
+
+    def signup(self, username, password):
+        self._post("signup", {"username": username, "password": self._encode(password)})
+
+    def login(self, username, password):
+        # Returns the auth token the site stores in its "tokenp_" cookie
+        reply = self._post("login", {"username": username, "password": self._encode(password)})
+        if not isinstance(reply, str) or not reply.startswith("Auth_token: "):
+            raise ApiError(f"Unexpected login reply: {reply!r}")
+        return reply[len("Auth_token: "):]
+
+    def check(self, token):
+        # Returns the username a token belongs to
+        return self._post("check", {"token": token})["Item"]["username"]
+
+    def add_to_cart(self, product_id, cookie, logged_in):
+        # `cookie` is the auth token when logged in, otherwise the anonymous "user" cookie
+        item_id = str(uuid.uuid4())
+        self._post("addtocart", {"id": item_id, "cookie": cookie, "prod_id": int(product_id), "flag": logged_in})
+        return item_id
+
+    def view_cart(self, cookie, logged_in):
+        return self._post("viewcart", {"cookie": cookie, "flag": logged_in}).get("Items", [])
+
+    def delete_cart(self, owner):
+        # `owner` is the username when logged in, otherwise the anonymous "user" cookie
+        self._post("deletecart", {"cookie": owner})
+
+    def view(self, product_id):
+        return self._post("view", {"id": str(product_id)})
+
+    def by_category(self, category):
+        # Products of one category ("phone", "notebook", "monitor") in the order the category page lists them
+        return self._post("bycat", {"cat": category}).get("Items", [])
+
+    def entries(self):
+        # All products, following the endpoint's pagination
+        reply = self._post("entries", {})
+        products = list(reply.get("Items", []))
+        while reply.get("LastEvaluatedKey"):
+            reply = self._post("pagination", {"id": reply["LastEvaluatedKey"]["id"]})
+            products += reply.get("Items", [])
+        return products
+
+    def _post(self, path, payload):
+        try:
+            response = self.session.post(f"{self.api_url}/{path}", json=payload, timeout=self.timeout)
+            response.raise_for_status()
+        except requests.RequestException as e:
+            raise ApiError(f"POST /{path} failed: {e}") from e
+
+        reply = response.json() if response.content else ""
+        if isinstance(reply, dict) and reply.get("errorMessage"):
+            raise ApiError(f"POST /{path}: {reply['errorMessage']}")
+        if self.logger:
+            self.logger.debug("API /%s -> %s", path, response.status_code)
+        return reply
+
+    @staticmethod
+    def _encode(password):
+        # The site's scripts send passwords base64-encoded
+        return base64.b64encode(password.encode()).decode()
+
+
+_clients = {}
+_clients_lock = threading.Lock()
+
+
+def api_client(logger=None):
+    # Shared client for the configured api_url, so every caller reuses the same connection pool
+    api_url = ConfigReader.get("api_url")
+    with _clients_lock:
+        if api_url not in _clients:
+            _clients[api_url] = DemoblazeApi(api_url, pool_size=ConfigReader.get("api_pool_size"),
+                                             timeout=ConfigReader.get("api_timeout"), logger=logger)
+        return _clients[api_url]
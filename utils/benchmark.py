@@ -0,0 +1,301 @@
+import argparse
+import json
+import logging
+import math
+import os
+import platform
+import sys
+import time
+import selenium
+from utils.config_reader import ConfigReader
+from utils.instrumentation import percentile, recorder
+from utils.retry_policy import retry_engine
+
+# Page-object flows, in the order they are run
+FLOWS = ("signup", "login", "add_product[first]", "add_product[last]", "add_product[named]", "verify_cart",
+         "place_order")
+
+# Measured for every iteration of a flow: wall seconds, WebDriver commands sent, seconds spent in waits
+METRICS = ("wall", "commands", "wait")
+
+# Differences below these are never reported, however significant (a few ms of wall time, one command)
+MIN_DELTA = {"wall": 0.01, "commands": 1, "wait": 0.01}
+
+
+class CommandCounter:
+    # Counts the commands a driver sends: every find, click, script, navigation and CDP call goes through execute()
+    def __init__(self, driver):
+        self.count = 0
+        execute = driver.execute
+
+        def counting_execute(driver_command, params=None):
+            self.count += 1
+            return execute(driver_command, params)
+
+        driver.execute = counting_execute
+
+
+def benchmark_flows(driver, logger):
+    # {flow: (setup, run)}. setup puts a fresh session in the flow's starting state and is not timed; run is.
+    from pages.cart_page import CartPage
+    from pages.login_page import LoginPage
+    from pages.order_page import OrderPage
+    from pages.product_page import ProductPage
+    from pages.signup_page import SignupPage
+    from utils.account_pool import default_account
+    from utils.browser_pool import reset_session
+    from utils.wait_engine import wait_engine_from_config
+
+    wait = wait_engine_from_config(driver, logger=logger)
+    signup_page = SignupPage(driver, wait, wait, logger)
+    login_page = LoginPage(driver, wait, wait, logger)
+    product_page = ProductPage(driver, wait, wait, logger)
+    cart_page = CartPage(driver, wait, wait, logger)
+    order_page = OrderPage(driver, wait, wait, logger)
+    monitor = ConfigReader.get_property("monitor_name")
+    cart = ["Samsung galaxy s6", "MacBook Pro", monitor]
+    order_data = {"name": "Bench User", "country": "USA", "city": "New York", "card": "4111 1111 1111 1111",
+                  "month": "12", "year": "2025"}
+
+    def home():
+        reset_session(driver)
+        product_page.open_url()
+
+    def filled_cart():
+        home()
+        cart_page.seed_cart(cart)
+
+    def cart_page_open():
+        filled_cart()
+        cart_page.open_cart()
+
+    flows = {
+        "signup": (home, signup_page.signup_new_user),
+        "login": (home, lambda: login_page.login_test_user(default_account())),
+        "add_product[first]": (home, lambda: product_page.add_product(category="Phones", first=True)),
+        "add_product[last]": (home, lambda: product_page.add_product(category="Laptops", last=True)),
+        "add_product[named]": (home, lambda: product_page.add_product(category="Monitors", product_name=monitor)),
+        "verify_cart": (filled_cart, cart_page.verify_cart),
+        "place_order": (cart_page_open, lambda: order_page.place_order(order_data)),
+    }
+    assert tuple(flows) == FLOWS
+    return flows
+
+
+def run_benchmarks(driver, flows, iterations, warmup=1, logger=None):
+    # {flow: {"samples": {metric: [value per iteration]}, "failures": n}}; warm-up iterations are not kept
+    counter = CommandCounter(driver)
+    results = {}
+    for name, (setup, run) in flows.items():
+        samples = {metric: [] for metric in METRICS}
+        failures = 0
+        for iteration in range(warmup + iterations):
+            retry_engine.begin(ConfigReader.get("test_retry_budget"))
+            outcome = "failed"
+            try:
+                setup()  # a setup that fails fails the iteration, rather than the whole benchmark
+                commands = counter.count
+                recorder.begin("Benchmark", name)
+                start = time.perf_counter()
+                try:
+                    run()
+                    outcome = "passed"
+                finally:
+                    wall = time.perf_counter() - start
+                    recorder.end(outcome)
+                    wait = recorder.records[-1].wait
+                    recorder.records.clear()
+            except Exception as e:
+                failures += 1
+                if logger:
+                    logger.error("❌ %s failed in iteration %s: %s", name, iteration + 1, e)
+            if iteration >= warmup and outcome == "passed":
+                samples["wall"].append(round(wall, 4))
+                samples["commands"].append(counter.count - commands)
+                samples["wait"].append(round(wait, 4))
+        results[name] = {"samples": samples, "failures": failures}
+        if logger and samples["wall"]:
+            logger.info("%s: median %.3fs, %s command(s) over %s iteration(s)", name, median(samples["wall"]),
+                        median(samples["commands"]), len(samples["wall"]))
+    return results
+
+
+def median(values):
+    ordered = sorted(values)
+    middle = len(ordered) // 2
+    return ordered[middle] if len(ordered) % 2 else (ordered[middle - 1] + ordered[middle]) / 2
+
+
+def spread(values):
+    # Relative noise of a sample: median absolute deviation over the median
+    center = median(values)
+    return median([abs(value - center) for value in values]) / center if center else 0.0
+
+
+def mann_whitney(baseline, current):
+    # One-sided p-value of the hypothesis that `current` tends to be larger than `baseline`
+    # (Mann-Whitney U, normal approximation with tie and continuity corrections; no distribution assumed)
+    n1, n2 = len(baseline), len(current)
+    values = sorted([(value, 0) for value in baseline] + [(value, 1) for value in current])
+    ranks, ties, i = [0.0] * len(values), 0, 0
+    while i < len(values):
+        j = i
+        while j + 1 < len(values) and values[j + 1][0] == values[i][0]:
+            j += 1
+        for k in range(i, j + 1):
+            ranks[k] = (i + j) / 2 + 1
+        ties += (j - i + 1) ** 3 - (j - i + 1)
+        i = j + 1
+    n = n1 + n2
+    u = sum(rank for rank, (_, group) in zip(ranks, values) if group == 1) - n2 * (n2 + 1) / 2
+    variance = n1 * n2 / 12 * ((n + 1) - ties / (n * (n - 1)))
+    if variance <= 0:
+        return 1.0  # every value is the same
+    z = (u - n1 * n2 / 2 - 0.5) / math.sqrt(variance)
+    return 0.5 * math.erfc(z / math.sqrt(2))
+
+
+def compare(baseline, results, threshold, alpha):
+    # One row per flow and metric. A metric regresses when its median is more than `threshold` (a fraction) worse
+    # than the baseline's AND the samples differ significantly at `alpha`; a big change that is not significant is
+    # "inconclusive" (noise, or too few iterations), and flows with failed iterations are "failed".
+    rows = []
+    for flow, result in results.items():
+        for metric in METRICS:
+            current = result["samples"][metric]
+            base = baseline.get(flow, {}).get(metric, [])
+            row = {"flow": flow, "metric": metric, "n": len(current), "n_baseline": len(base)}
+            if current:
+                row.update({"median": median(current), "p95": percentile(current, 95), "spread": spread(current)})
+            if result["failures"]:
+                rows.append(dict(row, verdict="failed", failures=result["failures"]))
+                continue
+            if not base or not current:
+                rows.append(dict(row, verdict="new" if current else "no samples"))
+                continue
+
+            base_median, delta = median(base), row["median"] - median(base)
+            change = delta / base_median if base_median else None  # e.g. a flow that never waited before
+            p_slower, p_faster = mann_whitney(base, current), mann_whitney(current, base)
+            row.update({"baseline_median": base_median, "baseline_spread": spread(base), "change": change,
+                        "p_value": p_slower if delta >= 0 else p_faster})
+            if abs(delta) < MIN_DELTA[metric] or (change is not None and abs(change) <= threshold):
+                row["verdict"] = "ok"
+            elif row["p_value"] >= alpha:
+                row["verdict"] = "inconclusive"
+            else:
+                row["verdict"] = "regression" if delta > 0 else "improvement"
+            rows.append(row)
+    return rows
+
+
+def environment():
+    # What the numbers depend on; baselines only compare well on the same machine and profile
+    from utils.launch_profiles import active_profile, describe
+
+    return {"python": platform.python_version(), "selenium": selenium.__version__, "platform": platform.platform(),
+            "cpus": os.cpu_count(), "launch_profile": describe(active_profile()),
+            "latency_mode": ConfigReader.get("local_server_latency_mode")}
+
+
+def load_baseline(path):
+    try:
+        with open(path) as f:
+            return json.load(f)
+    except FileNotFoundError:
+        return None
+
+
+def record_baseline(path, run, results, baseline=None):
+    # Stores the run as the baseline, keeping the flows it skipped; a run with failed iterations is not recorded
+    failed = [flow for flow, result in results.items() if result["failures"]]
+    if failed:
+        print(f"❌ Not updating the baseline: {', '.join(failed)} had failed iterations")
+        return 1
+    run = dict(run, flows=dict((baseline or {"flows": {}})["flows"], **run["flows"]))
+    write_json(path, run)
+    print(f"Baseline written to {path}")
+    return 0
+
+
+def write_json(path, data):
+    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+    with open(path, "w") as f:
+        json.dump(data, f, indent=2)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark the page-object flows against the local stand-in.")
+    parser.add_argument("--flows", help="comma-separated flows to run (default: all)")
+    parser.add_argument("--iterations", type=int, default=ConfigReader.get("benchmark_iterations"))
+    parser.add_argument("--warmup", type=int, default=ConfigReader.get("benchmark_warmup"),
+                        help="untimed iterations before the measured ones")
+    parser.add_argument("--threshold", type=float, default=ConfigReader.get("benchmark_threshold"),
+                        help="relative slowdown of a median that counts as a regression (0.1 = 10%%)")
+    parser.add_argument("--alpha", type=float, default=ConfigReader.get("benchmark_alpha"),
+                        help="significance level a regression must reach")
+    parser.add_argument("--baseline", default=ConfigReader.get_path("benchmark_baseline"))
+    parser.add_argument("--update-baseline", action="store_true", help="store this run as the new baseline")
+    parser.add_argument("--output", default=ConfigReader.get_path("benchmark_report"), help="JSON report path")
+    args = parser.parse_args(argv)
+    selected = args.flows.split(",") if args.flows else list(FLOWS)
+    unknown = set(selected) - set(FLOWS)
+    if unknown:
+        parser.error(f"unknown flow(s): {', '.join(sorted(unknown))} (known: {', '.join(FLOWS)})")
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s - %(levelname)s - %(message)s")
+    logger = logging.getLogger("benchmark")
+    page_logger = logging.getLogger("benchmark.pages")  # the page objects' step-by-step logs, kept quiet
+    page_logger.setLevel(logging.WARNING)
+
+    from local_site.server import server_from_config
+    from utils.browser_pool import create_driver
+
+    server = server_from_config().start()
+    ConfigReader.update_overrides({"base_url": server.url, "api_url": server.url})
+    driver = None
+    try:
+        driver = create_driver(logger)
+        flows = benchmark_flows(driver, page_logger)
+        flows = {name: flows[name] for name in selected}
+        results = run_benchmarks(driver, flows, args.iterations, args.warmup, logger)
+    finally:
+        if driver is not None:
+            driver.quit()
+        server.stop()
+
+    run = {"created": time.time(), "environment": environment(), "iterations": args.iterations,
+           "flows": {flow: result["samples"] for flow, result in results.items()}}
+    baseline = load_baseline(args.baseline)
+    if baseline is None and not args.update_baseline:
+        # A fresh checkout: this run becomes the baseline, there is nothing to gate against yet
+        print(f"No baseline at {args.baseline} yet: recording this run as the baseline instead of comparing. "
+              "Commit it (recorded on the machine that runs the gate) so later runs are checked against it.")
+    if args.update_baseline or baseline is None:
+        return record_baseline(args.baseline, run, results, baseline)
+    if baseline.get("environment") != run["environment"]:
+        print("⚠️ The baseline was recorded in a different environment; differences may not be the code's")
+    rows = compare(baseline.get("flows", {}), results, args.threshold, args.alpha)
+    write_json(args.output, dict(run, threshold=args.threshold, alpha=args.alpha, comparison=rows,
+                                 baseline_environment=baseline.get("environment")))
+
+    print(f"{'flow':<20} {'metric':<9} {'baseline':>9} {'median':>9} {'change':>8} {'p-value':>8} "
+          f"{'noise':>6}  verdict")
+    for row in rows:
+        print(f"{row['flow']:<20} {row['metric']:<9} {_value(row, 'baseline_median'):>9} {_value(row, 'median'):>9} "
+              f"{(format(row['change'], '+.1%') if row.get('change') is not None else '-'):>8} "
+              f"{(format(row['p_value'], '.3f') if 'p_value' in row else '-'):>8} "
+              f"{(format(row['spread'], '.0%') if 'spread' in row else '-'):>6}  {row['verdict']}")
+    print(f"Report written to {args.output}")
+    # A flow without baseline samples cannot pass the gate: nothing was compared
+    flagged = [row for row in rows if row["verdict"] in ("regression", "failed", "new")]
+    return 1 if flagged else 0
+
+
+def _value(row, key):
+    if key not in row:
+        return "-"
+    return str(round(row[key])) if row["metric"] == "commands" else f"{row[key]:.3f}s"
+
+
+if __name__ == "__main__":
+    sys.exit(main())
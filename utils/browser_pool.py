@@ -0,0 +1,275 @@
+import threading
+import time
+from selenium import webdriver
+from selenium.webdriver.chrome.service import Service
+from selenium.common.exceptions import WebDriverException, NoAlertPresentException
+from utils.config_reader import ConfigReader
+from utils.dom_scripts import DISABLE_ANIMATIONS
+from utils.driver_resolver import resolve_chromedriver
+from utils.launch_profiles import active_profile, chrome_options
+from utils.network_monitor import install_network_monitor
+
+
+def create_driver(logger, profile=None):
+    # Starts a session on the configured backend: a local Chrome, or a Selenium standalone/grid endpoint
+    if ConfigReader.get("webdriver_backend") == "remote":
+        return create_remote_driver(logger, profile)
+    return create_chrome_driver(logger, profile)
+
+
+def create_chrome_driver(logger, profile=None):
+    # Launches a new local Chrome session with the active launch profile
+    profile = profile or active_profile()
+    service = Service(resolve_chromedriver(logger))
+    driver = webdriver.Chrome(service=service, options=chrome_options(profile))
+    return prepare_driver(driver, profile)
+
+
+def create_remote_driver(logger, profile=None):
+    # Opens a Chrome session on remote_url; keep-alive reuses one HTTP connection for all of its commands
+    profile = profile or active_profile()
+    remote_url = ConfigReader.get("remote_url")
+    logger.info("Requesting a browser from %s", remote_url)
+    driver = webdriver.Remote(command_executor=remote_url, options=chrome_options(profile),
+                              keep_alive=ConfigReader.get("remote_keep_alive"))
+    return prepare_driver(driver, profile)
+
+
+def prepare_driver(driver, profile):
+    # Session settings shared by every backend; CDP-only ones are skipped where the driver has no CDP
+    driver.implicitly_wait(0)  # all waiting goes through WaitEngine
+    if profile.window == "maximized":
+        driver.maximize_window()
+    if not profile.animations:
+        try:
+            driver.execute_cdp_cmd("Page.addScriptToEvaluateOnNewDocument", {"source": DISABLE_ANIMATIONS})
+        except (AttributeError, WebDriverException):
+            pass  # --force-prefers-reduced-motion from the profile still applies
+    install_network_monitor(driver)
+    return driver
+
+
+def reset_session(driver):
+    # Clears cookies, localStorage and sessionStorage and parks the browser on a blank page
+    try:
+        driver.switch_to.alert.dismiss()
+    except NoAlertPresentException:
+        pass
+
+    # Close any extra windows a test may have opened
+    handles = driver.window_handles
+    for handle in handles[1:]:
+        driver.switch_to.window(handle)
+        driver.close()
+    driver.switch_to.window(handles[0])
+
+    # Web storage can only be cleared from a page on the same origin
+    if driver.current_url.startswith("http"):
+        driver.execute_script("window.localStorage.clear(); window.sessionStorage.clear();")
+
+    # Chrome can drop cookies for every domain at once, other drivers only for the current one
+    try:
+        driver.execute_cdp_cmd("Network.clearBrowserCookies", {})
+    except (AttributeError, WebDriverException):
+        driver.delete_all_cookies()
+
+    driver.get("about:blank")
+
+
+class PooledSession:
+    # Bookkeeping for one browser owned by the pool
+
+    def __init__(self, driver, number=0):
+        self.driver = driver
+        self.number = number
+        self.leases = 0
+        self.created_at = time.monotonic()
+
+
+class BrowserPool:
+    """Leases reusable WebDriver sessions to tests and resets them between leases."""
+
+    def __init__(self, logger, size=1, recycle_after=0, factory=create_driver, watchdog=None):
+        if size < 1:
+            raise ValueError(f"Browser pool size must be at least 1, got {size}")
+
+        self.logger = logger
+        self.size = size
+        self.recycle_after = recycle_after  # 0 keeps a session for the whole run
+        self.factory = factory
+        self.watchdog = watchdog  # optional BrowserWatchdog: health checks and orphan cleanup
+        self._launched = 0
+        self._launching = 0  # sessions being started in the background by prelaunch()
+        self._prelaunch_thread = None
+        self.prelaunched = 0  # sessions started by prelaunch()
+        self._idle = []
+        self._leased = {}
+        self._condition = threading.Condition()
+        self._closed = False
+        self.startup_times = []  # seconds per launched session
+
+    def acquire(self, timeout=None):
+        # Returns an idle session, launching a new one while the pool is below its size
+        with self._condition:
+            deadline = None if timeout is None else time.monotonic() + timeout
+            while not self._closed and not self._idle and len(self._leased) + self._launching >= self.size:
+                remaining = None if deadline is None else deadline - time.monotonic()
+                if remaining is not None and remaining <= 0:
+                    raise TimeoutError(f"No browser became available within {timeout}s")
+                self._condition.wait(remaining)
+
+            if self._closed:
+                raise RuntimeError("Browser pool is closed")
+
+            session = self._idle.pop() if self._idle else None
+            if session is None:
+                # Reserve the slot before the slow launch so other threads see it taken
+                self._launched += 1
+                session = PooledSession(None, self._launched)
+            self._leased[id(session)] = session
+
+        if session.driver is None:
+            try:
+                session.driver = self._launch()
+            except Exception:
+                with self._condition:
+                    self._leased.pop(id(session), None)
+                    self._condition.notify()
+                raise
+
+        session.leases += 1
+        self.logger.info("Leased browser session (lease #%s)", session.leases)
+        return session.driver
+
+    def release(self, driver, recycle=False, test_id=None):
+        # Resets a leased session and returns it to the pool, or quits it when it is due for recycling
+        session = self._find_leased(driver)
+        if session is None:
+            raise ValueError("Driver was not leased from this pool")
+
+        # (kind, description) of why the session is recycled, or None to keep it
+        reason = ("failure", "test failed") if recycle else None
+        if reason is None and self.recycle_after and session.leases >= self.recycle_after:
+            reason = ("leases", f"reached {session.leases} leases")
+        if reason is None and self.watchdog is not None:
+            if not self.watchdog.probe(driver):
+                reason = ("liveness", f"no answer to the liveness probe within {self.watchdog.probe_timeout}s")
+            else:
+                memory = self.watchdog.check_memory(driver, session.number, session.leases, test_id)
+                reason = ("memory", memory) if memory else None
+
+        if reason is None:
+            try:
+                reset_session(driver)
+            except WebDriverException as e:
+                self.logger.warning("⚠️ Browser reset failed, recycling session: %s", e)
+                reason = ("reset", "reset failed")
+
+        if reason is not None:
+            if self.watchdog is not None:
+                self.watchdog.record_recycle(session.number, session.leases, *reason)
+            else:
+                self.logger.info("♻️ Recycling browser session after %s leases: %s", session.leases, reason[1])
+
+        with self._condition:
+            self._leased.pop(id(session), None)
+            keep = reason is None and not self._closed
+            if keep:
+                self._idle.append(session)
+            self._condition.notify()
+
+        if not keep:
+            # A hung browser would hang driver.quit() as well; kill its processes instead
+            self._quit(driver, force=reason is not None and reason[0] == "liveness")
+
+    def prelaunch(self, count=1, warm_url=None):
+        # Starts up to `count` sessions on a background thread, warmed up on warm_url, for the first leases to pick up
+        with self._condition:
+            count = min(count, self.size - len(self._leased) - len(self._idle) - self._launching)
+            if count <= 0 or self._closed:
+                return None
+            self._launching += count
+            self.prelaunched += count
+        self._prelaunch_thread = threading.Thread(target=self._prelaunch, args=(count, warm_url),
+                                                  name="browser-prelaunch", daemon=True)
+        self._prelaunch_thread.start()
+        return self._prelaunch_thread
+
+    def close(self):
+        # Quits every idle session; leased sessions are quit when they are released, and a session still being
+        # pre-launched is quit by _prelaunch once it arrives, so closing never waits on a slow browser start
+        with self._condition:
+            self._closed = True
+            idle, self._idle = self._idle, []
+            self._condition.notify_all()
+
+        for session in idle:
+            self._quit(session.driver)
+
+    def _find_leased(self, driver):
+        with self._condition:
+            for session in self._leased.values():
+                if session.driver is driver:
+                    return session
+        return None
+
+    def _launch(self):
+        self.logger.info("Launching browser...")
+        start = time.perf_counter()
+        try:
+            driver = self.factory(self.logger)
+        except Exception as e:
+            self.logger.error("WebDriver failed to initialize: %s", e)
+            raise
+        elapsed = time.perf_counter() - start
+        if self.watchdog is not None:
+            self.watchdog.register(driver)  # so a later run can reap it if this one dies before quitting it
+        self.startup_times.append(elapsed)
+        self.logger.info("Browser started in %.2fs", elapsed)
+        return driver
+
+    def _prelaunch(self, count, warm_url):
+        for _ in range(count):
+            driver = None
+            try:
+                driver = self._launch()
+                if warm_url:
+                    self._warm_up(driver, warm_url)
+            except Exception as e:
+                self.logger.warning("⚠️ Background browser launch failed, tests will launch their own: %s", e)
+                if driver is not None:
+                    self._quit(driver)
+                    driver = None
+            finally:
+                with self._condition:
+                    self._launching -= 1
+                    keep = driver is not None and not self._closed
+                    if keep:
+                        self._launched += 1
+                        self._idle.append(PooledSession(driver, self._launched))
+                    self._condition.notify()
+            if driver is not None and not keep:
+                self._quit(driver)
+
+    def _warm_up(self, driver, url):
+        # Primes DNS, TLS and the HTTP cache with one visit, then hands the session over clean
+        start = time.perf_counter()
+        try:
+            driver.get(url)
+            self.logger.info("Browser warmed up on %s in %.2fs", url, time.perf_counter() - start)
+        except WebDriverException as e:
+            self.logger.warning("⚠️ Browser warm-up on %s failed: %s", url, e)
+        reset_session(driver)
+
+    def _quit(self, driver, force=False):
+        self.logger.info("Closing browser...")
+        pids = self.watchdog.processes_of(driver) if self.watchdog is not None else []
+        try:
+            if not force:
+                driver.quit()
+        except WebDriverException as e:
+            self.logger.warning("⚠️ Browser did not quit cleanly: %s", e)
+        finally:
+            if self.watchdog is not None:
+                self.watchdog.kill_orphans(pids)
+                self.watchdog.unregister(pids)
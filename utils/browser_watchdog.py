@@ -0,0 +1,249 @@
+import json
+import os
+import signal
+import threading
+import time
+from collections import namedtuple
+from selenium.common.exceptions import WebDriverException
+from utils.file_lock import FileLock
+
+try:
+    import psutil
+except ImportError:  # optional: without it only the liveness probe and process cleanup are available
+    psutil = None
+
+MemorySample = namedtuple("MemorySample", ["test_id", "session", "lease", "elapsed", "rss_mb", "cpu_seconds",
+                                           "processes"])
+RecycleEvent = namedtuple("RecycleEvent", ["session", "lease", "elapsed", "kind", "reason", "rss_mb"])
+
+
+def driver_pid(driver):
+    # Process id of the chromedriver behind a local session, or None (e.g. Remote WebDriver)
+    process = getattr(getattr(driver, "service", None), "process", None)
+    return getattr(process, "pid", None)
+
+
+def process_tree(pid):
+    # chromedriver plus the Chrome processes it started
+    if psutil is None or pid is None:
+        return []
+    try:
+        root = psutil.Process(pid)
+        return [root] + root.children(recursive=True)
+    except psutil.Error:
+        return []
+
+
+def process_pids(pid):
+    # Ids of a process and all its descendants; without psutil they are read from /proc (Linux)
+    if pid is None:
+        return []
+    if psutil is not None:
+        return [process.pid for process in process_tree(pid)]
+    children = {}
+    for entry in os.listdir("/proc") if os.path.isdir("/proc") else []:
+        stat = _proc_stat(entry) if entry.isdigit() else None
+        if stat:
+            children.setdefault(int(stat[1]), []).append(int(entry))
+    pids, pending = [], [pid]
+    while pending:
+        current = pending.pop()
+        pids.append(current)
+        pending += children.get(current, [])
+    return pids
+
+
+def _proc_stat(pid):
+    # Fields of /proc/<pid>/stat after the command name (state, ppid, ...), or None
+    try:
+        with open(f"/proc/{pid}/stat") as f:
+            return f.read().rsplit(")", 1)[1].split()
+    except (OSError, IndexError):
+        return None
+
+
+def start_time(pid):
+    # When a process started, to tell it from a later process that reuses its id; None if unknown
+    if psutil is not None:
+        try:
+            return psutil.Process(pid).create_time()
+        except psutil.Error:
+            return None
+    stat = _proc_stat(pid)
+    return int(stat[19]) if stat else None
+
+
+def _alive(pid):
+    if psutil is not None:
+        try:
+            return psutil.Process(pid).status() != psutil.STATUS_ZOMBIE
+        except psutil.Error:
+            return False
+    try:
+        os.kill(pid, 0)
+    except OSError:
+        return False
+    return True
+
+
+class BrowserWatchdog:
+    """Samples browser memory/CPU, decides when a pooled session must be recycled and cleans up after it.
+
+    The processes of every session launched are recorded in pid_file, so the orphan sweep at the start of a run
+    only ever kills browsers that an earlier run of this suite launched and never quit.
+    """
+
+    def __init__(self, logger, rss_limit_mb=0, probe_timeout=5, pid_file=None):
+        self.logger = logger
+        self.rss_limit_mb = rss_limit_mb  # 0 disables the memory limit
+        self.probe_timeout = probe_timeout
+        self.pid_file = pid_file
+        self.samples = []
+        self.events = []
+        self.orphans_killed = 0
+        self._start = time.monotonic()
+        if psutil is None:
+            self.logger.info("psutil is not installed: browser memory sampling is disabled")
+
+    def sample(self, driver, session, lease, test_id=None):
+        # Records the RSS (MB) and CPU time (s) of chromedriver and its Chrome processes; returns the sample or None
+        processes = process_tree(driver_pid(driver))
+        if not processes:
+            return None
+        rss = cpu = 0.0
+        for process in processes:
+            try:
+                rss += process.memory_info().rss
+                times = process.cpu_times()
+                cpu += times.user + times.system
+            except psutil.Error:
+                continue  # exited while sampling
+        record = MemorySample(test_id, session, lease, self._elapsed(), rss / 2 ** 20, cpu, len(processes))
+        self.samples.append(record)
+        return record
+
+    def probe(self, driver):
+        # Liveness check: a trivial script must answer within probe_timeout, otherwise the renderer is hung
+        result = {}
+
+        def run():
+            try:
+                result["ok"] = driver.execute_script("return 1") == 1
+            except WebDriverException:
+                result["ok"] = False
+
+        thread = threading.Thread(target=run, name="browser-probe", daemon=True)
+        thread.start()
+        thread.join(self.probe_timeout)
+        return result.get("ok", False)
+
+    def check_memory(self, driver, session, lease, test_id=None):
+        # Samples the session; returns why it should be recycled, or None while it is under the RSS limit
+        sample = self.sample(driver, session, lease, test_id)
+        if sample and self.rss_limit_mb and sample.rss_mb > self.rss_limit_mb:
+            return f"RSS {sample.rss_mb:.0f} MB above limit of {self.rss_limit_mb:.0f} MB"
+        return None
+
+    def record_recycle(self, session, lease, kind, reason):
+        # kind is one of "failure", "leases", "liveness", "memory", "reset"
+        last = next((s for s in reversed(self.samples) if s.session == session), None)
+        self.events.append(RecycleEvent(session, lease, self._elapsed(), kind, reason, last.rss_mb if last else None))
+        self.logger.info("♻️ Recycling browser session %s after lease #%s: %s", session, lease, reason)
+
+    def processes_of(self, driver):
+        # Process ids to clean up if quitting the session leaves them behind: chromedriver and its Chrome processes
+        return process_pids(driver_pid(driver))
+
+    def register(self, driver):
+        # Records the processes of a session this process launched; returns their ids
+        pids = self.processes_of(driver)
+        if pids and self.pid_file:
+            owner = str(os.getpid())
+            with self._pid_entries() as entries:
+                entry = entries.setdefault(owner, {"started": start_time(os.getpid()), "processes": {}})
+                entry["processes"].update({str(pid): start_time(pid) for pid in pids})
+        return pids
+
+    def unregister(self, pids):
+        # Forgets the processes of a session once it has been quit (or killed)
+        if pids and self.pid_file:
+            with self._pid_entries() as entries:
+                entry = entries.get(str(os.getpid()), {"processes": {}})
+                for pid in pids:
+                    entry["processes"].pop(str(pid), None)
+
+    def kill_orphans(self, pids):
+        # Kills whatever is left of a session's processes after driver.quit() returned or failed
+        for pid in pids:
+            if not _alive(pid):
+                continue
+            try:
+                os.kill(pid, getattr(signal, "SIGKILL", signal.SIGTERM))
+            except OSError:
+                continue
+            self.orphans_killed += 1
+            self.logger.warning("⚠️ Killed orphaned browser process %s", pid)
+
+    def sweep_orphans(self):
+        # Kills the browser processes recorded by runs that exited without quitting them. A recorded pid only
+        # counts while it still belongs to the same process (same start time); other users' browsers are never seen.
+        if not self.pid_file:
+            return
+        pids = []
+        with self._pid_entries() as entries:
+            for owner, entry in list(entries.items()):
+                if _alive(int(owner)) and start_time(int(owner)) == entry["started"]:
+                    continue  # a run (or xdist worker) that is still going
+                del entries[owner]
+                for pid, started in entry["processes"].items():
+                    if _alive(int(pid)) and start_time(int(pid)) == started:
+                        pids += [p for p in process_pids(int(pid)) if p not in pids]
+        self.kill_orphans(pids)
+
+    def _pid_entries(self):
+        return _PidFile(self.pid_file)
+
+    def report(self):
+        # Recycle events and memory curve, as written to the browser health report
+        return {
+            "rss_limit_mb": self.rss_limit_mb,
+            "orphans_killed": self.orphans_killed,
+            "events": [e._asdict() for e in self.events],
+            "samples": [s._asdict() for s in self.samples],
+        }
+
+    def write(self, path):
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        with open(path, "w") as f:
+            json.dump(self.report(), f, indent=2)
+
+    def _elapsed(self):
+        return round(time.monotonic() - self._start, 3)
+
+
+class _PidFile:
+    # {owner pid: {"started": t, "processes": {pid: started}}} read and written back under a cross-process lock
+
+    def __init__(self, path):
+        self.path = path
+        self.lock = FileLock(path + ".lock")
+        self.entries = None
+
+    def __enter__(self):
+        self.lock.acquire()
+        try:
+            with open(self.path) as f:
+                self.entries = json.load(f)
+        except (OSError, ValueError):
+            self.entries = {}
+        return self.entries
+
+    def __exit__(self, *exc_info):
+        try:
+            self.entries = {owner: entry for owner, entry in self.entries.items() if entry["processes"]}
+            tmp_path = self.path + f".{os.getpid()}.tmp"
+            with open(tmp_path, "w") as f:
+                json.dump(self.entries, f, indent=2)
+            os.replace(tmp_path, self.path)
+        finally:
+            self.lock.release()
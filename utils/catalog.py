@@ -0,0 +1,98 @@
+import json
+import os
+import threading
+import time
+from collections import namedtuple
+from utils.api_client import api_client
+from utils.config_reader import ConfigReader
+from utils.file_lock import FileLock
+
+# Category codes used by the backend -> link text of the category on the home page
+CATEGORY_NAMES = {"phone": "Phones", "notebook": "Laptops", "monitor": "Monitors"}
+
+CatalogEntry = namedtuple("CatalogEntry", ["name", "category", "position", "product_id"])
+
+
+class Catalog:
+    """Index of the storefront's products (name, category, position in the category, id)."""
+
+    def __init__(self, entries, built_at=None):
+        self.entries = [CatalogEntry(*entry) for entry in entries]
+        self.built_at = built_at or time.time()
+        self._by_name = {entry.name: entry for entry in self.entries}
+        self._by_id = {entry.product_id: entry for entry in self.entries}
+        self._by_category = {}
+        for entry in sorted(self.entries, key=lambda e: e.position):
+            self._by_category.setdefault(entry.category, []).append(entry)
+
+    def by_name(self, name):
+        try:
+            return self._by_name[name]
+        except KeyError:
+            raise KeyError(f"Product '{name}' is not in the catalog") from None
+
+    def by_id(self, product_id):
+        try:
+            return self._by_id[int(product_id)]
+        except KeyError:
+            raise KeyError(f"Product id {product_id} is not in the catalog") from None
+
+    def find(self, category, product_name=None, first=False, last=False):
+        # Resolves the same selection ProductPage.add_product makes by browsing, or None if there is none
+        if product_name:
+            entry = self._by_name.get(product_name)
+            return entry if entry and entry.category == category else None
+        products = self._by_category.get(category, [])
+        if not products:
+            return None
+        return products[0] if first else products[-1] if last else None
+
+    @classmethod
+    def build(cls, api):
+        # One bycat call per category gives the positions; entries gives every product and category
+        categories = sorted({product["cat"] for product in api.entries()})
+        entries = []
+        for code in categories:
+            for position, product in enumerate(api.by_category(code)):
+                entries.append((product["title"], CATEGORY_NAMES.get(code, code), position, int(product["id"])))
+        return cls(entries)
+
+    @classmethod
+    def load(cls, path, ttl, api, logger=None):
+        # Uses the on-disk index while it is younger than `ttl` seconds and built from the same API
+        with FileLock(path + ".lock"):
+            try:
+                with open(path) as f:
+                    cached = json.load(f)
+                if cached["api_url"] == api.api_url and time.time() - cached["built_at"] < ttl:
+                    return cls(cached["entries"], cached["built_at"])
+            except (OSError, ValueError, KeyError):
+                pass
+
+            start = time.perf_counter()
+            catalog = cls.build(api)
+            if logger:
+                logger.info("Built catalog index of %s products in %.0f ms", len(catalog.entries),
+                            (time.perf_counter() - start) * 1000)
+
+            os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+            tmp_path = path + f".{os.getpid()}.tmp"
+            with open(tmp_path, "w") as f:
+                json.dump({"api_url": api.api_url, "built_at": catalog.built_at,
+                           "entries": [list(entry) for entry in catalog.entries]}, f, indent=2)
+            os.replace(tmp_path, path)
+            return catalog
+
+
+_catalogs = {}
+_catalogs_lock = threading.Lock()
+
+
+def shared_catalog(logger=None):
+    # The catalog for the configured API, loaded once per process
+    api = api_client(logger)
+    with _catalogs_lock:
+        if api.api_url not in _catalogs:
+            _catalogs[api.api_url] = Catalog.load(ConfigReader.get_path("catalog_cache_path"),
+                                                  ConfigReader.get("catalog_ttl"), api, logger)
+        return _catalogs[api.api_url]
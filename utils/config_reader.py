@@ -1,20 +1,274 @@
 import configparser
 import os
+import threading
+
+PROJECT_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+CONFIG_PATH = os.path.join(PROJECT_ROOT, "config.properties")
+ENV_PREFIX = "DEMOBLAZE_"
+
+
+def boolean(value):
+    # Parses the usual configparser spellings of true/false
+    lowered = str(value).strip().lower()
+    if lowered in configparser.ConfigParser.BOOLEAN_STATES:
+        return configparser.ConfigParser.BOOLEAN_STATES[lowered]
+    raise ValueError(f"expected a boolean, got '{value}'")
+
+
+def positive_int(value):
+    number = int(value)
+    if number < 1:
+        raise ValueError(f"expected an integer >= 1, got {number}")
+    return number
+
+
+def non_negative_int(value):
+    number = int(value)
+    if number < 0:
+        raise ValueError(f"expected an integer >= 0, got {number}")
+    return number
+
+
+def positive_float(value):
+    number = float(value)
+    if number <= 0:
+        raise ValueError(f"expected a number > 0, got {number}")
+    return number
+
+
+def non_negative_float(value):
+    number = float(value)
+    if number < 0:
+        raise ValueError(f"expected a number >= 0, got {number}")
+    return number
+
+
+def int_list(value):
+    # Comma-separated integers, e.g. "235, 236"
+    return [int(item) for item in str(value).split(",") if item.strip()]
+
+
+def one_of(*choices):
+    # Parser accepting only the listed values
+    def parse(value):
+        if value not in choices:
+            raise ValueError(f"expected one of {', '.join(choices)}, got '{value}'")
+        return value
+    return parse
+
+
+# Known settings: name -> (parser, default). A default of None means the setting is required.
+SCHEMA = {
+    "base_url": (str, None),
+    "test_username": (str, None),
+    "test_password": (str, None),
+    "monitor_name": (str, None),
+    "explicit_wait": (positive_float, 5),
+    "polling_interval": (positive_float, 0.5),
+    "wait_min_poll": (positive_float, 0.05),
+    "dom_settle_ms": (non_negative_float, 300),
+    "test_wait_budget": (positive_float, 60),
+    "network_idle_ms": (non_negative_float, 500),
+    "launch_profile": (str, "fidelity"),
+    "pool_size": (positive_int, 1),
+    "pool_recycle_after": (non_negative_int, 25),
+    "pool_recycle_on_failure": (boolean, True),
+    "prelaunch_browsers": (non_negative_int, 1),
+    "watchdog_enabled": (boolean, True),
+    "watchdog_rss_limit_mb": (non_negative_float, 1500),
+    "watchdog_probe_timeout": (positive_float, 5),
+    "watchdog_pid_file": (str, ".cache/browser_pids.json"),
+    "webdriver_backend": (one_of("local", "remote"), "local"),
+    "remote_url": (str, "http://localhost:4444"),
+    "remote_keep_alive": (boolean, True),
+    "shard_durations_dir": (str, ".cache/durations"),
+    "shard_durations_file": (str, "tests/durations.json"),
+    "chromedriver_path": (str, ""),
+    "driver_cache_dir": (str, "~/.cache/selenium-green-demoblaze/chromedriver"),
+    "driver_allow_download": (boolean, False),
+    "account_pool_ids": (int_list, [235]),
+    "account_pool_state": (str, ".account_pool.json"),
+    "api_url": (str, "https://api.demoblaze.com"),
+    "api_pool_size": (positive_int, 8),
+    "api_timeout": (positive_float, 10),
+    "form_fill_mode": (one_of("js", "keys"), "js"),
+    "catalog_navigation": (boolean, True),
+    "catalog_cache_path": (str, ".cache/catalog.json"),
+    "catalog_ttl": (non_negative_float, 3600),
+    "session_snapshot_dir": (str, ".cache/sessions"),
+    "session_snapshot_ttl": (non_negative_float, 1800),
+    "step_retries": (non_negative_int, 1),
+    "test_retry_budget": (positive_float, 30),
+    "log_level": (one_of("DEBUG", "INFO", "WARNING", "ERROR"), "INFO"),
+    "log_dir": (str, "reports/logs"),
+    "benchmark_iterations": (positive_int, 15),
+    "benchmark_warmup": (non_negative_int, 2),
+    "benchmark_threshold": (non_negative_float, 0.1),
+    "benchmark_alpha": (positive_float, 0.05),
+    "benchmark_baseline": (str, "benchmarks/baseline.json"),
+    "benchmark_report": (str, "reports/benchmark_report.json"),
+    "locator_snapshot_dir": (str, "tests/locator_snapshots"),
+    "order_dataset": (str, "tests/data/orders.csv"),
+    "artifacts_enabled": (boolean, True),
+    "artifact_dir": (str, "reports/artifacts"),
+    "artifact_workers": (positive_int, 2),
+    "artifact_max_mb": (positive_float, 200),
+    "instrumentation": (boolean, True),
+    "report_dir": (str, "reports"),
+    "timing_report_top": (positive_int, 15),
+    "load_browser_users": (non_negative_int, 2),
+    "load_http_users": (non_negative_int, 10),
+    "load_ramp_up": (non_negative_float, 10),
+    "load_duration": (non_negative_float, 60),
+    "load_think_time": (non_negative_float, 1),
+    "load_report": (str, "reports/load_report.json"),
+    "use_local_server": (boolean, False),
+    "local_server_port": (non_negative_int, 0),
+    "local_server_latency_mode": (one_of("zero", "fixed", "jitter"), "zero"),
+    "local_server_latency_ms": (non_negative_float, 0),
+    "local_server_jitter_ms": (non_negative_float, 0),
+    "local_server_seed": (int, 0),
+}
+
+
+class Config:
+    """Typed settings parsed once from config.properties, with environment and command-line overrides."""
+
+    def __init__(self, path=CONFIG_PATH, overrides=None, environ=None):
+        self.path = path
+        self.overrides = dict(overrides or {})
+        self.environ = os.environ if environ is None else environ
+        self._lock = threading.RLock()
+        self._mtime = None
+        self._raw = {}
+        self._values = {}
+        self.load()
+
+    def load(self):
+        # Parses the file and applies overrides: file < DEMOBLAZE_* environment variables < explicit overrides
+        with self._lock:
+            parser = configparser.ConfigParser()
+            parser.read(self.path)
+            raw = dict(parser["DEFAULT"])
+
+            for name in set(SCHEMA) | set(raw):
+                env_value = self.environ.get(ENV_PREFIX + name.upper())
+                if env_value is not None:
+                    raw[name] = env_value
+            raw.update(self.overrides)
+
+            values = {}
+            for name, value in raw.items():
+                parse = SCHEMA.get(name, (str, None))[0]
+                try:
+                    values[name] = parse(value)
+                except ValueError as e:
+                    raise ValueError(f"Invalid value for '{name}' in config: {e}") from None
+            for name, (_, default) in SCHEMA.items():
+                if name not in values and default is not None:
+                    values[name] = default
+            missing = [name for name, (_, default) in SCHEMA.items() if default is None and not values.get(name)]
+            if missing:
+                raise ValueError(f"Missing required setting(s) in {self.path}: {', '.join(missing)}")
+
+            self._raw = raw
+            self._values = values
+            self._mtime = self._current_mtime()
+
+    def reload_if_changed(self):
+        # Re-reads the file only when its modification time has changed, keeping env/CLI overrides; returns True if it reloaded
+        with self._lock:
+            if self._current_mtime() == self._mtime:
+                return False
+            self.load()
+            return True
+
+    def set_overrides(self, overrides):
+        # Replaces the explicit overrides (e.g. from the pytest command line) and re-applies them
+        with self._lock:
+            self.overrides = dict(overrides)
+            self.load()
+
+    def update_overrides(self, overrides):
+        # Adds to the explicit overrides, e.g. when a fixture points base_url at a local server
+        with self._lock:
+            self.overrides.update(overrides)
+            self.load()
+
+    def get(self, name):
+        try:
+            return self._values[name]
+        except KeyError:
+            raise KeyError(f"Property '{name}' not found in config.properties") from None
+
+    def get_raw(self, name):
+        # The setting as written in the file or override, before type conversion
+        if name in self._raw:
+            return self._raw[name]
+        return str(self.get(name))
+
+    def with_prefix(self, prefix):
+        # Raw settings whose names start with prefix, keyed by the rest of the name (e.g. the launch profiles)
+        return {name[len(prefix):]: value for name, value in self._raw.items() if name.startswith(prefix)}
+
+    def __getattr__(self, name):
+        if name.startswith("_"):
+            raise AttributeError(name)
+        try:
+            return self.get(name)
+        except KeyError as e:
+            raise AttributeError(str(e)) from None
+
+    def _current_mtime(self):
+        try:
+            return os.path.getmtime(self.path)
+        except OSError:
+            return None
+
 
 class ConfigReader:
-    # Reads configuration from the properties file
-
-    @staticmethod
-    def get_property(property_name):
-        # Fetch a property from config.properties
-        config = configparser.ConfigParser()
-        config_path = os.path.join(os.path.dirname(__file__), "../config.properties")
-        
-        # Read the config file
-        config.read(config_path)
-
-        # Ensure the key exists before returning
-        if property_name in config["DEFAULT"]:
-            return config["DEFAULT"][property_name]
-        else:
-            raise KeyError(f"Property '{property_name}' not found in config.properties")
+    # Process-wide access point to the parsed configuration
+
+    _config = None
+    _lock = threading.Lock()
+
+    @classmethod
+    def config(cls):
+        # Parses config.properties on first use and returns the same Config afterwards
+        if cls._config is None:
+            with cls._lock:
+                if cls._config is None:
+                    cls._config = Config()
+        return cls._config
+
+    @classmethod
+    def get(cls, property_name):
+        # Fetch a typed property
+        return cls.config().get(property_name)
+
+    @classmethod
+    def get_path(cls, property_name):
+        # Fetch a path property, resolving "~" and paths relative to the project root
+        return os.path.join(PROJECT_ROOT, os.path.expanduser(cls.get(property_name)))
+
+    @classmethod
+    def get_property(cls, property_name):
+        # Fetch a property as the string written in config.properties
+        return cls.config().get_raw(property_name)
+
+    @classmethod
+    def get_prefixed(cls, prefix):
+        # Fetch every property named prefix + <something>, as {something: string}
+        return cls.config().with_prefix(prefix)
+
+    @classmethod
+    def set_overrides(cls, overrides):
+        cls.config().set_overrides(overrides)
+
+    @classmethod
+    def update_overrides(cls, overrides):
+        cls.config().update_overrides(overrides)
+
+    @classmethod
+    def reload_if_changed(cls):
+        return cls.config().reload_if_changed()
@@ -1,5 +1,2 @@
-# Default timeout for explicit waits
+# Test account used by the login tests
 TEST_USER_ID = 235 
-IMPLICIT_WAIT = 5
-EXPLICIT_WAIT = 5
-POLLING_INTERVAL = 0.5
@@ -0,0 +1,167 @@
+# JavaScript executed through driver.execute_script so that a batch of DOM reads or writes costs one round trip
+
+# Resolves a Selenium (by, value) locator to an array of elements inside the page
+FIND_ELEMENTS = """
+function findElements(by, value) {
+    switch (by) {
+        case "id":
+            return Array.from(document.querySelectorAll("#" + CSS.escape(value)));
+        case "class name":
+            return Array.from(document.querySelectorAll("." + CSS.escape(value)));
+        case "name":
+            return Array.from(document.querySelectorAll("[name='" + CSS.escape(value) + "']"));
+        case "tag name":
+        case "css selector":
+            return Array.from(document.querySelectorAll(value));
+        case "link text":
+            return Array.from(document.querySelectorAll("a")).filter(function (a) { return a.innerText.trim() === value; });
+        case "partial link text":
+            return Array.from(document.querySelectorAll("a")).filter(function (a) { return a.innerText.indexOf(value) !== -1; });
+        case "xpath":
+            var result = document.evaluate(value, document, null, XPathResult.ORDERED_NODE_SNAPSHOT_TYPE, null);
+            var nodes = [];
+            for (var i = 0; i < result.snapshotLength; i++) {
+                nodes.push(result.snapshotItem(i));
+            }
+            return nodes;
+    }
+    throw new Error("Unsupported locator strategy: " + by);
+}
+"""
+
+# arguments: by, value -> visible text of every match, like WebElement.text
+READ_TEXTS = FIND_ELEMENTS + """
+return findElements(arguments[0], arguments[1]).map(function (el) { return (el.innerText || "").trim(); });
+"""
+
+# arguments: [[by, value, text], ...] -> locators that matched nothing, as "by=value" strings
+FILL_FORM = FIND_ELEMENTS + """
+var missing = [];
+arguments[0].forEach(function (field) {
+    var el = findElements(field[0], field[1])[0];
+    if (!el) {
+        missing.push(field[0] + "=" + field[1]);
+        return;
+    }
+    el.focus();
+    el.value = field[2];
+    el.dispatchEvent(new Event("input", {bubbles: true}));
+    el.dispatchEvent(new Event("change", {bubbles: true}));
+    el.blur();
+});
+return missing;
+"""
+
+# -> milliseconds since the DOM last changed once the document has loaded, -1 while it is still loading.
+# The first call installs a MutationObserver and reports 0, so a page is never "settled" before it was observed.
+DOM_QUIET_MS = """
+var state = window.__domQuiet;
+if (!state) {
+    state = window.__domQuiet = {last: performance.now()};
+    new MutationObserver(function () { state.last = performance.now(); })
+        .observe(document.documentElement, {subtree: true, childList: true, attributes: true, characterData: true});
+    return 0;
+}
+return document.readyState === "complete" ? performance.now() - state.last : -1;
+"""
+
+# Installed before any page script runs (Page.addScriptToEvaluateOnNewDocument); counts in-flight fetch/XHR
+# requests and remembers the most recent completed ones
+NETWORK_MONITOR = """
+(function () {
+    if (window.__netMonitor) {
+        return;
+    }
+    var monitor = window.__netMonitor = {inflight: 0, last: performance.now(), done: []};
+    function started() {
+        monitor.inflight++;
+        monitor.last = performance.now();
+    }
+    function finished(url, status) {
+        monitor.inflight = Math.max(0, monitor.inflight - 1);
+        monitor.last = performance.now();
+        monitor.done.push({url: String(url), status: status});
+        if (monitor.done.length > 200) {
+            monitor.done.shift();
+        }
+    }
+
+    var originalFetch = window.fetch;
+    if (originalFetch) {
+        window.fetch = function (input) {
+            var url = typeof input === "string" ? input : (input && input.url);
+            started();
+            return originalFetch.apply(this, arguments).then(function (response) {
+                finished(url, response.status);
+                return response;
+            }, function (error) {
+                finished(url, 0);
+                throw error;
+            });
+        };
+    }
+
+    var open = XMLHttpRequest.prototype.open;
+    var send = XMLHttpRequest.prototype.send;
+    XMLHttpRequest.prototype.open = function (method, url) {
+        this.__monitoredUrl = url;
+        return open.apply(this, arguments);
+    };
+    XMLHttpRequest.prototype.send = function () {
+        var xhr = this;
+        started();
+        xhr.addEventListener("loadend", function () { finished(xhr.__monitoredUrl, xhr.status); });
+        return send.apply(this, arguments);
+    };
+})();
+"""
+
+# -> {inflight, idle_ms, ready, done: [url, ...]} for the current document, or null if the monitor is missing
+NETWORK_STATUS = """
+var monitor = window.__netMonitor;
+if (!monitor) {
+    return null;
+}
+return {
+    inflight: monitor.inflight,
+    idle_ms: performance.now() - monitor.last,
+    ready: document.readyState === "complete",
+    done: monitor.done.map(function (request) { return request.url; })
+};
+"""
+
+# -> {key: value} of the current origin's localStorage
+READ_LOCAL_STORAGE = """
+var items = {};
+for (var i = 0; i < localStorage.length; i++) {
+    var key = localStorage.key(i);
+    items[key] = localStorage.getItem(key);
+}
+return items;
+"""
+
+# arguments[0]: {key: value} to write into the current origin's localStorage
+WRITE_LOCAL_STORAGE = """
+var items = arguments[0];
+Object.keys(items).forEach(function (key) { localStorage.setItem(key, items[key]); });
+"""
+
+# New-document script restoring localStorage before the site's own scripts run.
+# Formatted with json-encoded ORIGIN and ITEMS; only applies to documents of that origin.
+RESTORE_LOCAL_STORAGE = """
+(function (origin, items) {
+    if (location.origin !== origin) {
+        return;
+    }
+    Object.keys(items).forEach(function (key) { localStorage.setItem(key, items[key]); });
+})(%(origin)s, %(items)s);
+"""
+
+# New-document script for lean launch profiles: turns off CSS animations and transitions
+DISABLE_ANIMATIONS = """
+document.addEventListener("DOMContentLoaded", function () {
+    var style = document.createElement("style");
+    style.textContent = "*, *::before, *::after { animation: none !important; transition: none !important; }";
+    document.head.appendChild(style);
+});
+"""
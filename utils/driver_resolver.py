@@ -0,0 +1,190 @@
+import argparse
+import hashlib
+import json
+import os
+import re
+import shutil
+import subprocess
+import sys
+import threading
+import time
+from utils.config_reader import ConfigReader
+
+UNKNOWN_VERSION = "unknown"  # index key for binaries cached while the Chrome version could not be detected
+
+VERSION_PATTERN = re.compile(r"(\d+)\.(\d+)\.(\d+)\.(\d+)")
+
+CHROME_CANDIDATES = [
+    "google-chrome",
+    "google-chrome-stable",
+    "chromium",
+    "chromium-browser",
+    "chrome",
+    "/Applications/Google Chrome.app/Contents/MacOS/Google Chrome",
+]
+
+WINDOWS_VERSION_QUERY = ["reg", "query", r"HKEY_CURRENT_USER\Software\Google\Chrome\BLBeacon", "/v", "version"]
+
+
+def detect_chrome_version():
+    # Returns the installed Chrome version string (e.g. "131.0.6778.85") without any network access
+    commands = [WINDOWS_VERSION_QUERY] if sys.platform.startswith("win") else [[c, "--version"] for c in CHROME_CANDIDATES]
+    for command in commands:
+        try:
+            output = subprocess.run(command, capture_output=True, text=True, timeout=10).stdout
+        except (OSError, subprocess.TimeoutExpired):
+            continue
+        match = VERSION_PATTERN.search(output)
+        if match:
+            return match.group(0)
+    return None
+
+
+def file_digest(path):
+    # SHA-256 of a file, used as its address in the cache
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(1024 * 1024), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+class DriverResolver:
+    """Finds a chromedriver binary for the local Chrome from an on-disk, content-addressed cache."""
+
+    def __init__(self, cache_dir, fallback_path=None, allow_download=False, logger=None):
+        self.cache_dir = os.path.expanduser(cache_dir)
+        self.fallback_path = os.path.expanduser(fallback_path) if fallback_path else None
+        self.allow_download = allow_download
+        self.logger = logger
+        self.index_path = os.path.join(self.cache_dir, "index.json")
+        self.resolve_seconds = None
+
+    def resolve(self):
+        # Cache first, then the configured path; downloading is the only step that uses the network
+        start = time.perf_counter()
+        chrome_version = detect_chrome_version()
+        major = chrome_version.split(".")[0] if chrome_version else UNKNOWN_VERSION
+
+        path = self.lookup(major)
+        source = "cache"
+        if path is None and self.fallback_path:
+            if not os.path.isfile(self.fallback_path):
+                raise FileNotFoundError(f"chromedriver_path does not exist: {self.fallback_path}")
+            # Cached like an imported binary, so the next run finds it without the configured path
+            path, source = self.store(self.fallback_path, major), "config"
+        if path is None and self.allow_download:
+            path, source = self.download(major), "download"
+        if path is None:
+            raise FileNotFoundError(
+                f"No cached chromedriver for Chrome {chrome_version or '(not found)'} in {self.cache_dir}. "
+                "Set chromedriver_path in config.properties or seed the cache with "
+                "'python -m utils.driver_resolver --import <path>'"
+            )
+
+        self.resolve_seconds = time.perf_counter() - start
+        self._log("Resolved chromedriver from %s in %.0f ms: %s", source, self.resolve_seconds * 1000, path)
+        return path
+
+    def lookup(self, major):
+        # Returns the cached binary for a Chrome major version, if present and intact
+        digest = self._read_index().get(str(major))
+        if not digest:
+            return None
+        path = os.path.join(self.cache_dir, "blobs", digest, self._binary_name())
+        return path if os.path.isfile(path) else None
+
+    def store(self, source_path, major):
+        # Copies a chromedriver binary into the cache under its content hash and indexes it by Chrome major version
+        digest = file_digest(source_path)
+        blob_dir = os.path.join(self.cache_dir, "blobs", digest)
+        target = os.path.join(blob_dir, self._binary_name())
+        if not os.path.isfile(target):
+            os.makedirs(blob_dir, exist_ok=True)
+            tmp_target = target + ".tmp"
+            shutil.copy2(source_path, tmp_target)
+            os.chmod(tmp_target, 0o755)
+            os.replace(tmp_target, target)
+
+        index = self._read_index()
+        index[str(major)] = digest
+        os.makedirs(self.cache_dir, exist_ok=True)
+        tmp_index = self.index_path + f".{os.getpid()}.tmp"
+        with open(tmp_index, "w") as f:
+            json.dump(index, f, indent=2, sort_keys=True)
+        os.replace(tmp_index, self.index_path)
+        self._log("Cached chromedriver for Chrome %s as %s", major, digest[:12])
+        return target
+
+    def download(self, major):
+        # Fetches a matching chromedriver once and adds it to the cache
+        from webdriver_manager.chrome import ChromeDriverManager
+
+        self._log("⚠️ chromedriver not cached, downloading it once...")
+        downloaded = ChromeDriverManager().install()
+        return self.store(downloaded, major or UNKNOWN_VERSION)
+
+    def _read_index(self):
+        try:
+            with open(self.index_path) as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return {}
+
+    def _binary_name(self):
+        return "chromedriver.exe" if sys.platform.startswith("win") else "chromedriver"
+
+    def _log(self, msg, *args):
+        if self.logger:
+            self.logger.info(msg, *args)
+
+
+def resolver_from_config(logger=None):
+    # Builds a resolver from the driver_* settings in config.properties
+    return DriverResolver(
+        cache_dir=ConfigReader.get_path("driver_cache_dir"),
+        fallback_path=ConfigReader.get("chromedriver_path") or None,
+        allow_download=ConfigReader.get("driver_allow_download"),
+        logger=logger,
+    )
+
+
+_resolved_path = None
+_resolve_lock = threading.Lock()
+
+
+def resolve_chromedriver(logger=None):
+    # Resolves chromedriver once per process; later sessions reuse the same path
+    global _resolved_path
+    with _resolve_lock:
+        if _resolved_path is None:
+            _resolved_path = resolver_from_config(logger).resolve()
+        return _resolved_path
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Manage the local chromedriver cache.")
+    group = parser.add_mutually_exclusive_group(required=True)
+    group.add_argument("--import", dest="import_path", metavar="PATH",
+                       help="add an existing chromedriver binary to the cache")
+    group.add_argument("--download", action="store_true",
+                       help="download the chromedriver matching the local Chrome into the cache")
+    group.add_argument("--show", action="store_true", help="print the binary the suite would use")
+    parser.add_argument("--chrome-major", help="Chrome major version to index the binary under")
+    args = parser.parse_args(argv)
+
+    resolver = resolver_from_config()
+    version = detect_chrome_version()
+    major = args.chrome_major or (version.split(".")[0] if version else None)
+    if args.import_path:
+        if not major:
+            parser.error("Chrome not found; pass --chrome-major")
+        print(resolver.store(args.import_path, major))
+    elif args.download:
+        print(resolver.download(major))
+    else:
+        print(resolver.resolve())
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,179 @@
+import base64
+import glob
+import gzip
+import hashlib
+import json
+import os
+import re
+import shutil
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from selenium.common.exceptions import WebDriverException
+from utils.file_lock import FileLock
+
+DOM_DIR = "dom"  # page sources, one gzip file per distinct DOM, shared by every test that saw it
+STAT_FIELDS = ("captures", "capture_seconds", "write_seconds", "bytes_written", "dom_deduplicated", "evicted", "errors")
+
+
+def artifact_name(test_id):
+    # Directory name for a test: readable, filesystem-safe, and unique even when two ids sanitize alike
+    digest = hashlib.sha1(test_id.encode()).hexdigest()[:8]
+    return f"{re.sub(r'[^A-Za-z0-9_.-]+', '_', test_id)[-120:].strip('_')}-{digest}"
+
+
+class FailureArtifacts:
+    """Screenshot, page source and browser console log of failing tests, written off the test's critical path.
+
+    capture() only pulls the raw data out of the browser, which has to happen before the test's teardown resets it.
+    Decoding, compressing, deduplicating page sources by hash and writing happen on a background thread pool, which
+    then evicts the oldest tests' artifacts until the directory is back under max_bytes.
+    """
+
+    def __init__(self, directory, max_bytes, workers=2, logger=None):
+        self.directory = directory
+        self.max_bytes = max_bytes
+        self.logger = logger
+        self.stats = dict.fromkeys(STAT_FIELDS, 0)
+        self._stats_lock = threading.Lock()
+        self._executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="artifacts")
+
+    def capture(self, driver, test_id):
+        # Grabs the browser state on the calling thread and queues the rest; returns (artifact directory, future)
+        start = time.perf_counter()
+        raw = {"test_id": test_id, "captured_at": time.time()}
+        grabs = (
+            ("url", lambda: driver.current_url),
+            ("screenshot", driver.get_screenshot_as_base64),  # decoded in the background
+            ("page_source", lambda: driver.page_source),
+            ("console", lambda: driver.get_log("browser")),  # Chrome only; remote sessions have no log endpoint
+        )
+        for name, grab in grabs:
+            try:
+                raw[name] = grab()
+            except (AttributeError, WebDriverException) as e:
+                raw[name] = None
+                raw.setdefault("missing", {})[name] = type(e).__name__
+        self._count(captures=1, capture_seconds=time.perf_counter() - start)
+        path = os.path.join(self.directory, artifact_name(test_id))
+        return path, self._executor.submit(self._write, path, raw)
+
+    def close(self):
+        # Waits for every queued capture to be written
+        self._executor.shutdown(wait=True)
+        return self.stats
+
+    def write_stats(self, path):
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with open(path, "w") as f:
+            json.dump(self.stats, f, indent=2)
+
+    def _write(self, path, raw):
+        start = time.perf_counter()
+        try:
+            # The expensive part, compression, happens outside the lock
+            files = {}
+            if raw.get("screenshot"):
+                files["screenshot.png"] = base64.b64decode(raw["screenshot"])  # PNG is compressed already
+            if raw.get("console") is not None:
+                files["console.json.gz"] = gzip.compress(json.dumps(raw["console"], indent=1).encode())
+            dom = None
+            if raw.get("page_source") is not None:
+                source = raw["page_source"].encode("utf-8")
+                dom = (hashlib.sha256(source).hexdigest(), source)
+
+            manifest = {key: raw[key] for key in ("test_id", "url", "captured_at", "missing") if key in raw}
+            manifest["files"] = sorted(files)
+            written = deduplicated = 0
+            # One lock for writing and evicting, shared by every process writing to this directory
+            with FileLock(os.path.join(self.directory, ".lock")):
+                if dom is not None:
+                    blob = os.path.join(self.directory, DOM_DIR, f"{dom[0]}.html.gz")
+                    manifest["page_source"] = f"../{DOM_DIR}/{dom[0]}.html.gz"
+                    if os.path.exists(blob):
+                        deduplicated = 1
+                    else:
+                        written += self._write_file(blob, gzip.compress(dom[1]))
+                shutil.rmtree(path, ignore_errors=True)  # a rerun of the same test replaces its artifacts
+                for name, data in files.items():
+                    written += self._write_file(os.path.join(path, name), data)
+                written += self._write_file(os.path.join(path, "manifest.json"), json.dumps(manifest, indent=2).encode())
+                evicted = self._evict(keep=path)
+            self._count(write_seconds=time.perf_counter() - start, bytes_written=written,
+                        dom_deduplicated=deduplicated, evicted=evicted)
+            return path
+        except Exception as e:  # an artifact must never fail the run
+            self._count(errors=1, write_seconds=time.perf_counter() - start)
+            if self.logger:
+                self.logger.warning("⚠️ Could not write failure artifacts for %s: %s", raw["test_id"], e)
+            return None
+
+    @staticmethod
+    def _write_file(path, data):
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with open(path + ".tmp", "wb") as f:
+            f.write(data)
+        os.replace(path + ".tmp", path)
+        return len(data)
+
+    def _evict(self, keep):
+        # Removes the oldest tests' artifacts (and page sources no test refers to any more) until under max_bytes
+        tests = []
+        for entry in os.scandir(self.directory):
+            if entry.is_dir() and entry.name != DOM_DIR:
+                manifest = _manifest(entry.path)
+                tests.append((manifest.get("captured_at", 0), entry.path, _tree_size(entry.path),
+                              os.path.basename(manifest.get("page_source", ""))))
+        blobs = {entry.name: entry.stat().st_size for entry in _scan(os.path.join(self.directory, DOM_DIR))}
+        total = sum(test[2] for test in tests) + sum(blobs.values())
+        if total <= self.max_bytes:
+            return 0
+
+        evicted = 0
+        kept = []
+        for test in sorted(tests):
+            if total > self.max_bytes and test[1] != keep:
+                shutil.rmtree(test[1], ignore_errors=True)
+                total -= test[2]
+                evicted += 1
+            else:
+                kept.append(test)
+        referenced = {test[3] for test in kept}
+        for name in blobs:
+            if name not in referenced:
+                os.remove(os.path.join(self.directory, DOM_DIR, name))
+        if evicted and self.logger:
+            self.logger.info("Evicted the failure artifacts of %s test(s) to stay under %s bytes", evicted,
+                             self.max_bytes)
+        return evicted
+
+    def _count(self, **amounts):
+        with self._stats_lock:
+            for field, amount in amounts.items():
+                self.stats[field] += amount
+
+
+def _scan(directory):
+    return [entry for entry in os.scandir(directory) if entry.is_file()] if os.path.isdir(directory) else []
+
+
+def _tree_size(directory):
+    return sum(os.path.getsize(os.path.join(root, name)) for root, _, names in os.walk(directory) for name in names)
+
+
+def _manifest(path):
+    try:
+        with open(os.path.join(path, "manifest.json")) as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}  # written by a process that crashed half-way: oldest, so evicted first
+
+
+def load_stats(directory):
+    # Sums the artifact_stats.<worker>.json files every process wrote
+    totals = dict.fromkeys(STAT_FIELDS, 0)
+    for path in glob.glob(os.path.join(directory, "artifact_stats.*.json")):
+        with open(path) as f:
+            for field, amount in json.load(f).items():
+                totals[field] = totals.get(field, 0) + amount
+    return totals
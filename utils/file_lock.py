@@ -0,0 +1,57 @@
+import os
+import time
+
+
+class FileLock:
+    """Cross-process lock backed by a lock file created with O_EXCL, so it works across xdist workers."""
+
+    def __init__(self, path, timeout=30, stale_after=120, poll_interval=0.05):
+        self.path = path
+        self.timeout = timeout
+        self.stale_after = stale_after  # a lock older than this is assumed to belong to a crashed process
+        self.poll_interval = poll_interval
+        self._fd = None
+
+    def acquire(self):
+        deadline = time.monotonic() + self.timeout
+        directory = os.path.dirname(self.path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        while True:
+            try:
+                self._fd = os.open(self.path, os.O_CREAT | os.O_EXCL | os.O_WRONLY)
+                os.write(self._fd, str(os.getpid()).encode())
+                return
+            except FileExistsError:
+                self._break_if_stale()
+            if time.monotonic() >= deadline:
+                raise TimeoutError(f"Could not acquire lock {self.path} within {self.timeout}s")
+            time.sleep(self.poll_interval)
+
+    def release(self):
+        if self._fd is None:
+            return
+        os.close(self._fd)
+        self._fd = None
+        try:
+            os.remove(self.path)
+        except FileNotFoundError:
+            pass
+
+    def _break_if_stale(self):
+        try:
+            age = time.time() - os.path.getmtime(self.path)
+        except FileNotFoundError:
+            return
+        if age > self.stale_after:
+            try:
+                os.remove(self.path)
+            except FileNotFoundError:
+                pass
+
+    def __enter__(self):
+        self.acquire()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.release()
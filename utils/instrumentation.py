@@ -0,0 +1,156 @@
+import csv
+import functools
+import glob
+import json
+import math
+import os
+import threading
+import time
+from collections import namedtuple
+
+StepRecord = namedtuple("StepRecord", ["test_id", "page", "step", "locator", "duration", "wait", "act", "outcome"])
+
+
+def percentile(values, q):
+    # Nearest-rank percentile of a non-empty list
+    ordered = sorted(values)
+    rank = max(1, math.ceil(q / 100 * len(ordered)))
+    return ordered[rank - 1]
+
+
+class _OpenStep:
+    __slots__ = ("page", "step", "locator", "start", "wait")
+
+    def __init__(self, page, step, locator):
+        self.page = page
+        self.step = step
+        self.locator = locator
+        self.start = time.perf_counter()
+        self.wait = 0.0
+
+
+class StepRecorder:
+    """Collects the duration of BasePage primitives and page-object methods, split into waiting and acting."""
+
+    def __init__(self):
+        self.enabled = True
+        self.test_id = None
+        self.metadata = {}
+        self.records = []
+        self._local = threading.local()
+
+    def begin(self, page, step, locator=None):
+        stack = self._stack()
+        stack.append(_OpenStep(page, step, locator))
+
+    def end(self, outcome="passed"):
+        open_step = self._stack().pop()
+        duration = time.perf_counter() - open_step.start
+        wait = min(open_step.wait, duration)
+        self.records.append(StepRecord(self.test_id, open_step.page, open_step.step,
+                                       str(open_step.locator) if open_step.locator else "",
+                                       duration, wait, duration - wait, outcome))
+
+    def add_wait(self, seconds):
+        # A wait inside nested steps counts as waiting time for each of them
+        for open_step in self._stack():
+            open_step.wait += seconds
+
+    def current_step(self):
+        # The innermost step open on this thread, or None
+        stack = self._stack()
+        return stack[-1] if stack else None
+
+    def summary(self, records=None):
+        # p50/p95/max per page.step, slowest (by total time) first
+        grouped = {}
+        for record in self.records if records is None else records:
+            grouped.setdefault(f"{record.page}.{record.step}", []).append(record)
+
+        rows = []
+        for name, group in grouped.items():
+            durations = [r.duration for r in group]
+            rows.append({
+                "step": name,
+                "count": len(group),
+                "total": sum(durations),
+                "p50": percentile(durations, 50),
+                "p95": percentile(durations, 95),
+                "max": max(durations),
+                "wait_share": sum(r.wait for r in group) / sum(durations) if sum(durations) else 0.0,
+            })
+        return sorted(rows, key=lambda row: row["total"], reverse=True)
+
+    def write(self, path):
+        # Raw records of this process as JSON, for merging at the end of the run
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        with open(path, "w") as f:
+            json.dump({"metadata": self.metadata, "records": [r._asdict() for r in self.records]}, f)
+
+    def _stack(self):
+        stack = getattr(self._local, "stack", None)
+        if stack is None:
+            stack = self._local.stack = []
+        return stack
+
+
+recorder = StepRecorder()
+
+
+def _locator_arg(args):
+    if args and isinstance(args[0], tuple) and len(args[0]) == 2:
+        return args[0]
+    return None
+
+
+def timed_step(func):
+    # Records a page method call as a step named after the page class and method
+    @functools.wraps(func)
+    def wrapper(self, *args, **kwargs):
+        if not recorder.enabled:
+            return func(self, *args, **kwargs)
+        recorder.begin(type(self).__name__, func.__name__, _locator_arg(args))
+        outcome = "failed"
+        try:
+            result = func(self, *args, **kwargs)
+            outcome = "passed"
+            return result
+        finally:
+            recorder.end(outcome)
+
+    wrapper.__timed_step__ = True
+    return wrapper
+
+
+def instrument_page_class(cls):
+    # Wraps every public method defined on a page class
+    for name, attr in list(vars(cls).items()):
+        if name.startswith("_") or not callable(attr) or getattr(attr, "__timed_step__", False):
+            continue
+        if isinstance(attr, (staticmethod, classmethod)):
+            continue
+        setattr(cls, name, timed_step(attr))
+    return cls
+
+
+def load_records(report_dir):
+    # Records and metadata written by every process (xdist workers included) of the run
+    records, metadata = [], {}
+    for path in sorted(glob.glob(os.path.join(report_dir, "step_timings.*.json"))):
+        with open(path) as f:
+            data = json.load(f)
+        metadata.update(data.get("metadata", {}))
+        records += [StepRecord(**r) for r in data["records"]]
+    return records, metadata
+
+
+def write_reports(report_dir, records, metadata):
+    # Merged JSON (summary + raw records) and CSV (raw records) reports
+    summary = recorder.summary(records)
+    with open(os.path.join(report_dir, "step_timings.json"), "w") as f:
+        json.dump({"metadata": metadata, "summary": summary, "records": [r._asdict() for r in records]}, f, indent=2)
+    with open(os.path.join(report_dir, "step_timings.csv"), "w", newline="") as f:
+        writer = csv.writer(f)
+        writer.writerow(StepRecord._fields)
+        writer.writerows(records)
+    return summary
@@ -0,0 +1,82 @@
+from collections import namedtuple
+from selenium.webdriver.chrome.options import Options
+from utils.config_reader import ConfigReader
+
+PROFILE_PREFIX = "profile."
+PAGE_LOAD_STRATEGIES = ("normal", "eager", "none")
+
+LaunchProfile = namedtuple("LaunchProfile", ["name", "headless", "window", "page_load", "images", "animations",
+                                             "extensions", "args"])
+
+
+def parse_profile(name, spec):
+    # Parses a profile line such as "headless; window=1366x768; page_load=eager; images=off"
+    options = {}
+    for item in spec.split(";"):
+        key, sep, value = item.strip().partition("=")
+        if key:
+            options[key.strip()] = value.strip() if sep else "on"
+
+    unknown = set(options) - {"headless", "window", "page_load", "images", "animations", "extensions", "args"}
+    if unknown:
+        raise ValueError(f"Unknown option(s) {', '.join(sorted(unknown))} in launch profile '{name}'")
+
+    window = options.get("window", "maximized")
+    if window != "maximized":
+        width, sep, height = window.partition("x")
+        if not (sep and width.isdigit() and height.isdigit()):
+            raise ValueError(f"Launch profile '{name}': window must be 'maximized' or <W>x<H>, got '{window}'")
+        window = (int(width), int(height))
+
+    page_load = options.get("page_load", "normal")
+    if page_load not in PAGE_LOAD_STRATEGIES:
+        raise ValueError(f"Launch profile '{name}': page_load must be one of {', '.join(PAGE_LOAD_STRATEGIES)}")
+
+    return LaunchProfile(
+        name=name,
+        headless=options.get("headless", "off") != "off",
+        window=window,
+        page_load=page_load,
+        images=options.get("images", "on") != "off",
+        animations=options.get("animations", "on") != "off",
+        extensions=options.get("extensions", "on") != "off",
+        args=options.get("args", "").split(),
+    )
+
+
+def active_profile():
+    # The profile named by launch_profile (set by `pytest --profile`)
+    name = ConfigReader.get("launch_profile")
+    specs = ConfigReader.get_prefixed(PROFILE_PREFIX)
+    if name not in specs:
+        raise ValueError(f"Unknown launch profile '{name}', expected one of {', '.join(sorted(specs))}")
+    return parse_profile(name, specs[name])
+
+
+def chrome_options(profile):
+    # Chrome options implementing a launch profile
+    options = Options()
+    options.page_load_strategy = profile.page_load
+    if profile.headless:
+        options.add_argument("--headless=new")
+    if isinstance(profile.window, tuple):
+        options.add_argument(f"--window-size={profile.window[0]},{profile.window[1]}")
+    if not profile.images:
+        options.add_argument("--blink-settings=imagesEnabled=false")
+        options.add_experimental_option("prefs", {"profile.managed_default_content_settings.images": 2})
+    if not profile.animations:
+        options.add_argument("--force-prefers-reduced-motion")
+    if not profile.extensions:
+        options.add_argument("--disable-extensions")
+    for arg in profile.args:
+        options.add_argument(arg)
+    # Keep the console log readable through get_log("browser") for the failure artifacts
+    options.set_capability("goog:loggingPrefs", {"browser": "ALL"})
+    return options
+
+
+def describe(profile):
+    # Plain dict for reports, so timings of different profiles can be told apart
+    info = profile._asdict()
+    info["window"] = "x".join(map(str, profile.window)) if isinstance(profile.window, tuple) else profile.window
+    return info
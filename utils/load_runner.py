@@ -0,0 +1,273 @@
+import argparse
+import json
+import logging
+import os
+import random
+import threading
+import time
+from collections import namedtuple
+from concurrent.futures import ProcessPoolExecutor
+from utils.account_pool import default_account, new_account_credentials
+from utils.config_reader import ConfigReader
+from utils.instrumentation import percentile
+
+# One timed step of one scenario iteration; `start` is wall-clock time so samples from every process line up
+Sample = namedtuple("Sample", ["kind", "user", "scenario", "step", "start", "duration", "ok", "error"])
+
+SCENARIOS = ("signup", "login", "order")
+
+
+# Browser scenarios: the page-object flows the tests use. Each returns [(step name, callable)].
+
+def browser_steps(scenario, driver, logger):
+    from pages.cart_page import CartPage
+    from pages.login_page import LoginPage
+    from pages.order_page import OrderPage
+    from pages.product_page import ProductPage
+    from pages.signup_page import SignupPage
+    from utils.wait_engine import wait_engine_from_config
+
+    wait = wait_engine_from_config(driver, logger=logger)
+    if scenario == "signup":
+        page = SignupPage(driver, wait, wait, logger)
+        return [("open home", page.open_url), ("signup", page.signup_new_user)]
+    if scenario == "login":
+        page = LoginPage(driver, wait, wait, logger)
+        return [("open home", page.open_url), ("login", page.login_test_user)]
+
+    product_page = ProductPage(driver, wait, wait, logger)
+    cart_page = CartPage(driver, wait, wait, logger)
+    order_page = OrderPage(driver, wait, wait, logger)
+    monitor = ConfigReader.get_property("monitor_name")
+    order_data = {"name": "Load User", "country": "USA", "city": "New York", "card": "4111 1111 1111 1111",
+                  "month": "12", "year": "2025"}
+    return [
+        ("open home", product_page.open_url),
+        ("add phone", lambda: product_page.add_product(category="Phones", first=True)),
+        ("add laptop", lambda: product_page.add_product(category="Laptops", last=True)),
+        ("add monitor", lambda: product_page.add_product(category="Monitors", product_name=monitor)),
+        ("verify cart", cart_page.verify_cart),
+        ("place order", lambda: order_page.place_order(order_data)),
+    ]
+
+
+# HTTP scenarios: the requests the same flows send, without a browser.
+
+def http_steps(scenario, api, base_url):
+    def open_home():
+        response = api.session.get(base_url, timeout=api.timeout)
+        response.raise_for_status()
+
+    if scenario == "signup":
+        return [("open home", open_home), ("signup", lambda: api.signup(*new_account_credentials()))]
+    if scenario == "login":
+        account = default_account()
+        state = {}
+        return [
+            ("open home", open_home),
+            ("login", lambda: state.update(token=api.login(*account))),
+            ("check", lambda: api.check(state["token"])),
+        ]
+
+    cart = {"user": None}
+    monitor = ConfigReader.get_property("monitor_name")
+
+    def product_id(category, first=False, last=False, name=None):
+        products = api.by_category(category)
+        if name:
+            return next(p["id"] for p in products if p["title"] == name)
+        return products[0]["id"] if first else products[-1]["id"]
+
+    def add(category, **selection):
+        if cart["user"] is None:
+            cart["user"] = new_account_credentials().username  # an anonymous cart of our own
+        selected = product_id(category, **selection)
+        api.view(selected)
+        api.add_to_cart(selected, cart["user"], False)
+
+    def verify_cart():
+        items = api.view_cart(cart["user"], False)
+        if len(items) < 3:
+            raise AssertionError(f"Expected 3 cart items, got {len(items)}")
+
+    return [
+        ("open home", lambda: (open_home(), api.entries())),
+        ("add phone", lambda: add("phone", first=True)),
+        ("add laptop", lambda: add("notebook", last=True)),
+        ("add monitor", lambda: add("monitor", name=monitor)),
+        ("verify cart", verify_cart),
+        ("place order", lambda: api.delete_cart(cart["user"])),
+    ]
+
+
+def run_iterations(kind, user, scenario, make_steps, start_at, end_at, think_time, rng, after_iteration=None):
+    # Runs the scenario from start_at until end_at; a failed step ends its iteration
+    samples = []
+    time.sleep(max(0.0, start_at - time.time()))
+    while time.time() < end_at:
+        for step, action in make_steps():
+            started = time.time()
+            clock = time.perf_counter()
+            try:
+                action()
+                samples.append(Sample(kind, user, scenario, step, started, time.perf_counter() - clock, True, None))
+            except Exception as e:
+                samples.append(Sample(kind, user, scenario, step, started, time.perf_counter() - clock, False,
+                                      f"{type(e).__name__}: {e}"[:200]))
+                break
+            if think_time:
+                time.sleep(rng.uniform(0.5, 1.5) * think_time)
+            if time.time() >= end_at:
+                break
+        if after_iteration:
+            after_iteration()
+    return samples
+
+
+def browser_user(user, scenario, start_at, end_at, think_time, overrides):
+    # One browser-backed virtual user, run in a worker process of its own
+    from utils.browser_pool import create_driver, reset_session
+    from utils.instrumentation import recorder
+
+    ConfigReader.set_overrides(overrides)
+    recorder.enabled = False
+    logger = logging.getLogger(f"load.browser{user}")
+    logger.setLevel(logging.WARNING)
+
+    time.sleep(max(0.0, start_at - time.time()))
+    driver = create_driver(logger)
+    try:
+        return run_iterations("browser", user, scenario, lambda: browser_steps(scenario, driver, logger),
+                              time.time(), end_at, think_time, random.Random(user),
+                              after_iteration=lambda: reset_session(driver))
+    finally:
+        driver.quit()
+
+
+def http_user(user, scenario, start_at, end_at, think_time, results):
+    from utils.api_client import DemoblazeApi
+
+    api = DemoblazeApi(ConfigReader.get("api_url"), pool_size=2, timeout=ConfigReader.get("api_timeout"))
+    base_url = ConfigReader.get_property("base_url")
+    results.extend(run_iterations("http", user, scenario, lambda: http_steps(scenario, api, base_url),
+                                  start_at, end_at, think_time, random.Random(user)))
+
+
+def summarize(samples, duration):
+    # Throughput and latency percentiles per (kind, scenario, step)
+    groups = {}
+    for sample in samples:
+        groups.setdefault((sample.kind, sample.scenario, sample.step), []).append(sample)
+
+    steps = []
+    for (kind, scenario, step), group in sorted(groups.items()):
+        durations = [s.duration for s in group if s.ok]
+        row = {"kind": kind, "scenario": scenario, "step": step, "count": len(group),
+               "errors": len(group) - len(durations), "throughput": len(durations) / duration if duration else 0.0}
+        if durations:
+            row.update({"p50": percentile(durations, 50), "p95": percentile(durations, 95),
+                        "p99": percentile(durations, 99), "max": max(durations)})
+        steps.append(row)
+    return steps
+
+
+def run_load(scenario, browser_users, http_users, ramp_up, duration, think_time, logger=None):
+    # Starts every virtual user, spread evenly over ramp_up seconds, and stops them duration seconds after the first
+    users = browser_users + http_users
+    start = time.time() + 1.0
+    end_at = start + ramp_up + duration
+    offsets = [start + ramp_up * i / users for i in range(users)] if users else []
+    overrides = dict(ConfigReader.config().overrides)
+
+    samples, threads, futures = [], [], []
+    pool = ProcessPoolExecutor(max_workers=browser_users) if browser_users else None
+    try:
+        for user in range(browser_users):
+            futures.append(pool.submit(browser_user, user, scenario, offsets[user], end_at, think_time, overrides))
+        for user in range(browser_users, users):
+            thread = threading.Thread(target=http_user, name=f"http-user-{user}",
+                                      args=(user, scenario, offsets[user], end_at, think_time, samples))
+            thread.start()
+            threads.append(thread)
+        for thread in threads:
+            thread.join()
+        for future in futures:
+            try:
+                samples.extend(future.result())
+            except Exception as e:
+                if logger:
+                    logger.error("❌ Browser user failed to run: %s", e)
+    finally:
+        if pool is not None:
+            pool.shutdown()
+
+    elapsed = max(s.start + s.duration for s in samples) - start if samples else 0.0
+    return {
+        "scenario": scenario,
+        "base_url": ConfigReader.get_property("base_url"),
+        "browser_users": browser_users,
+        "http_users": http_users,
+        "ramp_up": ramp_up,
+        "duration": duration,
+        "think_time": think_time,
+        "elapsed": elapsed,
+        "steps": summarize(samples, elapsed),
+    }
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Run the page-object flows as concurrent virtual users.")
+    parser.add_argument("scenario", choices=SCENARIOS)
+    parser.add_argument("--browser-users", type=int, default=ConfigReader.get("load_browser_users"))
+    parser.add_argument("--http-users", type=int, default=ConfigReader.get("load_http_users"))
+    parser.add_argument("--ramp-up", type=float, default=ConfigReader.get("load_ramp_up"),
+                        help="seconds over which the users are started")
+    parser.add_argument("--duration", type=float, default=ConfigReader.get("load_duration"),
+                        help="seconds every user keeps running after the ramp-up")
+    parser.add_argument("--think-time", type=float, default=ConfigReader.get("load_think_time"),
+                        help="mean pause between steps, in seconds")
+    parser.add_argument("--base-url", help="storefront to load (default: base_url from config)")
+    parser.add_argument("--api-url", help="backend of that storefront (default: api_url from config)")
+    parser.add_argument("--local-server", action="store_true", help="load the bundled local stand-in instead")
+    parser.add_argument("--output", default=ConfigReader.get_path("load_report"), help="JSON report path")
+    args = parser.parse_args(argv)
+
+    overrides = {}
+    if args.base_url:
+        overrides["base_url"] = args.base_url
+    if args.api_url:
+        overrides["api_url"] = args.api_url
+    server = None
+    if args.local_server:
+        from local_site.server import server_from_config
+
+        server = server_from_config().start()
+        overrides.update({"base_url": server.url, "api_url": server.url})
+    if overrides:
+        ConfigReader.update_overrides(overrides)
+
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s - %(levelname)s - %(message)s")
+    logger = logging.getLogger("load")
+    logger.info("Running '%s' against %s: %s browser + %s HTTP user(s), ramp-up %ss, duration %ss", args.scenario,
+                ConfigReader.get_property("base_url"), args.browser_users, args.http_users, args.ramp_up,
+                args.duration)
+    try:
+        report = run_load(args.scenario, args.browser_users, args.http_users, args.ramp_up, args.duration,
+                          args.think_time, logger)
+    finally:
+        if server is not None:
+            server.stop()
+
+    os.makedirs(os.path.dirname(args.output) or ".", exist_ok=True)
+    with open(args.output, "w") as f:
+        json.dump(report, f, indent=2)
+    for row in report["steps"]:
+        latency = (f"p50 {row['p50']:.3f}s p95 {row['p95']:.3f}s p99 {row['p99']:.3f}s" if "p50" in row
+                   else "no successful samples")
+        print(f"{row['kind']:<8} {row['step']:<12} {row['count']:>5} req {row['errors']:>4} err "
+              f"{row['throughput']:>7.2f}/s  {latency}")
+    print(f"Report written to {args.output}")
+
+
+if __name__ == "__main__":
+    main()
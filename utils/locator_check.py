@@ -0,0 +1,226 @@
+import argparse
+import logging
+import os
+import string
+import sys
+import time
+from collections import namedtuple
+from selenium.webdriver.common.by import By
+from utils.config_reader import ConfigReader
+from utils.locators import InvalidLocator, STRATEGIES, validate
+
+try:
+    import lxml.html
+    from lxml.cssselect import CSSSelector
+except ImportError:  # optional: only the offline checker needs them (pip install lxml cssselect)
+    lxml = None
+
+# Page states captured by --refresh, in the order the flow reaches them
+STATES = ("home", "product", "cart", "confirmation")
+
+# States in which each page object's locators must be found
+PAGE_STATES = {
+    "LoginPage": ("home",),
+    "SignupPage": ("home",),
+    "ProductPage": ("home", "product"),
+    "CartPage": ("cart",),
+    "OrderPage": ("cart", "confirmation"),
+}
+
+# Locators meant to match a list of elements; every other locator must match exactly one
+COLLECTIONS = {"ProductPage.products", "CartPage.cart_items"}
+
+# Where --refresh captures the snapshots from unless --local-server is given: the real site, whatever base_url
+# the environment points at
+LIVE_SITE = {"base_url": "https://demoblaze.com", "api_url": "https://api.demoblaze.com"}
+
+# Values substituted into locator templates such as ProductPage.category_link
+TEMPLATE_VALUES = {"category": ("Phones", "Laptops", "Monitors")}
+
+# XPath equivalents of the non-XPath strategies, with the locator value bound to $value
+STRATEGY_XPATH = {
+    By.ID: "//*[@id=$value]",
+    By.NAME: "//*[@name=$value]",
+    By.TAG_NAME: "//*[local-name()=$value]",
+    By.CLASS_NAME: "//*[contains(concat(' ', normalize-space(@class), ' '), concat(' ', $value, ' '))]",
+    By.LINK_TEXT: "//a[normalize-space(string(.))=$value]",
+    By.PARTIAL_LINK_TEXT: "//a[contains(string(.), $value)]",
+}
+
+Problem = namedtuple("Problem", ["name", "locator", "kind", "detail"])
+
+
+def page_classes():
+    from pages.cart_page import CartPage
+    from pages.login_page import LoginPage
+    from pages.order_page import OrderPage
+    from pages.product_page import ProductPage
+    from pages.signup_page import SignupPage
+
+    return [LoginPage, SignupPage, ProductPage, CartPage, OrderPage]
+
+
+def collect_locators(classes=None):
+    # [(name, page class name, locator)] for every locator a page object defines in __init__: (by, value) tuples,
+    # dicts of them (OrderPage.fields) and XPath templates expanded with TEMPLATE_VALUES (ProductPage.category_link)
+    logger = logging.getLogger("locator_check")
+    found = []
+    for cls in classes or page_classes():
+        page = cls(None, None, None, logger)  # constructors only store their arguments and define locators
+        for attribute, value in vars(page).items():
+            for suffix, locator in _locators_in(value):
+                found.append((f"{cls.__name__}.{attribute}{suffix}", cls.__name__, locator))
+    return found
+
+
+def _locators_in(value):
+    if isinstance(value, tuple) and len(value) == 2 and value[0] in STRATEGIES:
+        yield "", value
+    elif isinstance(value, dict):
+        for key, item in value.items():
+            for suffix, locator in _locators_in(item):
+                yield f"[{key}]{suffix}", locator
+    elif isinstance(value, str) and "{" in value:
+        fields = [field for _, field, _, _ in string.Formatter().parse(value) if field]
+        if len(fields) == 1 and fields[0] in TEMPLATE_VALUES:
+            for item in TEMPLATE_VALUES[fields[0]]:
+                yield f"[{item}]", (By.XPATH, value.format(**{fields[0]: item}))
+
+
+def load_snapshots(directory):
+    # {state: parsed document} for every stored snapshot
+    if lxml is None:
+        raise RuntimeError("The locator checker needs lxml and cssselect: pip install lxml cssselect")
+    documents = {}
+    for state in STATES:
+        path = os.path.join(directory, f"{state}.html")
+        if os.path.exists(path):
+            with open(path, "rb") as f:
+                documents[state] = lxml.html.document_fromstring(f.read())
+    return documents
+
+
+def count_matches(document, locator):
+    # Number of elements the locator matches in a parsed document
+    by, value = locator
+    if by == By.XPATH:
+        return len(document.xpath(value))
+    if by == By.CSS_SELECTOR:
+        return len(CSSSelector(value)(document))
+    return len(document.xpath(STRATEGY_XPATH[by], value=value))
+
+
+def check_locators(locators, documents):
+    # Problems of every locator in the states of its page: invalid, missing or ambiguous
+    problems = []
+    for name, page, locator in locators:
+        states = [state for state in PAGE_STATES.get(page, STATES) if state in documents]
+        if not states:
+            problems.append(Problem(name, locator, "no snapshot", f"needs one of: {', '.join(PAGE_STATES[page])}"))
+            continue
+        try:
+            validate(locator)
+            counts = {state: count_matches(documents[state], locator) for state in states}
+        except InvalidLocator as e:
+            problems.append(Problem(name, locator, "invalid", str(e)))
+            continue
+        except Exception as e:  # an expression lxml/cssselect cannot evaluate
+            problems.append(Problem(name, locator, "unsupported", f"{type(e).__name__}: {e}"))
+            continue
+
+        if not any(counts.values()):
+            problems.append(Problem(name, locator, "missing", f"no match in {', '.join(states)}"))
+        elif name not in COLLECTIONS and max(counts.values()) > 1:
+            where = ", ".join(f"{count} in {state}" for state, count in counts.items() if count > 1)
+            problems.append(Problem(name, locator, "ambiguous", f"{where} (expected one)"))
+    return problems
+
+
+def refresh_snapshots(directory, logger):
+    # Walks a real browser through the page states and saves each rendered DOM as <state>.html
+    from pages.cart_page import CartPage
+    from pages.order_page import OrderPage
+    from pages.product_page import ProductPage
+    from selenium.webdriver.support import expected_conditions as EC
+    from utils.browser_pool import create_driver
+    from utils.wait_engine import wait_engine_from_config
+
+    os.makedirs(directory, exist_ok=True)
+    driver = create_driver(logger)
+
+    def save(state):
+        # The header records where and with what the snapshot was captured
+        browser = f"{driver.capabilities.get('browserName', '?')} {driver.capabilities.get('browserVersion', '?')}"
+        with open(os.path.join(directory, f"{state}.html"), "w", encoding="utf-8") as f:
+            f.write(f"<!-- {state}: {driver.current_url}\n     Captured from {ConfigReader.get('base_url')} with "
+                    f"{browser} on {time.strftime('%Y-%m-%d')} by python -m utils.locator_check --refresh -->\n"
+                    f"{driver.page_source}")
+        logger.info("Saved snapshot '%s' of %s", state, driver.current_url)
+
+    try:
+        wait = wait_engine_from_config(driver, logger=logger)
+        product_page = ProductPage(driver, wait, wait, logger)
+        cart_page = CartPage(driver, wait, wait, logger)
+        order_page = OrderPage(driver, wait, wait, logger)
+
+        product_page.open_url()
+        wait.until(EC.presence_of_element_located(product_page.products))
+        save("home")
+        product_page.browse_to_product("Phones", first=True)
+        wait.until(EC.presence_of_element_located(product_page.add_to_cart_button))
+        save("product")
+        product_page.add_to_cart_and_accept()
+        cart_page.navigate_to_cart()
+        save("cart")
+        order_page.open_order_modal()
+        order_page.fill_order_details({"name": "Snapshot", "country": "USA", "city": "New York",
+                                       "card": "4111 1111 1111 1111", "month": "12", "year": "2025"})
+        order_page.submit_order()
+        wait.until(EC.visibility_of_element_located(order_page.confirmation_text))
+        save("confirmation")
+    finally:
+        driver.quit()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Check the page-object locators against stored DOM snapshots.")
+    parser.add_argument("--refresh", action="store_true",
+                        help=f"capture new snapshots from {LIVE_SITE['base_url']} with a real browser first")
+    parser.add_argument("--local-server", action="store_true",
+                        help="capture them from the bundled local stand-in instead")
+    parser.add_argument("--snapshots", default=ConfigReader.get_path("locator_snapshot_dir"),
+                        help="snapshot directory (default: locator_snapshot_dir from config)")
+    args = parser.parse_args(argv)
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s - %(levelname)s - %(message)s")
+    logger = logging.getLogger("locator_check")
+
+    if args.refresh:
+        server = None
+        if args.local_server:
+            from local_site.server import server_from_config
+
+            server = server_from_config().start()
+            ConfigReader.update_overrides({"base_url": server.url, "api_url": server.url})
+        else:
+            ConfigReader.update_overrides(LIVE_SITE)
+        try:
+            refresh_snapshots(args.snapshots, logger)
+        finally:
+            if server is not None:
+                server.stop()
+
+    locators = collect_locators()
+    start = time.perf_counter()
+    documents = load_snapshots(args.snapshots)
+    problems = check_locators(locators, documents)
+    elapsed_ms = (time.perf_counter() - start) * 1000
+
+    for problem in problems:
+        print(f"❌ {problem.name} {problem.locator}: {problem.kind} - {problem.detail}")
+    print(f"Checked {len(locators)} locator(s) against {len(documents)} snapshot(s) "
+          f"({', '.join(documents) or 'none'}) in {elapsed_ms:.0f} ms: {len(problems)} problem(s)")
+    return 1 if problems else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
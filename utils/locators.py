@@ -0,0 +1,104 @@
+import functools
+import re
+import threading
+from selenium.webdriver.common.by import By
+
+STRATEGIES = {By.ID, By.NAME, By.CLASS_NAME, By.TAG_NAME, By.CSS_SELECTOR, By.LINK_TEXT, By.PARTIAL_LINK_TEXT,
+              By.XPATH}
+
+
+class InvalidLocator(ValueError):
+    # A locator that can never match: unknown strategy, empty value or malformed expression
+    pass
+
+
+def validate(locator):
+    if not (isinstance(locator, tuple) and len(locator) == 2):
+        raise InvalidLocator(f"Locator must be a (by, value) tuple, got {locator!r}")
+    by, value = locator
+    if by not in STRATEGIES:
+        raise InvalidLocator(f"Unknown locator strategy '{by}' in {locator!r}")
+    if not isinstance(value, str) or not value.strip():
+        raise InvalidLocator(f"Empty locator value in {locator!r}")
+    if by == By.CLASS_NAME and re.search(r"\s", value):
+        raise InvalidLocator(f"Class name cannot contain spaces, use a CSS selector instead: {locator!r}")
+    if by in (By.XPATH, By.CSS_SELECTOR) and not _balanced(value):
+        raise InvalidLocator(f"Unbalanced brackets or quotes in {locator!r}")
+
+
+@functools.lru_cache(maxsize=1024)
+def check_locator(locator):
+    # Validates a locator once per process and returns it unchanged, so page objects can call it on every lookup
+    validate(locator)
+    return locator
+
+
+def _balanced(expression):
+    depth = {"[": 0, "(": 0}
+    closing = {"]": "[", ")": "("}
+    quote = None
+    for char in expression:
+        if quote:
+            if char == quote:
+                quote = None
+        elif char in "'\"":
+            quote = char
+        elif char in depth:
+            depth[char] += 1
+        elif char in closing:
+            depth[closing[char]] -= 1
+            if depth[closing[char]] < 0:
+                return False
+    return quote is None and not any(depth.values())
+
+
+class CacheStats:
+    # Process-wide element cache counters, shown in the terminal summary
+
+    def __init__(self):
+        self.hits = 0
+        self.misses = 0
+        self.stale = 0
+        self._lock = threading.Lock()
+
+    def count(self, field):
+        with self._lock:
+            setattr(self, field, getattr(self, field) + 1)
+
+    def as_dict(self):
+        return {"hits": self.hits, "misses": self.misses, "stale": self.stale}
+
+
+cache_stats = CacheStats()
+
+
+class ElementCache:
+    """WebElements a page object has already resolved, keyed by locator.
+
+    Entries are dropped on navigation (clear()) and when an element turns out to be stale.
+    """
+
+    def __init__(self):
+        self._elements = {}
+        self.hits = 0
+        self.misses = 0
+        self.stale = 0
+
+    def get(self, locator):
+        element = self._elements.get(locator)
+        self._count("hits" if element is not None else "misses")
+        return element
+
+    def put(self, locator, element):
+        self._elements[locator] = element
+
+    def invalidate(self, locator):
+        if self._elements.pop(locator, None) is not None:
+            self._count("stale")
+
+    def clear(self):
+        self._elements.clear()
+
+    def _count(self, field):
+        setattr(self, field, getattr(self, field) + 1)
+        cache_stats.count(field)
@@ -0,0 +1,152 @@
+import glob
+import heapq
+import json
+import logging
+import os
+import queue
+import time
+from logging.handlers import QueueHandler, QueueListener
+from utils.instrumentation import recorder
+
+# Message arguments that cannot change after the call, so formatting them can wait for the listener thread
+DEFERRABLE = (str, int, float, bool, type(None), bytes)
+
+WORKER_LOG_PATTERN = "worker-*.jsonl"
+MERGED_LOG = "test_logs.jsonl"
+
+# Running listeners by logger name; each owns its handlers and its worker file
+_listeners = {}
+
+
+class ContextFilter(logging.Filter):
+    # Tags a record, on the thread that logged it, with the worker, the running test and the open page step
+
+    def __init__(self, worker_id):
+        super().__init__()
+        self.worker_id = worker_id
+
+    def filter(self, record):
+        record.worker = self.worker_id
+        record.test_id = recorder.test_id
+        step = recorder.current_step()
+        record.step = f"{step.page}.{step.step}" if step else None
+        record.step_elapsed = round(time.perf_counter() - step.start, 3) if step else None
+        return True
+
+
+class DeferredQueueHandler(QueueHandler):
+    """Hands records to the listener thread unformatted.
+
+    The stock QueueHandler formats the message on the calling thread so the record can be pickled; this queue
+    never leaves the process, so the %-formatting (and any traceback) is left to the listener thread instead.
+    Only immutable arguments can wait, though: a list or an element could change (or a WebElement property
+    be read on the wrong thread) before the listener gets to them, so those messages are formatted right away.
+    """
+
+    def prepare(self, record):
+        if record.args and not all(_deferrable(arg) for arg in _arguments(record.args)):
+            record.msg = record.getMessage()
+            record.args = None
+        return record
+
+
+def _arguments(args):
+    return args.values() if isinstance(args, dict) else args
+
+
+def _deferrable(arg):
+    # Immutable all the way down, e.g. a (by, value) locator
+    if isinstance(arg, tuple):
+        return all(_deferrable(item) for item in arg)
+    return isinstance(arg, DEFERRABLE)
+
+
+class JsonLinesFormatter(logging.Formatter):
+    # One JSON object per line: ts, level, worker, test, step, step_elapsed, logger, message (+ exc)
+
+    def format(self, record):
+        entry = {
+            "ts": round(record.created, 6),
+            "level": record.levelname,
+            "worker": getattr(record, "worker", None),
+            "test": getattr(record, "test_id", None),
+            "step": getattr(record, "step", None),
+            "step_elapsed": getattr(record, "step_elapsed", None),
+            "logger": record.name,
+            "message": record.getMessage(),
+        }
+        if record.exc_info:
+            entry["exc"] = self.formatException(record.exc_info)
+        return json.dumps(entry, ensure_ascii=False)
+
+
+def worker_log_path(directory, worker_id):
+    return os.path.join(directory, f"worker-{worker_id}.jsonl")
+
+
+def start_logging(name, worker_id, directory, level=logging.INFO):
+    # Routes a logger through a queue: the caller only enqueues records, a listener thread writes the
+    # worker's JSON-lines file and the console. Idempotent: a logger that already has handlers is returned as is.
+    logger = logging.getLogger(name)
+    if logger.handlers:
+        return logger
+    logger.setLevel(level)
+
+    os.makedirs(directory, exist_ok=True)
+    file_handler = logging.FileHandler(worker_log_path(directory, worker_id), mode="w", encoding="utf-8")
+    file_handler.setLevel(logging.DEBUG)
+    file_handler.setFormatter(JsonLinesFormatter())
+
+    console_handler = logging.StreamHandler()
+    console_handler.setLevel(logging.INFO)
+    console_handler.setFormatter(logging.Formatter(f"%(asctime)s - [{worker_id}] - %(levelname)s - %(message)s"))
+
+    records = queue.SimpleQueue()
+    queue_handler = DeferredQueueHandler(records)
+    queue_handler.addFilter(ContextFilter(worker_id))
+    listener = QueueListener(records, file_handler, console_handler, respect_handler_level=True)
+    listener.start()
+    logger.addHandler(queue_handler)
+    _listeners[name] = listener
+    return logger
+
+
+def stop_logging(name):
+    # Drains the queue and closes the worker file. Anything logged afterwards goes to the console directly.
+    listener = _listeners.pop(name, None)
+    if listener is None:
+        return
+    listener.stop()
+    logger = logging.getLogger(name)
+    for handler in list(logger.handlers):
+        if isinstance(handler, DeferredQueueHandler):
+            logger.removeHandler(handler)
+    for handler in listener.handlers:
+        if isinstance(handler, logging.FileHandler):
+            handler.close()
+        else:
+            logger.addHandler(handler)
+
+
+def merge_worker_logs(directory):
+    # Merges the worker files (each already in time order) into one file ordered by timestamp; returns its path
+    paths = sorted(glob.glob(os.path.join(directory, WORKER_LOG_PATTERN)))
+    if not paths:
+        return None
+    files = [open(path, encoding="utf-8") for path in paths]
+    merged = os.path.join(directory, MERGED_LOG)
+    try:
+        streams = [((json.loads(line)["ts"], line) for line in f if line.strip()) for f in files]
+        with open(merged, "w", encoding="utf-8") as out:
+            for _, line in heapq.merge(*streams, key=lambda item: item[0]):
+                out.write(line if line.endswith("\n") else line + "\n")
+    finally:
+        for f in files:
+            f.close()
+    return merged
+
+
+def remove_worker_logs(directory):
+    # Worker files of an earlier run (possibly with more workers) must not end up in this run's merge
+    for path in glob.glob(os.path.join(directory, WORKER_LOG_PATTERN)):
+        os.remove(path)
@@ -0,0 +1,17 @@
+from selenium.common.exceptions import WebDriverException
+from utils.dom_scripts import NETWORK_MONITOR
+
+
+def install_network_monitor(driver):
+    # Registers the fetch/XHR counter for every document the session loads; returns False without CDP support
+    try:
+        driver.execute_cdp_cmd("Page.addScriptToEvaluateOnNewDocument", {"source": NETWORK_MONITOR})
+        return True
+    except (AttributeError, WebDriverException):
+        return False
+
+
+def inject_network_monitor(driver):
+    # Fallback for drivers without CDP: installs the counter into the current document only.
+    # Requests that started before this call are not seen.
+    driver.execute_script(NETWORK_MONITOR)
@@ -0,0 +1,135 @@
+import csv
+import importlib
+import json
+from collections import namedtuple
+from functools import lru_cache
+from utils.config_reader import ConfigReader
+
+ORDER_FIELDS = ("name", "country", "city", "card", "month", "year")
+OUTCOMES = ("confirmed", "rejected")
+
+# One row of an order dataset: the form values, the products the cart must hold, and how the site should answer
+OrderRecord = namedtuple("OrderRecord", ["id", "order", "cart", "expect"])
+
+# What a test is parametrized with: enough to group and name it, and where to read the full record later
+RecordRef = namedtuple("RecordRef", ["source", "position", "id", "cart", "expect"])
+
+
+def source_kind(spec):
+    if spec.endswith(".csv"):
+        return "csv"
+    if spec.endswith(".jsonl"):
+        return "jsonl"
+    if ":" in spec:
+        return "generator"
+    raise ValueError(f"Order dataset '{spec}' is neither a .csv/.jsonl file nor a module:function generator")
+
+
+@lru_cache(maxsize=None)
+def record_source(spec):
+    # One RecordSource per dataset and process, so a generator's cursor survives from one record to the next
+    return RecordSource(spec)
+
+
+def configured_source():
+    # The source named by order_dataset; file paths are relative to the project root
+    spec = ConfigReader.get("order_dataset")
+    return record_source(spec if source_kind(spec) == "generator" else ConfigReader.get_path("order_dataset"))
+
+
+def parse_record(raw, index):
+    # Validates a raw row (CSV strings or JSON values). The cart is "a|b|c" in CSV or a list in JSON.
+    cart = raw.get("cart") or ()
+    if isinstance(cart, str):
+        cart = [item.strip() for item in cart.split("|") if item.strip()]
+    expect = (raw.get("expect") or "confirmed").strip()
+    if expect not in OUTCOMES:
+        raise ValueError(f"Order record {index}: expect must be one of {', '.join(OUTCOMES)}, got '{expect}'")
+    order = {field: "" if raw.get(field) is None else str(raw[field]) for field in ORDER_FIELDS}
+    return OrderRecord(str(raw.get("id") or f"record{index}"), order, tuple(cart), expect)
+
+
+class RecordSource:
+    """Streams order records from a CSV or JSONL file, or from a generator function given as "module:function".
+
+    Files are read one line at a time (CSV records must fit on one line); scan() remembers each record's byte
+    offset so load() can seek straight back to it. Generators are replayed up to the requested record, resuming
+    from the last position when records are loaded in order.
+    """
+
+    def __init__(self, spec):
+        source_kind(spec)
+        self.spec = spec
+        self._cursor = None  # generator sources: (next index, iterator)
+
+    @property
+    def kind(self):
+        return source_kind(self.spec)
+
+    def scan(self):
+        # Yields (position, raw record) for every record, holding one line in memory at a time
+        if self.kind == "generator":
+            yield from enumerate(self._generate())
+            return
+        with open(self.spec, newline="", encoding="utf-8") as f:
+            header = next(csv.reader([f.readline()])) if self.kind == "csv" else None
+            while True:
+                position = f.tell()
+                line = f.readline()
+                if not line:
+                    return
+                if line.strip():
+                    yield position, self._parse_line(line, header)
+
+    def load(self, position):
+        # The raw record scan() reported at position
+        if self.kind == "generator":
+            index, iterator = self._cursor if self._cursor and self._cursor[0] <= position else (0, self._generate())
+            for index in range(index, position):
+                next(iterator)
+            self._cursor = (position + 1, iterator)
+            return next(iterator)
+        with open(self.spec, newline="", encoding="utf-8") as f:
+            header = next(csv.reader([f.readline()])) if self.kind == "csv" else None
+            f.seek(position)
+            return self._parse_line(f.readline(), header)
+
+    def refs(self):
+        # RecordRefs of every record, same-cart records next to each other so their setup can be shared;
+        # within a cart, rejected orders (which leave the cart as it was) come before confirmed ones
+        refs = []
+        for index, (position, raw) in enumerate(self.scan()):
+            record = parse_record(raw, index)
+            refs.append(RecordRef(self.spec, position, record.id, record.cart, record.expect))
+        return sorted(refs, key=lambda ref: (sorted(ref.cart), ref.expect != "rejected"))
+
+    def record(self, ref):
+        # The full OrderRecord behind a ref (already validated by refs(), so it keeps the ref's id)
+        return parse_record(self.load(ref.position), ref.position)._replace(id=ref.id)
+
+    def _generate(self):
+        module, _, function = self.spec.partition(":")
+        return iter(getattr(importlib.import_module(module), function)())
+
+    @staticmethod
+    def _parse_line(line, header):
+        if header is None:
+            return json.loads(line)
+        return dict(zip(header, next(csv.reader([line]))))
+
+
+def generated_orders(count=20):
+    # Example generator source (order_dataset = utils.order_data:generated_orders): synthetic valid orders
+    carts = (["Samsung galaxy s6"], ["Sony vaio i5", "Apple monitor 24"])
+    for n in range(count):
+        yield {"id": f"generated-{n}", "name": f"Buyer {n}", "country": "USA", "city": "Austin",
+               "card": f"4111 1111 1111 {n:04d}", "month": str(n % 12 + 1), "year": "2027", "cart": carts[n % 2]}
+
+
+class CheckoutSession:
+    # The browser shared by the records of a checkout matrix, and the cart it currently holds (None = unknown)
+
+    def __init__(self, driver):
+        self.driver = driver
+        self.cart = None
+        self.failed = False
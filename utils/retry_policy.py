@@ -0,0 +1,183 @@
+import functools
+import random
+import threading
+import time
+from collections import namedtuple
+from utils.config_reader import ConfigReader
+
+POLICY_PREFIX = "retry."
+LEVELS = ("element", "flow", "any")
+
+# How one exception class is retried: up to `attempts` tries in total, sleeping delay * backoff ** (retry - 1)
+# seconds (at most max_delay, shortened by up to `jitter` of itself) before each retry.
+# level: "element" = BasePage primitives, "flow" = page methods marked @retryable, "any" = both
+RetryPolicy = namedtuple("RetryPolicy", ["attempts", "delay", "max_delay", "backoff", "jitter", "level"])
+
+# Set on an exception once a step has given up on it, so the steps around it do not retry it again
+EXHAUSTED = "_retries_exhausted"
+
+
+def parse_policy(name, spec):
+    # Parses a policy line such as "attempts=3; delay=0.05; max_delay=0.5; level=element"
+    options = {}
+    for item in spec.split(";"):
+        key, sep, value = item.strip().partition("=")
+        if key:
+            if not sep:
+                raise ValueError(f"Retry policy '{name}': expected key=value, got '{item.strip()}'")
+            options[key.strip()] = value.strip()
+
+    unknown = set(options) - set(RetryPolicy._fields)
+    if unknown:
+        raise ValueError(f"Unknown option(s) {', '.join(sorted(unknown))} in retry policy '{name}'")
+    try:
+        policy = RetryPolicy(
+            attempts=int(options.get("attempts", 3)),
+            delay=float(options.get("delay", 0.1)),
+            max_delay=float(options.get("max_delay", 2)),
+            backoff=float(options.get("backoff", 2)),
+            jitter=float(options.get("jitter", 0.5)),
+            level=options.get("level", "any"),
+        )
+    except ValueError as e:
+        raise ValueError(f"Retry policy '{name}': {e}") from None
+    if policy.attempts < 1 or min(policy.delay, policy.max_delay) < 0 or policy.backoff < 1:
+        raise ValueError(f"Retry policy '{name}': attempts must be >= 1, delays >= 0 and backoff >= 1")
+    if not 0 <= policy.jitter <= 1:
+        raise ValueError(f"Retry policy '{name}': jitter must be between 0 and 1")
+    if policy.level not in LEVELS:
+        raise ValueError(f"Retry policy '{name}': level must be one of {', '.join(LEVELS)}")
+    return policy
+
+
+def load_policies():
+    # {exception class name (lower case): RetryPolicy} from the retry.* lines of config.properties
+    return {name.lower(): parse_policy(name, spec) for name, spec in ConfigReader.get_prefixed(POLICY_PREFIX).items()}
+
+
+class RetryEngine:
+    """Retries steps that failed with a transient exception, as configured per exception class.
+
+    Steps nest (a page method calls click() which calls find_element()); the innermost step with a policy for an
+    exception retries it, and once it gives up the steps around it let the exception through instead of
+    multiplying the attempts. All retrying in one test, backoff sleeps included, draws from one time budget.
+    """
+
+    def __init__(self, policies=None, budget=None, sleep=time.sleep, rng=None):
+        self._policies = policies  # loaded from config on first use when None
+        self.budget = budget  # seconds of retrying allowed per test; None is unlimited
+        self.spent = 0.0
+        self.stats = {}  # {step: {"retries": n, "recovered": n, "gave_up": n}}
+        self._sleep = sleep
+        self._rng = rng or random.Random()
+        self._local = threading.local()
+
+    @property
+    def policies(self):
+        if self._policies is None:
+            self._policies = load_policies()
+        return self._policies
+
+    def begin(self, budget=None):
+        # Starts a test: a fresh budget and fresh counters (a new dict, the previous one may still be referenced)
+        self.budget = budget
+        self.spent = 0.0
+        self.stats = {}
+
+    def remaining(self):
+        return float("inf") if self.budget is None else max(0.0, self.budget - self.spent)
+
+    def policy_for(self, error, level):
+        # The policy of the most specific class of error that applies at this level, or None
+        for cls in type(error).__mro__:
+            policy = self.policies.get(cls.__name__.lower())
+            if policy is not None and policy.level in (level, "any"):
+                return policy
+        return None
+
+    def backoff(self, policy, retry):
+        # Delay before the given retry (1 = first): exponential, capped, with jitter
+        delay = min(policy.max_delay, policy.delay * policy.backoff ** (retry - 1))
+        return delay * (1 - policy.jitter * self._rng.random())
+
+    def call(self, step, func, args=(), kwargs=None, level="flow", on_retry=None, attempts=None, delay=None,
+             logger=None, exclude=()):
+        # Runs func(*args, **kwargs), retrying it per policy; attempts/delay override the policy's for this call,
+        # and exceptions in `exclude` are never retried by it
+        kwargs = kwargs or {}
+        retries = 0
+        while True:
+            try:
+                result = func(*args, **kwargs) if not retries else self._charged(func, *args, **kwargs)
+            except Exception as error:
+                policy = None if isinstance(error, exclude) else self.policy_for(error, level)
+                if policy is None or getattr(error, EXHAUSTED, False):
+                    raise
+                if attempts is not None or delay is not None:
+                    policy = policy._replace(attempts=policy.attempts if attempts is None else attempts,
+                                             delay=policy.delay if delay is None else delay)
+                wait = self.backoff(policy, retries + 1)
+                reason = self._give_up_reason(policy, retries, wait)
+                if reason:
+                    setattr(error, EXHAUSTED, True)
+                    if retries:
+                        self._count(step, "gave_up")
+                        if logger:
+                            logger.warning("⚠️ %s: giving up on %s %s", step, type(error).__name__, reason)
+                    raise
+
+                retries += 1
+                self._count(step, "retries")
+                if logger:
+                    logger.warning("⚠️ %s: %s, retry %d/%d in %.2fs", step, type(error).__name__, retries,
+                                   policy.attempts - 1, wait)
+                if on_retry:
+                    on_retry(error)
+                self._charged(self._sleep, wait)
+                continue
+
+            if retries:
+                self._count(step, "recovered")
+                if logger:
+                    logger.info("🔁 %s recovered after %d retry(ies)", step, retries)
+            return result
+
+    def _give_up_reason(self, policy, retries, wait):
+        if retries + 1 >= policy.attempts:
+            return f"after {retries + 1} attempt(s)"
+        if wait > self.remaining():
+            return f"(retry budget of {self.budget}s for this test is exhausted)"
+        return None
+
+    def _charged(self, func, *args, **kwargs):
+        # Runs a backoff sleep or a retry attempt, charging its time to the budget. Retries nested in an
+        # attempt that is already being charged are part of that attempt's time and are not charged twice.
+        if getattr(self._local, "charging", False):
+            return func(*args, **kwargs)
+        self._local.charging = True
+        start = time.perf_counter()
+        try:
+            return func(*args, **kwargs)
+        finally:
+            self._local.charging = False
+            self.spent += time.perf_counter() - start
+
+    def _count(self, step, field):
+        counts = self.stats.setdefault(step, {"retries": 0, "recovered": 0, "gave_up": 0})
+        counts[field] += 1
+
+
+retry_engine = RetryEngine()
+
+
+def retryable(level="flow", on_retry=None):
+    # Decorator for page-object methods: retries the method per policy, as a step named <PageClass>.<method>.
+    # on_retry(page, error, *args, **kwargs) runs before each retry, e.g. to forget a stale element.
+    def decorate(func):
+        @functools.wraps(func)
+        def wrapper(self, *args, **kwargs):
+            hook = (lambda error: on_retry(self, error, *args, **kwargs)) if on_retry else None
+            return retry_engine.call(f"{type(self).__name__}.{func.__name__}", func, (self, *args), kwargs,
+                                     level=level, on_retry=hook, logger=self.logger)
+        return wrapper
+    return decorate
@@ -0,0 +1,76 @@
+import hashlib
+import json
+import os
+import time
+from utils.config_reader import ConfigReader
+from utils.file_lock import FileLock
+
+# Cookie fields kept in a snapshot; all of them are accepted by both Network.setCookie and add_cookie
+COOKIE_FIELDS = ("name", "value", "path", "secure", "httpOnly")
+
+
+def snapshot_cookie(cookie):
+    # Normalizes a cookie from Network.getCookies or driver.get_cookies() to the stored form
+    return {field: cookie[field] for field in COOKIE_FIELDS if field in cookie}
+
+
+class SessionSnapshots:
+    """Logged-in browser state (cookies and localStorage) per account and base URL, cached on disk with a TTL."""
+
+    def __init__(self, directory, ttl, logger=None):
+        self.directory = directory
+        self.ttl = ttl
+        self.logger = logger
+
+    def load(self, account, base_url):
+        # Returns {"cookies": [...], "local_storage": {...}}, or None when missing or older than the TTL
+        path = self._path(account, base_url)
+        with FileLock(path + ".lock"):
+            try:
+                with open(path) as f:
+                    snapshot = json.load(f)
+            except (OSError, ValueError):
+                return None
+        age = time.time() - snapshot.get("created_at", 0)
+        if age >= self.ttl:
+            self._log("Session snapshot for %s expired (%.0fs old)", account.username, age)
+            return None
+        return snapshot
+
+    def save(self, account, base_url, cookies, local_storage):
+        path = self._path(account, base_url)
+        snapshot = {
+            "username": account.username,
+            "base_url": base_url,
+            "created_at": time.time(),
+            "cookies": [snapshot_cookie(cookie) for cookie in cookies],
+            "local_storage": dict(local_storage),
+        }
+        with FileLock(path + ".lock"):
+            tmp_path = path + f".{os.getpid()}.tmp"
+            with open(tmp_path, "w") as f:
+                json.dump(snapshot, f, indent=2)
+            os.replace(tmp_path, path)
+        self._log("Session snapshot saved for %s (%s cookies)", account.username, len(snapshot["cookies"]))
+        return snapshot
+
+    def invalidate(self, account, base_url):
+        path = self._path(account, base_url)
+        with FileLock(path + ".lock"):
+            try:
+                os.remove(path)
+            except FileNotFoundError:
+                pass
+
+    def _path(self, account, base_url):
+        key = hashlib.sha256(f"{account.username}\n{base_url.rstrip('/')}".encode()).hexdigest()[:32]
+        os.makedirs(self.directory, exist_ok=True)
+        return os.path.join(self.directory, f"{key}.json")
+
+    def _log(self, msg, *args):
+        if self.logger:
+            self.logger.info(msg, *args)
+
+    @classmethod
+    def from_config(cls, logger=None):
+        return cls(ConfigReader.get_path("session_snapshot_dir"), ConfigReader.get("session_snapshot_ttl"), logger)
@@ -0,0 +1,137 @@
+import argparse
+import glob
+import hashlib
+import json
+import os
+import re
+import sys
+import time
+from utils.file_lock import FileLock
+
+DEFAULT_DURATION = 1.0  # seconds assumed for a test with no history while nothing else has any either
+SMOOTHING = 0.5  # weight of the latest run when it is blended with a test's recorded duration
+
+
+def parse_shard(value):
+    # "2/3" -> (2, 3): the second of three shards
+    match = re.fullmatch(r"\s*(\d+)\s*/\s*(\d+)\s*", value or "")
+    if not match:
+        raise ValueError(f"--shard expects i/N (e.g. 1/3), got '{value}'")
+    index, count = int(match.group(1)), int(match.group(2))
+    if not 1 <= index <= count:
+        raise ValueError(f"--shard {value}: the shard number must be between 1 and {count}")
+    return index, count
+
+
+def shard_label(shard):
+    return f"{shard[0]}of{shard[1]}" if shard else "all"
+
+
+def load_durations(directory):
+    # {node id: seconds} from every durations file in directory; newer files win for tests found in several
+    files = []
+    for path in glob.glob(os.path.join(directory, "durations.*.json")):
+        try:
+            with open(path) as f:
+                data = json.load(f)
+        except (OSError, ValueError):
+            continue  # a broken file only costs balance, never the run
+        files.append((data.get("written", 0), data.get("durations", {})))
+
+    durations = {}
+    for _, recorded in sorted(files, key=lambda item: item[0]):
+        durations.update(recorded)
+    return durations
+
+
+def record_durations(directory, shard, measured):
+    # Blends this run's durations into the file of this shard, keeping the history of tests it did not run
+    os.makedirs(directory, exist_ok=True)
+    path = os.path.join(directory, f"durations.{shard_label(shard)}.json")
+    with FileLock(path + ".lock"):
+        try:
+            with open(path) as f:
+                durations = json.load(f).get("durations", {})
+        except (OSError, ValueError):
+            durations = {}
+        for node_id, seconds in measured.items():
+            previous = durations.get(node_id)
+            durations[node_id] = seconds if previous is None else SMOOTHING * seconds + (1 - SMOOTHING) * previous
+        with open(path, "w") as f:
+            json.dump({"written": time.time(), "durations": durations}, f, indent=2, sort_keys=True)
+    return path
+
+
+def load_shared_durations(path):
+    # {node id: seconds} from the committed durations file, or {} when there is none yet
+    try:
+        with open(path) as f:
+            return json.load(f).get("durations", {})
+    except FileNotFoundError:
+        return {}
+
+
+def update_shared_durations(path, directory):
+    # Folds the durations recorded on this machine into the committed file (rounded, so it diffs quietly)
+    durations = load_shared_durations(path)
+    durations.update({node_id: round(seconds, 2) for node_id, seconds in load_durations(directory).items()})
+    with open(path, "w") as f:
+        json.dump({"durations": durations}, f, indent=2, sort_keys=True)
+        f.write("\n")
+    return durations
+
+
+def plan_shards(node_ids, durations, count):
+    # (shards, expected seconds per shard, method). Only the shared durations go in, so every machine that
+    # collected the same tests computes the same split; with no history for any of them, tests are split by hash.
+    if any(node_id in durations for node_id in node_ids):
+        return (*assign_shards(node_ids, durations, count), "durations")
+    return (*hash_shards(node_ids, count), "hash")
+
+
+def hash_shards(node_ids, count):
+    # Each test's shard follows from its node id alone, whatever else was collected and on whichever machine
+    shards = [[] for _ in range(count)]
+    for node_id in sorted(node_ids):
+        shards[int(hashlib.sha1(node_id.encode()).hexdigest(), 16) % count].append(node_id)
+    return shards, [len(shard) * DEFAULT_DURATION for shard in shards]
+
+
+def partition_digest(node_ids, durations, count):
+    # Fingerprint of everything the split depends on; machines whose digests differ did not split alike
+    data = {"count": count, "tests": sorted(node_ids),
+            "durations": {node_id: durations[node_id] for node_id in sorted(node_ids) if node_id in durations}}
+    return hashlib.sha256(json.dumps(data, sort_keys=True).encode()).hexdigest()[:12]
+
+
+def assign_shards(node_ids, durations, count):
+    # Splits tests into `count` shards of about equal expected time: longest first, each to the lightest shard.
+    # Deterministic for the same tests and history, so every machine (and xdist worker) computes the same split.
+    known = [durations[node_id] for node_id in node_ids if node_id in durations]
+    default = sum(known) / len(known) if known else DEFAULT_DURATION
+    expected = {node_id: durations.get(node_id, default) for node_id in node_ids}
+
+    shards = [[] for _ in range(count)]
+    totals = [0.0] * count
+    for node_id in sorted(node_ids, key=lambda node_id: (-expected[node_id], node_id)):
+        lightest = min(range(count), key=lambda shard: (totals[shard], shard))
+        shards[lightest].append(node_id)
+        totals[lightest] += expected[node_id]
+    return shards, totals
+
+
+def main(argv=None):
+    from utils.config_reader import ConfigReader
+
+    parser = argparse.ArgumentParser(description="Update the committed test durations that --shard splits by.")
+    parser.add_argument("--file", default=ConfigReader.get_path("shard_durations_file"))
+    parser.add_argument("--from-dir", default=ConfigReader.get_path("shard_durations_dir"),
+                        help="durations recorded by local runs")
+    args = parser.parse_args(argv)
+    durations = update_shared_durations(args.file, args.from_dir)
+    print(f"{len(durations)} test duration(s) written to {args.file}; commit it so every machine splits alike")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
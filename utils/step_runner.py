@@ -0,0 +1,64 @@
+import time
+from collections import namedtuple
+
+Step = namedtuple("Step", ["name", "action", "verify"])
+
+# Steps completed per checkpoint key (the test's node id), kept for the whole run so that a rerun of the
+# test (e.g. pytest-rerunfailures) in the same process can resume too: {key: {step name: duration}}
+_checkpoints = {}
+
+
+class StepRunner:
+    """Runs a flow as named steps and, when a step fails, retries from the first step that no longer holds.
+
+    A step may declare `verify`, a cheap check that its effect is still in place (e.g. "cart contains X").
+    On a retry, completed steps whose check passes are skipped; steps without one are run again.
+    """
+
+    def __init__(self, logger, checkpoint=None, retries=1):
+        self.logger = logger
+        self.retries = retries
+        self.steps = []
+        self.completed = _checkpoints.setdefault(checkpoint, {}) if checkpoint else {}
+        self.skipped = []  # (step name, seconds saved)
+        self.attempts = 0
+
+    def step(self, name, action, verify=None):
+        self.steps.append(Step(name, action, verify))
+        return self
+
+    def run(self):
+        # Runs every step, retrying up to `retries` times from the first step that needs it
+        while True:
+            self.attempts += 1
+            try:
+                for step in self.steps:
+                    self._run_step(step)
+                self.completed.clear()  # the flow finished; nothing left to resume
+                return
+            except Exception as e:
+                if self.attempts > self.retries:
+                    raise
+                self.logger.warning("⚠️ Step failed (%r), retrying flow (attempt %s)...", e, self.attempts + 1)
+
+    @property
+    def time_saved(self):
+        return sum(saved for _, saved in self.skipped)
+
+    def _run_step(self, step):
+        if step.name in self.completed and step.verify is not None:
+            start = time.perf_counter()
+            satisfied = step.verify()
+            check_time = time.perf_counter() - start
+            if satisfied:
+                saved = max(0.0, self.completed[step.name] - check_time)
+                self.skipped.append((step.name, saved))
+                self.logger.info("⏭️ Step '%s' still holds, skipped (saved %.2fs)", step.name, saved)
+                return
+            self.logger.info("Step '%s' no longer holds, running it again", step.name)
+
+        self.completed.pop(step.name, None)
+        self.logger.info("▶️ Step: %s", step.name)
+        start = time.perf_counter()
+        step.action()
+        self.completed[step.name] = time.perf_counter() - start
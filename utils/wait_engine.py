@@ -0,0 +1,113 @@
+import logging
+import time
+from selenium.common.exceptions import TimeoutException, NoSuchElementException, StaleElementReferenceException
+from utils.config_reader import ConfigReader
+from utils.dom_scripts import DOM_QUIET_MS
+from utils.instrumentation import recorder
+
+
+class WaitBudget:
+    """Total time one test may spend waiting; every wait in the test draws from it."""
+
+    def __init__(self, seconds):
+        self.seconds = seconds
+        self.spent = 0.0
+
+    def remaining(self):
+        return max(0.0, self.seconds - self.spent)
+
+    def charge(self, seconds):
+        self.spent += seconds
+
+
+class WaitEngine:
+    """The one wait used by BasePage: adaptive polling, a shared per-test budget and per-call logging.
+
+    Drivers are created with an implicit wait of 0, so a poll never blocks inside find_element and a
+    timeout here is the only timeout that applies.
+    """
+
+    def __init__(self, driver, timeout, min_poll=0.05, max_poll=0.5, backoff=1.5, budget=None,
+                 settle_ms=300, logger=None):
+        self.driver = driver
+        self.timeout = timeout
+        self.min_poll = min_poll
+        self.max_poll = max_poll
+        self.backoff = backoff
+        self.budget = budget
+        self.settle_ms = settle_ms
+        self.logger = logger
+        self.ignored_exceptions = (NoSuchElementException, StaleElementReferenceException)
+
+    def until(self, method, message="", timeout=None):
+        # Polls `method(driver)` until it returns something truthy, starting fast and backing off
+        value = self._poll(method, message, timeout, settle=False)
+        if not value:
+            raise TimeoutException(self._timeout_message(message))
+        return value
+
+    def until_not(self, method, message="", timeout=None):
+        # Polls until `method(driver)` returns something falsy
+        value = self._poll(lambda driver: not method(driver), message, timeout, settle=False)
+        if not value:
+            raise TimeoutException(self._timeout_message(message))
+        return True
+
+    def until_or_settled(self, method, message="", timeout=None):
+        # Like until(), but gives up early once the page has loaded and its DOM stopped changing.
+        # Returns the condition's value, or False - meant for negative checks that should not burn the timeout.
+        return self._poll(method, message, timeout, settle=True)
+
+    def _poll(self, method, message, timeout, settle):
+        limit = self.timeout if timeout is None else timeout
+        if self.budget is not None:
+            limit = min(limit, self.budget.remaining())
+
+        poll = self.min_poll
+        start = time.perf_counter()
+        value = False
+        try:
+            while True:
+                try:
+                    value = method(self.driver)
+                except self.ignored_exceptions:
+                    value = False
+                if value:
+                    return value
+                if settle and self._dom_quiet_ms() >= self.settle_ms:
+                    return False
+
+                elapsed = time.perf_counter() - start
+                if elapsed >= limit:
+                    return False
+                time.sleep(min(poll, limit - elapsed))
+                poll = min(poll * self.backoff, self.max_poll)
+        finally:
+            waited = time.perf_counter() - start
+            if self.budget is not None:
+                self.budget.charge(waited)
+            recorder.add_wait(waited)
+            if self.logger and self.logger.isEnabledFor(logging.INFO):
+                self.logger.info("⏱️ Waited %.3fs for %s (%s)", waited, self._describe(method, message),
+                                 "met" if value else "not met")
+
+    def _dom_quiet_ms(self):
+        quiet = self.driver.execute_script(DOM_QUIET_MS)
+        return quiet if quiet is not None else -1
+
+    def _timeout_message(self, message):
+        if self.budget is not None and self.budget.remaining() <= 0:
+            return f"{message} (wait budget of {self.budget.seconds}s for this test is exhausted)".strip()
+        return message
+
+    @staticmethod
+    def _describe(method, message):
+        name = getattr(method, "__qualname__", repr(method)).split(".<locals>")[0]
+        return f"{name} {message}".strip()
+
+
+def wait_engine_from_config(driver, budget=None, logger=None):
+    # A WaitEngine with the timeout, polling and settle settings from config.properties
+    return WaitEngine(driver, ConfigReader.get("explicit_wait"), min_poll=ConfigReader.get("wait_min_poll"),
+                      max_poll=ConfigReader.get("polling_interval"), budget=budget,
+                      settle_ms=ConfigReader.get("dom_settle_ms"), logger=logger)